@@ -2,8 +2,10 @@
 """
 CRUD de Series de TV
 Aplicación con arquitectura de capas y persistencia en memoria
+Ejecutar: python app.py [--datos DIRECTORIO] [--repositorio sqlite]  (con --datos los cambios se guardan en disco)
 """
 
+import argparse
 import sys
 import os
 
@@ -11,13 +13,30 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from ui.main import MenuCRUD
+from domain.serie_manager import SerieManager
+from data.repositorios import TIPOS_REPOSITORIO, crear_repositorio
 
 def main():
     """Función principal de la aplicación"""
+    parser = argparse.ArgumentParser(description="CRUD de Series de TV")
+    parser.add_argument("--datos", help="Directorio donde guardar las series (log + snapshots o base SQLite)")
+    parser.add_argument("--repositorio", choices=TIPOS_REPOSITORIO,
+                        help="Dónde guardar las series (por defecto: 'persistente' con --datos, 'indexado' sin él)")
+    parser.add_argument("--fsync", choices=["siempre", "intervalo", "nunca"], default="siempre",
+                        help="Cuándo forzar la escritura del log a disco")
+    args = parser.parse_args()
+
     print("🎬 Iniciando CRUD de Series de TV...")
-    print("📁 Usando persistencia en memoria con arquitectura de capas\n")
+    try:
+        repositorio = crear_repositorio(args.repositorio, args.datos, args.fsync)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.datos or args.repositorio in ("persistente", "sqlite"):
+        print(f"📁 Usando persistencia en disco ({type(repositorio).__name__}) con arquitectura de capas\n")
+    else:
+        print("📁 Usando persistencia en memoria con arquitectura de capas\n")
     
-    menu = MenuCRUD()
+    menu = MenuCRUD(SerieManager(repositorio))
     try:
         menu.ejecutar()
     except KeyboardInterrupt:
@@ -25,6 +44,8 @@ def main():
     except Exception as e:
         print(f"\n❌ Error inesperado: {e}")
         input("Presiona Enter para salir...")
+    finally:
+        repositorio.cerrar()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,787 @@
+#!/usr/bin/env python3
+"""
+Benchmarks del CRUD de Series
+Ejecutar: python benchmark.py <prueba> [--n NUMERO_DE_SERIES]
+
+Pruebas disponibles:
+    repositorio   Compara el repositorio lista (SerieRepositoryInMemory) con el indexado
+    titulos       Búsqueda por título: recorrido completo vs índice de trigramas
+    recuperacion  Repositorio persistente: coste del fsync, arranque y recuperación tras matar
+                  el proceso a mitad de escritura
+    memoria       Memoria por serie: objetos Serie (con y sin __slots__), repositorio indexado
+                  y almacén columnar (p. ej. --n 1000000 y --n 10000000)
+    analitica     Análisis del catálogo: bucles en Python vs NumPy vectorizado
+    exportacion   Velocidad de cada formato de exportación y de todos a la vez (secuencial/paralelo)
+    reexportacion HTML por páginas: completa, por huellas e incremental tras cambios, altas y bajas
+    importacion   Importación masiva desde CSV y JSON Lines en cada repositorio (con filas erróneas)
+    sqlite        Repositorio SQLite (índices + FTS5) frente a la lista en memoria y el indexado
+                  (de --n 100000 a --n 10000000; por encima de 1M solo se mide SQLite)
+    consultas     Consultas con varios criterios: filtrar todo en Python vs planificador con índices
+                  y montículo para el top-k, en los repositorios indexado, columnar y SQLite
+    concurrencia  Prueba de estrés: hilos lectores y escritores a la vez sobre SerieManager con
+                  cada repositorio; comprueba IDs únicos, recuento, estadísticas y lecturas enteras
+"""
+
+import argparse
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# Agregar el directorio raíz al path para importaciones
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from domain.model.serie import Serie
+from data.serie_repository import SerieRepositoryInMemory
+from data.serie_repository_indexado import SerieRepositoryIndexado
+from data.indice_titulos import IndiceTitulos
+from data.serie_repository_persistente import SerieRepositoryPersistente
+from data.serie_repository_columnar import SerieRepositoryColumnar
+from data.serie_repository_sqlite import SerieRepositorySQLite
+from domain.estadisticas import calcular_estadisticas
+from domain.analitica import analizar, columnas_desde_series, np
+from export.pipeline import EXPORTADORES, exportar_archivos
+from export.columnar import leer_columnar
+from export.html_paginado import ExportadorHTMLPaginado, leer_manifiesto
+from export.pipeline import exportar
+from importacion.importador import FILAS_POR_LOTE, importar_series
+from domain.serie_manager import SerieManager
+from domain.consultas import Consulta, planificar
+from main_html_export import actualizar_html_paginado
+
+# Por encima de este número de series, las variantes con un objeto por serie se miden
+# con este tamaño y se extrapolan (con 10 millones de objetos no cabrían en memoria)
+MAX_SERIES_OBJETOS = 1_000_000
+
+GENEROS = ["Drama", "Comedia", "Fantasía", "Ciencia Ficción", "Crimen",
+           "Documental", "Animación", "Terror", "Thriller", "Romance"]
+PALABRAS = ["the", "dark", "casa", "papel", "breaking", "crown", "narcos", "office",
+            "stranger", "things", "mirror", "black", "witcher", "fantasía", "reina",
+            "noche", "ciudad", "secreto", "último", "verano", "lost", "friends"]
+
+
+def generar_series(n: int, semilla: int = 42):
+    """Genera 'n' series aleatorias (sin ID, el repositorio lo asigna)"""
+    aleatorio = random.Random(semilla)
+    for _ in range(n):
+        titulo = " ".join(aleatorio.choice(PALABRAS) for _ in range(aleatorio.randint(1, 4))).title()
+        yield Serie(0, titulo, aleatorio.choice(GENEROS), aleatorio.randint(1, 15),
+                    aleatorio.randint(1950, 2025), round(aleatorio.uniform(0, 10), 1))
+
+
+def cronometrar(funcion, repeticiones: int) -> float:
+    """Ejecuta la función 'repeticiones' veces y devuelve microsegundos por llamada"""
+    inicio = time.perf_counter()
+    for i in range(repeticiones):
+        funcion(i)
+    return (time.perf_counter() - inicio) / repeticiones * 1_000_000
+
+
+def benchmark_repositorio(n: int, operaciones: int):
+    """Compara las operaciones por ID del repositorio lista y del indexado"""
+    print(f"📊 Repositorio lista vs indexado con {n:,} series ({operaciones} operaciones)\n")
+    aleatorio = random.Random(1)
+
+    for nombre, repositorio in [("lista", SerieRepositoryInMemory()),
+                                ("indexado", SerieRepositoryIndexado(datos_ejemplo=False))]:
+        inicio = time.perf_counter()
+        for serie in generar_series(n):
+            repositorio.save(serie)
+        carga = time.perf_counter() - inicio
+
+        ids = [aleatorio.randint(1, n) for _ in range(operaciones)]
+
+        def buscar(i):
+            repositorio.find_by_id(ids[i])
+
+        def actualizar(i):
+            serie = repositorio.find_by_id(ids[i])
+            if serie:
+                serie.calificacion = 5.0
+                repositorio.save(serie)
+
+        def existe(i):
+            repositorio.exists_by_id(ids[i])
+
+        def borrar(i):
+            repositorio.delete_by_id(ids[i])
+
+        print(f"  {nombre}:")
+        print(f"    • Carga:            {carga:8.2f} s")
+        print(f"    • find_by_id:       {cronometrar(buscar, operaciones):10.1f} µs/op")
+        print(f"    • save (update):    {cronometrar(actualizar, operaciones):10.1f} µs/op")
+        print(f"    • exists_by_id:     {cronometrar(existe, operaciones):10.1f} µs/op")
+        print(f"    • delete_by_id:     {cronometrar(borrar, operaciones):10.1f} µs/op")
+        print()
+
+
+def benchmark_titulos(n: int, operaciones: int):
+    """Compara la búsqueda por título recorriendo la lista con el índice de trigramas"""
+    print(f"📊 Búsqueda por título con {n:,} series ({operaciones} búsquedas)\n")
+    titulos = [serie.titulo for serie in generar_series(n)]
+
+    inicio = time.perf_counter()
+    indice = IndiceTitulos()
+    for id, titulo in enumerate(titulos, start=1):
+        indice.agregar(id, titulo)
+    print(f"  • Construcción del índice: {time.perf_counter() - inicio:.2f} s\n")
+
+    aleatorio = random.Random(2)
+    consultas = ["Fantasia", "Crown Noche", "Secreto", "Breaking Bad Verano", "ultimo"]
+    for consulta in consultas:
+        def recorrido(i):
+            buscado = consulta.lower()
+            return [t for t in titulos if buscado in t.lower()]
+
+        def con_indice(i):
+            return indice.buscar(consulta, limite=20)
+
+        repeticiones = max(1, operaciones // 50)
+        print(f"  '{consulta}' ({len(indice.buscar(consulta)):,} resultados):")
+        print(f"    • Recorrido:          {cronometrar(recorrido, repeticiones) / 1000:10.2f} ms")
+        print(f"    • Índice (top 20):    {cronometrar(con_indice, repeticiones) / 1000:10.2f} ms")
+
+    prefijos = [aleatorio.choice(PALABRAS)[:3] for _ in range(operaciones)]
+    tiempo = cronometrar(lambda i: indice.autocompletar(prefijos[i]), operaciones)
+    print(f"\n  • Autocompletar (prefijo de 3 letras): {tiempo / 1000:.2f} ms/consulta")
+
+
+def escritor(directorio: str):
+    """Proceso hijo de 'recuperacion': guarda series sin parar e imprime cada ID confirmado"""
+    repositorio = SerieRepositoryPersistente(directorio, datos_ejemplo=False,
+                                             operaciones_por_snapshot=500)
+    for serie in generar_series(10_000_000, semilla=7):
+        repositorio.save(serie)
+        print(serie.id, flush=True)
+
+
+def benchmark_recuperacion(n: int, operaciones: int):
+    """Mide el coste de cada política de fsync y comprueba la recuperación tras un fallo"""
+    print(f"📊 Repositorio persistente con {n:,} series\n")
+    directorio = tempfile.mkdtemp(prefix="series_")
+    try:
+        for politica in ("siempre", "intervalo", "nunca"):
+            ruta = os.path.join(directorio, politica)
+            repositorio = SerieRepositoryPersistente(ruta, fsync=politica, datos_ejemplo=False)
+            series = list(generar_series(operaciones))
+            tiempo = cronometrar(lambda i: repositorio.save(series[i]), operaciones)
+            repositorio.cerrar()
+            print(f"  • save con fsync {repr(politica):12} {tiempo:10.1f} µs/op")
+
+        # Arranque: snapshot con n series + log con 'operaciones' operaciones pendientes
+        ruta = os.path.join(directorio, "arranque")
+        repositorio = SerieRepositoryPersistente(ruta, fsync="nunca", datos_ejemplo=False,
+                                                 operaciones_por_snapshot=n + operaciones + 1)
+        for serie in generar_series(n):
+            repositorio.save(serie)
+        inicio = time.perf_counter()
+        repositorio.compactar()
+        print(f"\n  • Escribir snapshot:        {time.perf_counter() - inicio:8.2f} s")
+        for serie in generar_series(operaciones, semilla=3):
+            repositorio.save(serie)
+        repositorio.cerrar()
+        inicio = time.perf_counter()
+        repositorio = SerieRepositoryPersistente(ruta, datos_ejemplo=False)
+        print(f"  • Arranque (snapshot + log): {time.perf_counter() - inicio:8.2f} s "
+              f"({repositorio.count():,} series)")
+        repositorio.cerrar()
+
+        # Fallo: se mata al proceso escritor mientras guarda y se comprueba que no falta nada
+        ruta = os.path.join(directorio, "fallo")
+        hijo = subprocess.Popen([sys.executable, os.path.abspath(__file__), "escritor",
+                                 "--directorio", ruta],
+                                stdout=subprocess.PIPE, text=True)
+        confirmados = [int(hijo.stdout.readline()) for _ in range(operaciones)]
+        hijo.send_signal(signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+        hijo.wait()
+        hijo.stdout.close()
+
+        # Además se simula una escritura cortada a la mitad al final del log
+        with open(os.path.join(ruta, "series.log"), "a", encoding="utf-8") as log:
+            log.write('{"op": "save", "serie": {"id": 99')
+
+        inicio = time.perf_counter()
+        repositorio = SerieRepositoryPersistente(ruta, datos_ejemplo=False)
+        recuperacion = time.perf_counter() - inicio
+        perdidas = [id for id in confirmados if not repositorio.exists_by_id(id)]
+        nueva = repositorio.save(Serie(0, "Tras el fallo", "Drama", 1, 2024, 5.0))
+        repositorio.cerrar()
+        repositorio = SerieRepositoryPersistente(ruta, datos_ejemplo=False)
+        sigue = repositorio.exists_by_id(nueva.id)
+        repositorio.cerrar()
+
+        print(f"\n  • Recuperación tras matar el proceso: {recuperacion * 1000:.1f} ms "
+              f"({repositorio.count():,} series, {len(confirmados):,} confirmadas)")
+        if perdidas or not sigue:
+            print(f"  ❌ Se perdieron {len(perdidas)} series confirmadas"
+                  + ("" if sigue else " y el log no admite escrituras tras la recuperación"))
+            sys.exit(1)
+        print("  ✅ No se perdió ninguna serie confirmada y el log sigue siendo válido")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+class SerieConDict:
+    """Serie tal como era antes de __slots__ (cada instancia con su __dict__)"""
+
+    def __init__(self, id, titulo, genero, temporadas, año_estreno, calificacion):
+        self.id = id
+        self.titulo = titulo
+        self.genero = genero
+        self.temporadas = temporadas
+        self.año_estreno = año_estreno
+        self.calificacion = calificacion
+
+
+def medir_memoria(construir, n: int):
+    """Construye la estructura con 'n' series y devuelve (bytes por serie, segundos)"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    estructura = construir(n)
+    segundos = time.perf_counter() - inicio
+    ocupado = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del estructura
+    return ocupado / n, segundos
+
+
+def benchmark_memoria(n: int, operaciones: int):
+    """Compara la memoria que ocupa cada forma de guardar las series"""
+    print(f"📊 Memoria con {n:,} series\n")
+
+    def con_dict(cantidad):
+        return {i: SerieConDict(i, s.titulo, s.genero, s.temporadas, s.año_estreno, s.calificacion)
+                for i, s in enumerate(generar_series(cantidad), start=1)}
+
+    def con_slots(cantidad):
+        series = {}
+        for i, serie in enumerate(generar_series(cantidad), start=1):
+            serie.id = i
+            series[i] = serie
+        return series
+
+    def indexado(cantidad):
+        repositorio = SerieRepositoryIndexado(datos_ejemplo=False)
+        for serie in generar_series(cantidad):
+            repositorio.save(serie)
+        return repositorio
+
+    def columnar(cantidad):
+        repositorio = SerieRepositoryColumnar(datos_ejemplo=False)
+        for serie in generar_series(cantidad):
+            repositorio.save(serie)
+        return repositorio
+
+    variantes = [("Serie con __dict__", con_dict, MAX_SERIES_OBJETOS),
+                 ("Serie con __slots__", con_slots, MAX_SERIES_OBJETOS),
+                 ("Repositorio indexado", indexado, MAX_SERIES_OBJETOS),
+                 ("Almacén columnar", columnar, n)]
+    for nombre, construir, maximo in variantes:
+        medidas = min(n, maximo)
+        por_serie, segundos = medir_memoria(construir, medidas)
+        nota = f" (medido con {medidas:,} y extrapolado)" if medidas < n else ""
+        print(f"  • {nombre:22} {por_serie:8.1f} bytes/serie  "
+              f"{por_serie * n / 1024 ** 2:10.1f} MB  carga {segundos:6.2f} s{nota}")
+
+    repositorio = columnar(min(n, MAX_SERIES_OBJETOS))
+    aleatorio = random.Random(4)
+    ids = [aleatorio.randint(1, repositorio.count()) for _ in range(operaciones)]
+    tiempo = cronometrar(lambda i: repositorio.find_by_id(ids[i]), operaciones)
+    print(f"\n  • find_by_id en el almacén columnar (crea la Serie): {tiempo:.1f} µs/op")
+
+
+def benchmark_analitica(n: int, operaciones: int):
+    """Compara el análisis en Python puro con la versión vectorizada"""
+    print(f"📊 Análisis del catálogo con {n:,} series\n")
+    repositorio = SerieRepositoryColumnar(datos_ejemplo=False)
+    for serie in generar_series(n):
+        repositorio.save(serie)
+    repeticiones = max(1, operaciones // 100)
+
+    series = list(repositorio.find_all())
+    tiempo = cronometrar(lambda i: calcular_estadisticas(series), repeticiones)
+    print(f"  • Estadísticas básicas (bucles actuales):     {tiempo / 1000:10.1f} ms")
+    tiempo = cronometrar(lambda i: analizar(repositorio.columnas(), usar_numpy=False), repeticiones)
+    print(f"  • Análisis completo en Python puro:           {tiempo / 1000:10.1f} ms")
+
+    if np is None:
+        print("\n  ⚠️  NumPy no está instalado: no se puede medir la versión vectorizada")
+        return
+
+    tiempo = cronometrar(lambda i: analizar(repositorio.columnas()), repeticiones)
+    print(f"  • Análisis completo con NumPy (columnar):     {tiempo / 1000:10.1f} ms")
+    tiempo = cronometrar(lambda i: analizar(columnas_desde_series(series)), repeticiones)
+    print(f"  • Análisis con NumPy desde objetos Serie:     {tiempo / 1000:10.1f} ms")
+
+    iguales = analizar(repositorio.columnas()) == analizar(repositorio.columnas(), usar_numpy=False)
+    print(f"\n  {'✅' if iguales else '❌'} Python puro y NumPy dan {'los mismos' if iguales else 'distintos'} resultados")
+
+
+def benchmark_exportacion(n: int, operaciones: int):
+    """Mide filas/s y MB/s de cada formato, y de todos en una sola pasada"""
+    print(f"📊 Exportación de {n:,} series\n")
+    series = []
+    for id, serie in enumerate(generar_series(n), start=1):
+        serie.id = id
+        series.append(serie)
+
+    directorio = tempfile.mkdtemp(prefix="exportacion_")
+    try:
+        for formato in EXPORTADORES:
+            for comprimir in (False, True):
+                inicio = time.perf_counter()
+                resultado = exportar_archivos(series, [formato], directorio, comprimir=comprimir)[formato]
+                segundos = time.perf_counter() - inicio
+                nombre = formato + (" + gzip" if comprimir else "")
+                print(f"  • {nombre:17} {n / segundos:12,.0f} filas/s  "
+                      f"{resultado['bytes'] / 1024 ** 2 / segundos:8.1f} MB/s  "
+                      f"{resultado['bytes'] / 1024 ** 2:8.1f} MB")
+
+        print()
+        for comprimir in (False, True):
+            for paralelo in (False, True):
+                inicio = time.perf_counter()
+                exportar_archivos(series, list(EXPORTADORES), directorio, comprimir=comprimir, paralelo=paralelo)
+                segundos = time.perf_counter() - inicio
+                modo = ("paralelo" if paralelo else "secuencial") + (" + gzip" if comprimir else "")
+                print(f"  • Todos los formatos, {modo:19}: {segundos:6.2f} s ({n / segundos:,.0f} filas/s)")
+
+        leidas = sum(1 for _ in leer_columnar(os.path.join(directorio, "series.serc")))
+        print(f"\n  {'✅' if leidas == n else '❌'} Releídas {leidas:,} series del archivo columnar")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def benchmark_reexportacion(n: int, operaciones: int):
+    """
+    Compara volver a exportar todas las páginas, comparar sus huellas recorriendo el catálogo
+    y actualizar solo las páginas de las series que han cambiado (cambios, altas y bajas)
+    """
+    print(f"📊 Reexportación HTML por páginas con {n:,} series ({operaciones} operaciones)\n")
+    serie_manager = SerieManager(SerieRepositoryIndexado(datos_ejemplo=False))
+    serie_manager.crear_varias_series(list(generar_series(n)))
+    aleatorio = random.Random(5)
+
+    def operar(tipo: str):
+        ids = [serie.id for serie in serie_manager.listar_series()]
+        for i in range(operaciones):
+            if tipo == "cambios":
+                serie_manager.actualizar_serie(aleatorio.choice(ids), calificacion=round(aleatorio.uniform(0, 10), 1))
+            elif tipo == "altas":
+                serie_manager.crear_serie(f"Nueva {i}", aleatorio.choice(GENEROS), 1, 2025, 5.0)
+            else:
+                serie_manager.eliminar_serie(ids.pop(aleatorio.randrange(len(ids))))
+
+    def exportar_paginas(directorio: str, modo: str) -> dict:
+        inicio = time.perf_counter()
+        if modo == "incremental":
+            resultado = actualizar_html_paginado(serie_manager, directorio)
+        else:
+            referencia, _ = serie_manager.cambios_desde(None)
+            exportador = ExportadorHTMLPaginado(directorio, estadisticas=serie_manager.obtener_estadisticas(),
+                                                incremental=modo == "huellas", referencia=referencia)
+            resultado = exportar(serie_manager.listar_series(), [exportador])[exportador.formato]
+        resultado['segundos'] = time.perf_counter() - inicio
+        return resultado
+
+    directorio = tempfile.mkdtemp(prefix="reexportacion_")
+    try:
+        pruebas = [("Primera exportación", None, "completa"), ("Sin cambios", None, "incremental")]
+        for tipo in ("cambios", "altas", "bajas"):
+            pruebas += [(f"{operaciones} {tipo}, {modo}", tipo, modo) for modo in ("completa", "huellas", "incremental")]
+        for nombre, tipo, modo in pruebas:
+            if tipo:
+                operar(tipo)
+            resultado = exportar_paginas(directorio, modo)
+            print(f"  • {nombre:30} {resultado['segundos']:7.3f} s  "
+                  f"({resultado['archivos_escritos']:,} archivos escritos, "
+                  f"{resultado['archivos_sin_cambios']:,} sin cambios, {resultado['archivos_borrados']:,} borrados)")
+
+        # Lo actualizado tiene que ser igual que una exportación desde cero
+        comprobacion = os.path.join(directorio, "comprobacion")
+        exportar_paginas(comprobacion, "completa")
+        actualizado, completo = leer_manifiesto(directorio), leer_manifiesto(comprobacion)
+        iguales = all(actualizado[clave] == completo[clave] for clave in ("archivos", "paginas", "generos"))
+        print(f"\n  {'✅' if iguales else '❌'} La exportación actualizada coincide con una completa")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def benchmark_importacion(n: int, operaciones: int):
+    """Exporta n series a CSV y JSON Lines, les añade 'operaciones' filas erróneas y las importa"""
+    print(f"📊 Importación de {n:,} series (+ {operaciones} filas erróneas)\n")
+    directorio = tempfile.mkdtemp(prefix="importacion_")
+    try:
+        exportar_archivos(generar_series(n), ["csv", "jsonl"], directorio)
+        erroneas = {
+            "csv": ["Sin temporadas,Drama,0,2000,5", "Del futuro,Drama,2,2099,5", "Nota,Drama,2,2000,11",
+                    ",Drama,2,2000,5", "Pocas columnas,Drama"],
+            "jsonl": ['{"titulo": "Sin temporadas", "genero": "Drama", "temporadas": 0, "año_estreno": 2000}',
+                      '{"titulo": "Año", "genero": "Drama", "temporadas": 2, "año_estreno": "dos mil"}',
+                      '{"titulo": "Nota", "genero": "Drama", "temporadas": 2, "año_estreno": 2000, '
+                      '"calificacion": -1}', '{"titulo": "Sin género"}', '{roto'],
+        }
+        for formato, lineas in erroneas.items():
+            with open(os.path.join(directorio, "series." + formato), "a", encoding="utf-8") as archivo:
+                for i in range(operaciones):
+                    # El CSV exportado lleva la columna id delante
+                    archivo.write(("0," if formato == "csv" else "") + lineas[i % len(lineas)] + "\n")
+
+        repositorios = [
+            ("indexado", lambda: SerieRepositoryIndexado(datos_ejemplo=False)),
+            ("columnar", lambda: SerieRepositoryColumnar(datos_ejemplo=False)),
+            ("persistente", lambda: SerieRepositoryPersistente(
+                tempfile.mkdtemp(dir=directorio), datos_ejemplo=False)),
+        ]
+        for formato in erroneas:
+            ruta = os.path.join(directorio, "series." + formato)
+            for nombre, crear in repositorios:
+                repositorio = crear()
+                resultado = importar_series(SerieManager(repositorio), ruta)
+                if nombre == "persistente":
+                    repositorio.cerrar()
+                correcto = resultado['importadas'] == n and resultado['errores'] == operaciones
+                print(f"  {'✅' if correcto else '❌'} {formato:5} → {nombre:11} "
+                      f"{resultado['segundos']:6.2f} s  {resultado['filas_por_segundo']:10,.0f} filas/s  "
+                      f"({resultado['importadas']:,} importadas, {resultado['errores']:,} erróneas)")
+                del repositorio
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def benchmark_sqlite(n: int, operaciones: int):
+    """Carga n series en cada repositorio y mide las consultas que usa SerieManager"""
+    print(f"📊 SQLite vs memoria con {n:,} series ({operaciones} operaciones)\n")
+    directorio = tempfile.mkdtemp(prefix="sqlite_")
+    ruta = os.path.join(directorio, "series.db")
+    repositorios = [("sqlite", lambda: SerieRepositorySQLite(ruta, fsync="intervalo", datos_ejemplo=False))]
+    if n <= MAX_SERIES_OBJETOS:
+        repositorios[:0] = [("lista", lambda: SerieRepositoryInMemory()),
+                            ("indexado", lambda: SerieRepositoryIndexado(datos_ejemplo=False))]
+    else:
+        print(f"  (con más de {MAX_SERIES_OBJETOS:,} series solo se mide SQLite: los repositorios "
+              f"en memoria no caben o tardarían horas)\n")
+
+    aleatorio = random.Random(2)
+    ids = [aleatorio.randint(1, n) for _ in range(operaciones)]
+    consultas_lentas = max(1, min(operaciones, 20))
+    try:
+        for nombre, crear in repositorios:
+            repositorio = crear()
+            inicio = time.perf_counter()
+            lote = []
+            for serie in generar_series(n):
+                lote.append(serie)
+                if len(lote) == FILAS_POR_LOTE:
+                    repositorio.save_all(lote)
+                    lote = []
+            repositorio.save_all(lote)
+            carga = time.perf_counter() - inicio
+            print(f"  • {nombre}: carga {carga:.1f} s ({n / carga:,.0f} series/s)")
+
+            # La lista recorre todo el catálogo en cada búsqueda: se mide con menos repeticiones
+            repeticiones = consultas_lentas if nombre == "lista" else operaciones
+            pruebas = [
+                ("find_by_id", lambda i: repositorio.find_by_id(ids[i]), repeticiones),
+                ("save (actualizar)", lambda i: repositorio.save(
+                    Serie(ids[i], "Actualizada", "Drama", 1, 2000, 5.0)), repeticiones),
+                ("find_by_titulo_containing", lambda i: repositorio.find_by_titulo_containing(
+                    "black office"), consultas_lentas),
+                ("find_by_titulo_starting", lambda i: repositorio.find_by_titulo_starting("bre"), consultas_lentas),
+                ("find_by_genero_containing", lambda i: repositorio.find_by_genero_containing(
+                    "terr"), consultas_lentas),
+                ("find_by_año_estreno", lambda i: repositorio.find_by_año_estreno(1990 + i % 30), consultas_lentas),
+                ("count", lambda i: repositorio.count(), consultas_lentas),
+            ]
+            for prueba, funcion, veces in pruebas:
+                print(f"      {prueba:27} {cronometrar(funcion, veces) / 1000:10.3f} ms")
+            repositorio.cerrar()
+            del repositorio
+
+        inicio = time.perf_counter()
+        repositorio = SerieRepositorySQLite(ruta, datos_ejemplo=False)
+        print(f"\n  • SQLite: abrir la base {(time.perf_counter() - inicio) * 1000:.1f} ms, "
+              f"{os.path.getsize(ruta) / 1024 ** 2:,.0f} MB en disco ({repositorio.count():,} series)")
+        repositorio.cerrar()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def benchmark_consultas(n: int, operaciones: int):
+    """Mide varias consultas combinadas: recorrer y ordenar todo vs SerieManager.consultar"""
+    print(f"📊 Consultas con varios criterios sobre {n:,} series ({operaciones} repeticiones)\n")
+    consultas = [
+        ("Drama 2010-2020, ≥ 8.5, top 10", lambda: Consulta().del_genero("Drama").estrenadas_entre(2010, 2020)
+            .con_calificacion_entre(minima=8.5).ordenar_por("calificacion", descendente=True).paginar(10)),
+        ("título 'mirror', 3+ temporadas", lambda: Consulta().con_titulo_que_contiene("mirror")
+            .con_temporadas_entre(minimas=3).ordenar_por("titulo").paginar(20)),
+        ("estrenos 2024-2025, página 3", lambda: Consulta().estrenadas_entre(2024, 2025)
+            .ordenar_por("año_estreno", descendente=True).paginar(20, 40).seleccionar("id", "titulo")),
+        ("10 mejores del catálogo", lambda: Consulta().ordenar_por("calificacion", descendente=True).paginar(10)),
+    ]
+
+    def sin_planificar(repositorio, consulta):
+        """Lo que había que hacer antes: traer todo, filtrar y ordenar el resultado entero"""
+        cumple = consulta.filtro()
+        encontradas = [serie for serie in repositorio.find_all() if cumple(serie)]
+        if consulta.descendente:
+            encontradas.sort(key=lambda serie: (getattr(serie, consulta.orden), -serie.id), reverse=True)
+        else:
+            encontradas.sort(key=lambda serie: (getattr(serie, consulta.orden), serie.id))
+        fin = None if consulta.limite is None else consulta.desplazamiento + consulta.limite
+        return consulta.proyectar(encontradas[consulta.desplazamiento:fin])
+
+    directorio = tempfile.mkdtemp(prefix="consultas_")
+    repositorios = [
+        ("indexado", lambda: SerieRepositoryIndexado(datos_ejemplo=False)),
+        ("columnar", lambda: SerieRepositoryColumnar(datos_ejemplo=False)),
+        ("sqlite", lambda: SerieRepositorySQLite(os.path.join(directorio, "series.db"), fsync="nunca",
+                                                 datos_ejemplo=False)),
+    ]
+    repeticiones = max(1, min(operaciones, 20))
+    try:
+        for nombre, crear in repositorios:
+            repositorio = crear()
+            lote = []
+            for serie in generar_series(n):
+                lote.append(serie)
+                if len(lote) == FILAS_POR_LOTE:
+                    repositorio.save_all(lote)
+                    lote = []
+            repositorio.save_all(lote)
+            serie_manager = SerieManager(repositorio)
+
+            print(f"  • {nombre}")
+            for descripcion, crear_consulta in consultas:
+                consulta = crear_consulta()
+                esperado = sin_planificar(repositorio, consulta)
+                resultado = serie_manager.consultar(consulta)
+                if [getattr(serie, 'id', serie) for serie in resultado] != \
+                        [getattr(serie, 'id', serie) for serie in esperado]:
+                    print(f"      ❌ {descripcion}: resultados distintos")
+                    continue
+                antes = cronometrar(lambda i: sin_planificar(repositorio, consulta), repeticiones)
+                ahora = cronometrar(lambda i: serie_manager.consultar(consulta), operaciones)
+                plan = "SQL" if nombre == "sqlite" else planificar(consulta, repositorio)[0]
+                print(f"      {descripcion:34} todo {antes / 1000:9.1f} ms | consultar {ahora / 1000:8.2f} ms "
+                      f"({plan:6}) x{antes / ahora:,.0f}")
+            repositorio.cerrar()
+            del repositorio, serie_manager
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def benchmark_concurrencia(n: int, operaciones: int, hilos: int = 4):
+    """
+    'hilos' escritores crean, actualizan y borran series mientras otros tantos lectores
+    buscan, consultan y piden estadísticas, todo a través de un mismo SerieManager.
+    Cada serie escrita lleva en el título la versión que corresponde a su calificación:
+    un lector que viera una serie a medio actualizar lo detectaría.
+    """
+    n_lista = min(n, 5000)  # La lista recorre todo el catálogo en cada operación
+    print(f"📊 Estrés con {hilos} escritores + {hilos} lectores, {operaciones} escrituras por hilo "
+          f"({n:,} series iniciales; {n_lista:,} en la lista)\n")
+    directorio = tempfile.mkdtemp(prefix="concurrencia_")
+    repositorios = [
+        ("lista", lambda: SerieRepositoryInMemory(), n_lista),
+        ("indexado", lambda: SerieRepositoryIndexado(), n),
+        ("columnar", lambda: SerieRepositoryColumnar(), n),
+        ("persistente", lambda: SerieRepositoryPersistente(os.path.join(directorio, "persistente"),
+                                                           fsync="nunca"), n),
+        ("sqlite", lambda: SerieRepositorySQLite(os.path.join(directorio, "series.db"), fsync="nunca"), n),
+    ]
+
+    def version_coherente(serie) -> bool:
+        """Las series de la prueba se llaman 'Hilo K vX' y tienen calificación X / 10"""
+        if not serie.titulo.startswith("Hilo "):
+            return True
+        return serie.calificacion == int(serie.titulo.rsplit(" v", 1)[1]) / 10
+
+    try:
+        for nombre, crear, iniciales in repositorios:
+            repositorio = crear()
+            repositorio.save_all(list(generar_series(iniciales)))
+            serie_manager = SerieManager(repositorio)
+            total_inicial = repositorio.count()
+            ids_iniciales = {serie.id for serie in repositorio.find_all()}
+
+            creadas = [[] for _ in range(hilos)]
+            borradas = [[] for _ in range(hilos)]
+            errores = []
+            lecturas = [0] * hilos
+            barrera = threading.Barrier(2 * hilos + 1)
+            escritores_activos = threading.Event()
+            escritores_activos.set()
+
+            def escritor(k: int):
+                aleatorio = random.Random(k)
+                barrera.wait()
+                try:
+                    for _ in range(operaciones):
+                        version = aleatorio.randint(0, 100)
+                        propias = [id for id in creadas[k] if id not in borradas[k]]
+                        operacion = aleatorio.random()
+                        if operacion < 0.5 or not propias:
+                            serie = serie_manager.crear_serie(f"Hilo {k} v{version}", "Drama", 1, 2020,
+                                                              version / 10)
+                            creadas[k].append(serie.id)
+                        elif operacion < 0.8:
+                            serie_manager.actualizar_serie(aleatorio.choice(propias), titulo=f"Hilo {k} v{version}",
+                                                           calificacion=version / 10)
+                        else:
+                            id = aleatorio.choice(propias)
+                            if serie_manager.eliminar_serie(id):
+                                borradas[k].append(id)
+                except Exception as e:
+                    errores.append(f"escritor {k}: {e!r}")
+
+            def lector(k: int):
+                aleatorio = random.Random(1000 + k)
+                barrera.wait()
+                try:
+                    while escritores_activos.is_set():
+                        serie = serie_manager.buscar_serie_por_id(aleatorio.randint(1, total_inicial + 100))
+                        series = serie_manager.consultar(Consulta().con_titulo_que_contiene("hilo")
+                                                         .ordenar_por("calificacion", descendente=True).paginar(20))
+                        estadisticas = serie_manager.obtener_estadisticas()
+                        for leida in series + ([serie] if serie else []):
+                            if not version_coherente(leida):
+                                errores.append(f"lector {k}: serie a medias {leida}")
+                        if estadisticas['total_series'] < total_inicial - hilos * operaciones:
+                            errores.append(f"lector {k}: total imposible {estadisticas['total_series']}")
+                        lecturas[k] += 1
+                except Exception as e:
+                    errores.append(f"lector {k}: {e!r}")
+
+            trabajadores = ([threading.Thread(target=escritor, args=(k,)) for k in range(hilos)]
+                            + [threading.Thread(target=lector, args=(k,)) for k in range(hilos)])
+            for trabajador in trabajadores:
+                trabajador.start()
+            barrera.wait()
+            inicio = time.perf_counter()
+            for trabajador in trabajadores[:hilos]:
+                trabajador.join()
+            segundos = time.perf_counter() - inicio
+            escritores_activos.clear()
+            for trabajador in trabajadores[hilos:]:
+                trabajador.join()
+
+            # Invariantes al terminar
+            todas_creadas = [id for ids in creadas for id in ids]
+            todas_borradas = {id for ids in borradas for id in ids}
+            if len(set(todas_creadas)) != len(todas_creadas):
+                errores.append("IDs repetidos entre hilos")
+            if ids_iniciales & set(todas_creadas):
+                errores.append("IDs nuevos que ya tenía una serie inicial")
+            esperadas = total_inicial + len(todas_creadas) - len(todas_borradas)
+            if repositorio.count() != esperadas:
+                errores.append(f"recuento {repositorio.count():,} en lugar de {esperadas:,}")
+            vivas = [id for id in todas_creadas if id not in todas_borradas]
+            if any(serie_manager.buscar_serie_por_id(id) is None for id in vivas):
+                errores.append("falta alguna serie creada")
+            if any(serie_manager.buscar_serie_por_id(id) is not None for id in todas_borradas):
+                errores.append("sigue alguna serie borrada")
+            errores.extend(serie_manager.comprobar_estadisticas())
+
+            escrituras = hilos * operaciones
+            estado = "✅" if not errores else f"❌ {len(errores)} problemas: {'; '.join(errores[:3])}"
+            print(f"  • {nombre:12} {escrituras / segundos:9,.0f} escrituras/s, "
+                  f"{sum(lecturas) / segundos:9,.0f} rondas de lectura/s  {estado}")
+            repositorio.cerrar()
+            del repositorio, serie_manager
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def benchmark_instantaneas(n: int, operaciones: int):
+    """
+    find_all() antes copiaba todo el catálogo en cada llamada; ahora devuelve una
+    instantánea que comparte los bloques de series. Se compara con la copia de antes
+    con el catálogo quieto y alternando una escritura con cada lectura, y se comprueba
+    que una instantánea no cambia aunque después se escriba.
+    """
+    print(f"📊 find_all() con {n:,} series, {operaciones} llamadas\n")
+    repositorio = SerieRepositoryIndexado()
+    repositorio.save_all(list(generar_series(n)))
+    lista = list(repositorio._series.values())  # Lo que copiaba find_all() antes
+    ids = list(repositorio._series)
+    aleatorio = random.Random(7)
+
+    def escribir():
+        id = aleatorio.choice(ids)
+        anterior = repositorio.find_by_id(id)
+        repositorio.save(Serie(id, anterior.titulo, anterior.genero, anterior.temporadas,
+                               anterior.año_estreno, aleatorio.randint(0, 100) / 10))
+
+    copia = cronometrar(lambda i: lista.copy(), operaciones)
+    instantanea = cronometrar(lambda i: repositorio.find_all(), operaciones)
+    print(f"  • Sin escrituras:      copia {copia:10,.1f} µs   instantánea {instantanea:8,.2f} µs "
+          f"(x{copia / instantanea:,.0f})")
+    copia = cronometrar(lambda i: (escribir(), lista.copy()), operaciones)
+    instantanea = cronometrar(lambda i: (escribir(), repositorio.find_all()), operaciones)
+    print(f"  • Escritura + lectura: copia {copia:10,.1f} µs   instantánea {instantanea:8,.2f} µs "
+          f"(x{copia / instantanea:,.0f})")
+    recorrer_lista = cronometrar(lambda i: sum(1 for _ in lista), 3)
+    recorrer_instantanea = cronometrar(lambda i: sum(1 for _ in repositorio.find_all()), 3)
+    print(f"  • Recorrerla entera:   lista {recorrer_lista / 1000:10,.1f} ms   instantánea {recorrer_instantanea / 1000:8,.1f} ms")
+
+    foto = repositorio.find_all()
+    total = repositorio.count()
+    antes = [(serie.id, serie.calificacion) for serie in foto]
+    for _ in range(operaciones):
+        escribir()
+    repositorio.save(Serie(0, "Nueva", "Drama", 1, 2020, 5.0))
+    repositorio.delete_by_id(ids[0])
+    despues = [(serie.id, serie.calificacion) for serie in foto]
+    actual = repositorio.find_all()
+    correcto = (antes == despues and len(foto) == total and len(actual) == repositorio.count()
+                and [serie.id for serie in actual] == sorted(repositorio._series))
+    print(f"  • Instantánea intacta tras {operaciones + 2} escrituras: {'✅' if correcto else '❌'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del CRUD de Series")
+    parser.add_argument("prueba", choices=["repositorio", "titulos", "recuperacion", "memoria", "analitica",
+                                            "exportacion", "reexportacion", "importacion", "sqlite",
+                                            "consultas", "concurrencia", "instantaneas", "escritor"])
+    parser.add_argument("--n", type=int, default=1_000_000, help="Número de series")
+    parser.add_argument("--operaciones", type=int, default=200, help="Operaciones a medir")
+    parser.add_argument("--directorio", help="Directorio de datos (uso interno de 'escritor')")
+    args = parser.parse_args()
+
+    if args.prueba == "repositorio":
+        benchmark_repositorio(args.n, args.operaciones)
+    elif args.prueba == "titulos":
+        benchmark_titulos(args.n, args.operaciones)
+    elif args.prueba == "recuperacion":
+        benchmark_recuperacion(args.n, args.operaciones)
+    elif args.prueba == "memoria":
+        benchmark_memoria(args.n, args.operaciones)
+    elif args.prueba == "analitica":
+        benchmark_analitica(args.n, args.operaciones)
+    elif args.prueba == "exportacion":
+        benchmark_exportacion(args.n, args.operaciones)
+    elif args.prueba == "reexportacion":
+        benchmark_reexportacion(args.n, args.operaciones)
+    elif args.prueba == "importacion":
+        benchmark_importacion(args.n, args.operaciones)
+    elif args.prueba == "sqlite":
+        benchmark_sqlite(args.n, args.operaciones)
+    elif args.prueba == "consultas":
+        benchmark_consultas(args.n, args.operaciones)
+    elif args.prueba == "concurrencia":
+        benchmark_concurrencia(args.n, args.operaciones)
+    elif args.prueba == "instantaneas":
+        benchmark_instantaneas(args.n, args.operaciones)
+    elif args.prueba == "escritor":
+        escritor(args.directorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+import operator
+import sys
+import threading
+import weakref
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, chain, compress, islice
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional
+from domain.model.serie import Serie
+
+# Marca de fila borrada en la columna de IDs (los IDs empiezan en 1)
+BORRADA = 0
+# Se compacta cuando las filas borradas superan a las vivas (y hay al menos estas)
+MIN_BORRADAS_COMPACTAR = 1024
+# ... o cuando más de la mitad del buffer de títulos son títulos sobrescritos (y ocupan al menos esto)
+MIN_BYTES_HUECOS_COMPACTAR = 1 << 20
+# Mayor valor de las columnas 'H' (temporadas, años y códigos de género). Lo que acepta
+# domain/validaciones.py cabe; lo demás se rechaza antes de tocar ninguna columna
+MAXIMO_H = 0xFFFF
+MAXIMO_ID = (1 << 63) - 1
+# Cuánto puede crecer de golpe el array ID -> fila: un ID explícito mucho mayor que los
+# demás va a un diccionario aparte en lugar de reservar un array de ese tamaño
+MAX_HUECO_IDS = 1 << 20
+# Las filas borradas se cuentan por bloques de filas: así una instantánea encuentra la
+# fila viva número i por bisección sin recorrer todas las anteriores
+BITS_BLOQUE_FILAS = 10
+TAMAÑO_BLOQUE_FILAS = 1 << BITS_BLOQUE_FILAS
+
+
+class AlmacenColumnar:
+    """
+    Almacén de series por columnas.
+    En lugar de un objeto Serie por fila, cada campo se guarda en un array tipado
+    (unos pocos bytes por serie), los títulos van seguidos en un único buffer UTF-8
+    y los géneros se guardan como un código que apunta a una lista de géneros distintos.
+    Los objetos Serie solo se crean cuando se piden.
+    """
+
+    def __init__(self):
+        self._ids = array('q')
+        self._temporadas = array('H')
+        self._años = array('H')
+        self._calificaciones = array('d')
+        self._codigos_genero = array('H')
+        self._generos: List[str] = []
+        self._codigo_de_genero: Dict[str, int] = {}
+        # Títulos: buffer con todos los textos y, por fila, dónde empieza y cuánto ocupa
+        self._buffer_titulos = bytearray()
+        self._inicio_titulo = array('Q')
+        self._largo_titulo = array('I')
+        # ID -> fila (-1 si no existe). Los IDs son consecutivos, así que basta un array
+        self._filas = array('q')
+        # ... salvo los que quedan muy lejos del resto (ver MAX_HUECO_IDS)
+        self._filas_dispersas: Dict[int, int] = {}
+        self._vivas = 0
+        self._borradas = 0
+        self._borradas_por_bloque: Dict[int, int] = {}
+        self._bytes_huecos = 0
+        # Instantáneas (ver instantanea()): columnas de las que siguen vivas, para copiar las
+        # que comparten antes de cambiar una fila existente, y la última, para reutilizarla
+        self._congeladas = weakref.WeakSet()
+        self._cambios = 0
+        self._instantanea = None
+        self._cambios_instantanea = -1
+        # Varios lectores pueden pedir una instantánea a la vez: así crean una sola
+        self._cerrojo_instantanea = threading.Lock()
+
+    # ---------- Escritura ----------
+
+    def _antes_de_cambiar(self, *columnas: str):
+        """
+        Copy-on-write: si una instantánea viva comparte estas columnas, el almacén pasa a
+        usar una copia y la instantánea se queda con las de antes. Añadir filas al final no
+        hace falta copiarlo: la instantánea solo mira sus primeras filas.
+        """
+        self._cambios += 1
+        for congeladas in list(self._congeladas):
+            for nombre in columnas:
+                columna = getattr(self, nombre)
+                if getattr(congeladas, nombre) is columna:
+                    setattr(self, nombre, columna[:])
+
+    def _codigo_genero(self, genero: str) -> int:
+        """Código del género, registrándolo si es nuevo (cada género se guarda una sola vez)"""
+        codigo = self._codigo_de_genero.get(genero)
+        if codigo is None:
+            codigo = len(self._generos)
+            self._generos.append(sys.intern(genero))
+            self._codigo_de_genero[genero] = codigo
+        return codigo
+
+    def _escribir_titulo(self, codificado: bytes):
+        """Añade el título (ya en UTF-8) al final del buffer; devuelve (inicio, largo)"""
+        inicio = len(self._buffer_titulos)
+        self._buffer_titulos += codificado
+        return inicio, len(codificado)
+
+    def _valores(self, serie: Serie) -> tuple:
+        """
+        Convierte y comprueba todos los valores de la serie antes de escribir nada: si uno
+        no cabe en su columna se lanza ValueError y el almacén queda como estaba (si no,
+        las columnas acabarían con distinto número de filas).
+        """
+        id = operator.index(serie.id)
+        temporadas = operator.index(serie.temporadas)
+        año_estreno = operator.index(serie.año_estreno)
+        calificacion = float(serie.calificacion)
+        titulo = serie.titulo.encode('utf-8')
+        if not 0 < id <= MAXIMO_ID:
+            raise ValueError(f"ID fuera de rango: {id}")
+        if not 0 <= temporadas <= MAXIMO_H:
+            raise ValueError(f"Número de temporadas fuera de rango (0-{MAXIMO_H}): {temporadas}")
+        if not 0 <= año_estreno <= MAXIMO_H:
+            raise ValueError(f"Año de estreno fuera de rango (0-{MAXIMO_H}): {año_estreno}")
+        if serie.genero not in self._codigo_de_genero and len(self._generos) > MAXIMO_H:
+            raise ValueError(f"Demasiados géneros distintos (máximo {MAXIMO_H + 1})")
+        return id, titulo, temporadas, año_estreno, calificacion
+
+    def guardar(self, serie: Serie):
+        """Añade la serie o actualiza sus columnas si ya existe (la serie debe tener ID)"""
+        id, titulo, temporadas, año_estreno, calificacion = self._valores(serie)
+        fila = self.fila_de(id)
+        if fila is None:
+            self._agregar(id, titulo, serie.genero, temporadas, año_estreno, calificacion)
+            return
+
+        self._antes_de_cambiar('_codigos_genero', '_temporadas', '_años', '_calificaciones',
+                               '_inicio_titulo', '_largo_titulo')
+        self._codigos_genero[fila] = self._codigo_genero(serie.genero)
+        self._temporadas[fila] = temporadas
+        self._años[fila] = año_estreno
+        self._calificaciones[fila] = calificacion
+        inicio = self._inicio_titulo[fila]
+        if titulo != self._buffer_titulos[inicio:inicio + self._largo_titulo[fila]]:
+            # El título antiguo queda como hueco en el buffer hasta la próxima compactación
+            self._bytes_huecos += self._largo_titulo[fila]
+            self._inicio_titulo[fila], self._largo_titulo[fila] = self._escribir_titulo(titulo)
+            self._compactar_si_conviene()
+
+    def _agregar(self, id: int, titulo: bytes, genero: str, temporadas: int, año_estreno: int,
+                 calificacion: float):
+        """Añade una fila nueva al final de todas las columnas (valores ya comprobados)"""
+        self._cambios += 1
+        self._poner_fila(id, len(self._ids))
+        inicio, largo = self._escribir_titulo(titulo)
+        self._ids.append(id)
+        self._inicio_titulo.append(inicio)
+        self._largo_titulo.append(largo)
+        self._codigos_genero.append(self._codigo_genero(genero))
+        self._temporadas.append(temporadas)
+        self._años.append(año_estreno)
+        self._calificaciones.append(calificacion)
+        self._vivas += 1
+
+    def _poner_fila(self, id: int, fila: int):
+        """Anota en qué fila está el ID (fila -1: ya no está)"""
+        filas = self._filas
+        if id < len(filas):
+            filas[id] = fila
+        elif id < max(2 * len(filas), len(filas) + MAX_HUECO_IDS):
+            filas.extend([-1] * (max(id + 1, 2 * len(filas)) - len(filas)))
+            filas[id] = fila
+        elif fila >= 0:
+            self._filas_dispersas[id] = fila
+        else:
+            self._filas_dispersas.pop(id, None)
+
+    def eliminar(self, id: int) -> bool:
+        """Marca la fila como borrada; las filas se compactan cuando hay demasiadas borradas"""
+        fila = self.fila_de(id)
+        if fila is None:
+            return False
+        self._antes_de_cambiar('_ids')
+        self._ids[fila] = BORRADA
+        self._poner_fila(id, -1)
+        self._vivas -= 1
+        self._borradas += 1
+        bloque = fila >> BITS_BLOQUE_FILAS
+        self._borradas_por_bloque[bloque] = self._borradas_por_bloque.get(bloque, 0) + 1
+        self._bytes_huecos += self._largo_titulo[fila]
+        self._compactar_si_conviene()
+        return True
+
+    def _compactar_si_conviene(self):
+        """Compacta si las filas borradas o los huecos del buffer ocupan más que los datos vivos"""
+        if ((self._borradas >= MIN_BORRADAS_COMPACTAR and self._borradas > self._vivas)
+                or (self._bytes_huecos >= MIN_BYTES_HUECOS_COMPACTAR
+                    and 2 * self._bytes_huecos > len(self._buffer_titulos))):
+            self.compactar()
+
+    def compactar(self):
+        """
+        Reconstruye las columnas sin filas borradas ni títulos sobrescritos (mantiene el orden).
+        Crea columnas nuevas: una instantánea anterior conserva las suyas.
+        """
+        self._cambios += 1
+        filas = [fila for fila in range(len(self._ids)) if self._ids[fila] != BORRADA]
+        buffer = bytearray()
+        inicios = array('Q')
+        for fila in filas:
+            inicios.append(len(buffer))
+            inicio = self._inicio_titulo[fila]
+            buffer += self._buffer_titulos[inicio:inicio + self._largo_titulo[fila]]
+
+        self._ids = array('q', (self._ids[fila] for fila in filas))
+        self._largo_titulo = array('I', (self._largo_titulo[fila] for fila in filas))
+        self._codigos_genero = array('H', (self._codigos_genero[fila] for fila in filas))
+        self._temporadas = array('H', (self._temporadas[fila] for fila in filas))
+        self._años = array('H', (self._años[fila] for fila in filas))
+        self._calificaciones = array('d', (self._calificaciones[fila] for fila in filas))
+        self._buffer_titulos = buffer
+        self._inicio_titulo = inicios
+        for fila, id in enumerate(self._ids):
+            self._poner_fila(id, fila)
+        self._borradas = 0
+        self._borradas_por_bloque = {}
+        self._bytes_huecos = 0
+
+    # ---------- Lectura ----------
+
+    def fila_de(self, id: int) -> Optional[int]:
+        """Fila donde está la serie con ese ID (None si no existe)"""
+        if 0 < id < len(self._filas):
+            fila = self._filas[id]
+            if fila >= 0:
+                return fila
+            return None
+        return self._filas_dispersas.get(id)
+
+    def titulo(self, fila: int) -> str:
+        inicio = self._inicio_titulo[fila]
+        return self._buffer_titulos[inicio:inicio + self._largo_titulo[fila]].decode('utf-8')
+
+    def genero(self, fila: int) -> str:
+        return self._generos[self._codigos_genero[fila]]
+
+    def serie(self, fila: int) -> Serie:
+        """Crea un objeto Serie con los valores de la fila (una copia: modificarla no cambia el almacén)"""
+        return Serie(self._ids[fila], self.titulo(fila), self.genero(fila), self._temporadas[fila],
+                     self._años[fila], self._calificaciones[fila])
+
+    def obtener(self, id: int) -> Optional[Serie]:
+        """Serie con ese ID (None si no existe)"""
+        fila = self.fila_de(id)
+        return self.serie(fila) if fila is not None else None
+
+    def filas(self) -> Iterator[int]:
+        """Filas vivas en orden de inserción"""
+        # BORRADA es 0: compress se queda con las filas de ID distinto de 0 sin bucle en Python
+        return compress(range(len(self._ids)), self._ids)
+
+    def ids(self) -> array:
+        """Copia compacta de los IDs vivos en orden de inserción"""
+        return array('q', (id for id in self._ids if id != BORRADA))
+
+    def instantanea(self) -> 'VistaSeries':
+        """
+        Vista de las series vivas que no cambia aunque después se escriba o se compacte, y que
+        se puede leer sin cerrojo. No copia nada: comparte las columnas, y el primer cambio de
+        una fila existente mientras la vista siga viva copia las columnas que toca (ver
+        _antes_de_cambiar). Sin cambios entre medias, se devuelve la misma vista.
+        """
+        with self._cerrojo_instantanea:
+            vista = self._instantanea() if self._instantanea is not None else None
+            if vista is not None and self._cambios_instantanea == self._cambios:
+                return vista
+            congeladas = AlmacenColumnar()
+            for nombre in ('_ids', '_temporadas', '_años', '_calificaciones', '_codigos_genero',
+                           '_buffer_titulos', '_inicio_titulo', '_largo_titulo', '_generos'):
+                setattr(congeladas, nombre, getattr(self, nombre))
+            congeladas._vivas = self._vivas
+            # Las vistas (y sus trozos) mantienen vivas las columnas congeladas
+            self._congeladas.add(congeladas)
+            vista = VistaSeries(congeladas, len(self._ids), dict(self._borradas_por_bloque))
+            self._instantanea = weakref.ref(vista)
+            self._cambios_instantanea = self._cambios
+            return vista
+
+    def columnas(self) -> dict:
+        """Columnas para el análisis (sin copiar: las filas borradas tienen id 0)"""
+        return {
+            'ids': self._ids,
+            'calificaciones': self._calificaciones,
+            'años': self._años,
+            'codigos_genero': self._codigos_genero,
+            'generos': self._generos,
+        }
+
+    def codigos_genero(self, condicion) -> set:
+        """Códigos de los géneros que cumplen la condición"""
+        return {codigo for codigo, genero in enumerate(self._generos) if condicion(genero)}
+
+    def filas_con_genero(self, codigos: set) -> Iterator[int]:
+        """Filas vivas cuyo género está entre los códigos indicados"""
+        ids, generos = self._ids, self._codigos_genero
+        return (fila for fila in range(len(ids)) if ids[fila] != BORRADA and generos[fila] in codigos)
+
+    def filas_con_año(self, año: int) -> Iterator[int]:
+        """Filas vivas de series estrenadas en ese año"""
+        ids, años = self._ids, self._años
+        return (fila for fila in range(len(ids)) if ids[fila] != BORRADA and años[fila] == año)
+
+    def filas_con_años(self, desde: Optional[int], hasta: Optional[int]) -> Iterator[int]:
+        """Filas vivas de series estrenadas entre dos años, ambos incluidos (None: sin límite)"""
+        ids, años = self._ids, self._años
+        desde = 0 if desde is None else desde
+        hasta = float('inf') if hasta is None else hasta
+        return (fila for fila in range(len(ids)) if ids[fila] != BORRADA and desde <= años[fila] <= hasta)
+
+    def __len__(self) -> int:
+        return self._vivas
+
+
+class VistaSeries(Sequence):
+    """
+    Lista de series de solo lectura sobre las primeras 'total_filas' filas de unas columnas
+    que ya no cambian (ver AlmacenColumnar.instantanea). Crea cada Serie al acceder a ella,
+    así que listar millones de series no crea millones de objetos. Con las borradas de
+    cada bloque de filas, el índice i se busca por bisección y solo se recorre su bloque.
+    """
+
+    def __init__(self, almacen: AlmacenColumnar, total_filas: int, borradas_por_bloque: Dict[int, int]):
+        self._almacen = almacen
+        self._total_filas = total_filas
+        self._borradas_por_bloque = borradas_por_bloque
+        self._inicios: Optional[List[int]] = None
+
+    def _inicios_bloques(self) -> List[int]:
+        """Series vivas antes de cada bloque de filas (y al final, el total)"""
+        if self._inicios is None:
+            bloques = -(-self._total_filas // TAMAÑO_BLOQUE_FILAS)
+            vivas = [TAMAÑO_BLOQUE_FILAS - self._borradas_por_bloque.get(bloque, 0) for bloque in range(bloques)]
+            if bloques:
+                vivas[-1] -= bloques * TAMAÑO_BLOQUE_FILAS - self._total_filas
+            self._inicios = list(accumulate(vivas, initial=0))
+        return self._inicios
+
+    def _filas_desde(self, indice: int) -> Iterator[int]:
+        """Filas vivas a partir de la serie número 'indice' (0 <= indice < len)"""
+        inicios = self._inicios_bloques()
+        bloque = bisect_right(inicios, indice) - 1
+        primera = bloque << BITS_BLOQUE_FILAS
+        if not self._borradas_por_bloque:
+            return iter(range(primera + indice - inicios[bloque], self._total_filas))
+        ids, total = self._almacen._ids, self._total_filas
+        # Bloque a bloque (sin copiar el resto de la columna); BORRADA es 0: compress salta
+        # las filas borradas sin bucle en Python
+        filas = chain.from_iterable(
+            compress(range(desde, min(desde + TAMAÑO_BLOQUE_FILAS, total)), ids[desde:desde + TAMAÑO_BLOQUE_FILAS])
+            for desde in range(primera, total, TAMAÑO_BLOQUE_FILAS))
+        return islice(filas, indice - inicios[bloque], None)
+
+    def __len__(self) -> int:
+        return self._inicios_bloques()[-1] if self._borradas_por_bloque else self._total_filas
+
+    def __getitem__(self, indice):
+        total = len(self)
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(total)
+            if paso < 0:
+                # Las mismas posiciones recorridas hacia delante y dadas la vuelta
+                return self[fin + 1:inicio + 1][::-1][::-paso]
+            if fin <= inicio:
+                return []
+            serie = self._almacen.serie
+            return [serie(fila) for fila in islice(self._filas_desde(inicio), 0, fin - inicio, paso)]
+        if indice < 0:
+            indice += total
+        if not 0 <= indice < total:
+            raise IndexError("índice fuera de rango")
+        return self._almacen.serie(next(self._filas_desde(indice)))
+
+    def __iter__(self) -> Iterator[Serie]:
+        serie = self._almacen.serie
+        filas = range(self._total_filas)
+        if self._borradas_por_bloque:
+            filas = compress(filas, self._almacen._ids)
+        for fila in filas:
+            yield serie(fila)
@@ -0,0 +1,135 @@
+import heapq
+import unicodedata
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Marcas de inicio y fin de título, para que los trigramas distingan los prefijos
+INICIO = "\x02"
+FIN = "\x03"
+
+
+def normalizar(texto: str) -> str:
+    """Pasa a minúsculas y quita tildes ("Fantasía" -> "fantasia")"""
+    if texto.isascii():
+        # Sin tildes que quitar: mucho más rápido que descomponer carácter a carácter
+        return texto.lower()
+    descompuesto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def trigramas(texto: str) -> Set[str]:
+    """Conjunto de trozos de 3 caracteres consecutivos del texto"""
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceTitulos:
+    """
+    Índice invertido de trigramas para buscar series por título.
+    Para cada trigrama guarda los IDs de los títulos que lo contienen; una búsqueda
+    solo comprueba los títulos que tienen todos los trigramas del texto buscado,
+    en lugar de recorrer el catálogo entero.
+    """
+
+    def __init__(self):
+        self._trigramas: Dict[str, Set[int]] = {}
+        self._titulos: Dict[int, str] = {}  # id -> título normalizado
+
+    def agregar(self, id: int, titulo: str):
+        """Indexa (o reindexa) el título de una serie"""
+        normalizado = normalizar(titulo)
+        if self._titulos.get(id) == normalizado:
+            return
+        if id in self._titulos:
+            self.eliminar(id)
+
+        self._titulos[id] = normalizado
+        for trigrama in trigramas(INICIO + normalizado + FIN):
+            self._trigramas.setdefault(trigrama, set()).add(id)
+
+    def agregar_varios(self, titulos: Iterable[Tuple[int, str]]):
+        """Indexa muchos títulos (id, título) de una vez; para importaciones masivas"""
+        indice = self._trigramas
+        normalizados = self._titulos
+        for id, titulo in titulos:
+            if id in normalizados:
+                self.agregar(id, titulo)
+                continue
+            normalizado = normalizar(titulo)
+            normalizados[id] = normalizado
+            texto = INICIO + normalizado + FIN
+            for i in range(len(texto) - 2):
+                ids = indice.get(texto[i:i + 3])
+                if ids is None:
+                    indice[texto[i:i + 3]] = {id}
+                else:
+                    ids.add(id)
+
+    def eliminar(self, id: int):
+        """Quita una serie del índice"""
+        normalizado = self._titulos.pop(id, None)
+        if normalizado is None:
+            return
+        for trigrama in trigramas(INICIO + normalizado + FIN):
+            ids = self._trigramas[trigrama]
+            ids.discard(id)
+            if not ids:
+                del self._trigramas[trigrama]
+
+    def _candidatos(self, texto: str):
+        """IDs que contienen todos los trigramas del texto (todos si es demasiado corto)"""
+        buscados = trigramas(texto)
+        if not buscados:
+            return self._titulos.keys()
+
+        listas = []
+        for trigrama in buscados:
+            ids = self._trigramas.get(trigrama)
+            if not ids:
+                return set()
+            listas.append(ids)
+
+        # Intersección empezando por la lista más corta
+        listas.sort(key=len)
+        candidatos = set(listas[0])
+        for ids in listas[1:]:
+            candidatos &= ids
+            if not candidatos:
+                break
+        return candidatos
+
+    def estimar(self, texto: str) -> int:
+        """Cota superior de los títulos que contienen el texto: la lista de su trigrama menos común"""
+        buscados = trigramas(normalizar(texto))
+        if not buscados:
+            return len(self._titulos)
+        return min(len(self._trigramas.get(trigrama, ())) for trigrama in buscados)
+
+    def buscar(self, texto: str, limite: int = None) -> List[int]:
+        """
+        IDs de los títulos que contienen el texto, ordenados por calidad de la coincidencia:
+        título exacto, empieza por el texto, alguna palabra empieza por el texto, y el resto.
+        """
+        buscado = normalizar(texto)
+
+        def puntuacion(id: int):
+            titulo = self._titulos[id]
+            if titulo == buscado:
+                tipo = 0
+            elif titulo.startswith(buscado):
+                tipo = 1
+            elif (" " + buscado) in titulo:
+                tipo = 2
+            else:
+                tipo = 3
+            return (tipo, titulo.find(buscado), len(titulo), id)
+
+        encontrados = [id for id in self._candidatos(buscado) if buscado in self._titulos[id]]
+        if limite is not None:
+            return heapq.nsmallest(limite, encontrados, key=puntuacion)
+        return sorted(encontrados, key=puntuacion)
+
+    def autocompletar(self, prefijo: str, limite: int = 10) -> List[int]:
+        """IDs de los títulos que empiezan por el prefijo (los más cortos primero)"""
+        buscado = normalizar(prefijo)
+        encontrados = [id for id in self._candidatos(INICIO + buscado)
+                       if self._titulos[id].startswith(buscado)]
+        return heapq.nsmallest(limite, encontrados, key=lambda id: (len(self._titulos[id]), id))
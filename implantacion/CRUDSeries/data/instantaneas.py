@@ -0,0 +1,162 @@
+"""
+Instantáneas de solo lectura del catálogo sin copiar las series (copy-on-write por bloques).
+"""
+
+from bisect import bisect_right, insort
+from collections.abc import Sequence
+from itertools import accumulate, chain, islice
+from typing import Dict, Iterable, Iterator, List, Set
+from domain.model.serie import Serie
+
+# Cada bloque tiene un hueco por ID: la serie con ID i va al hueco i % TAMAÑO_BLOQUE
+# del bloque i // TAMAÑO_BLOQUE
+BITS_BLOQUE = 10
+TAMAÑO_BLOQUE = 1 << BITS_BLOQUE
+MASCARA_HUECO = TAMAÑO_BLOQUE - 1
+
+
+class SeriesVersionadas:
+    """
+    Las series de un repositorio en memoria, por orden de ID, repartidas en bloques.
+    instantanea() devuelve una foto fija del catálogo que comparte los bloques en lugar
+    de copiar las series: cuesta un puntero por bloque (unas mil veces menos que copiar
+    la lista) y, mientras nadie escriba, es la misma vista para todos los lectores.
+    Después, el primer cambio en un bloque que ve alguna foto copia solo ese bloque,
+    así que las fotos anteriores no cambian nunca.
+    La foto es de qué series hay y qué objeto es cada una: modificar un objeto Serie
+    ya guardado se vería en ella (SerieManager no lo hace: al actualizar guarda otro).
+    """
+
+    def __init__(self):
+        self._bloques: Dict[int, list] = {}
+        self._vivas_por_bloque: Dict[int, int] = {}
+        self._numeros: List[int] = []      # Números de bloque, ordenados
+        self._compartidos: Set[int] = set()  # Bloques que ve alguna instantánea
+        self._total = 0
+        self._generacion = 0
+        self._instantanea = None
+
+    def _bloque_propio(self, numero: int) -> list:
+        """Bloque que se puede modificar: si lo ve una instantánea, antes se copia"""
+        bloque = self._bloques.get(numero)
+        if bloque is None:
+            bloque = self._bloques[numero] = [None] * TAMAÑO_BLOQUE
+            self._vivas_por_bloque[numero] = 0
+            insort(self._numeros, numero)
+        elif numero in self._compartidos:
+            bloque = self._bloques[numero] = bloque.copy()
+            self._compartidos.discard(numero)
+        return bloque
+
+    def _guardar(self, serie: Serie):
+        numero = serie.id >> BITS_BLOQUE
+        bloque = self._bloque_propio(numero)
+        hueco = serie.id & MASCARA_HUECO
+        if bloque[hueco] is None:
+            self._vivas_por_bloque[numero] += 1
+            self._total += 1
+        bloque[hueco] = serie
+
+    def _cambio(self):
+        """Nueva generación: la próxima instantánea se vuelve a crear"""
+        self._generacion += 1
+        self._instantanea = None
+
+    def poner(self, serie: Serie):
+        """Añade la serie o sustituye a la que tenía su ID"""
+        self._guardar(serie)
+        self._cambio()
+
+    def poner_varias(self, series: Iterable[Serie]):
+        """Como poner() con cada una, pero una sola generación nueva (importación masiva)"""
+        for serie in series:
+            self._guardar(serie)
+        self._cambio()
+
+    def quitar(self, id: int) -> bool:
+        """Quita la serie con ese ID (False si no estaba)"""
+        numero = id >> BITS_BLOQUE
+        bloque = self._bloques.get(numero)
+        hueco = id & MASCARA_HUECO
+        if bloque is None or bloque[hueco] is None:
+            return False
+        restantes = self._vivas_por_bloque[numero] - 1
+        if restantes:
+            self._bloque_propio(numero)[hueco] = None
+            self._vivas_por_bloque[numero] = restantes
+        else:
+            # Bloque vacío: se suelta entero (las instantáneas que lo vean lo conservan)
+            del self._bloques[numero]
+            del self._vivas_por_bloque[numero]
+            self._numeros.remove(numero)
+            self._compartidos.discard(numero)
+        self._total -= 1
+        self._cambio()
+        return True
+
+    def obtener(self, id: int):
+        """Serie con ese ID en la versión actual (None si no está)"""
+        bloque = self._bloques.get(id >> BITS_BLOQUE)
+        return bloque[id & MASCARA_HUECO] if bloque is not None else None
+
+    def series(self) -> Iterator[Serie]:
+        """Series de la versión actual por orden de ID (sin crear instantánea: no comparte bloques)"""
+        return filter(None, chain.from_iterable(self._bloques[numero] for numero in self._numeros))
+
+    def instantanea(self) -> 'InstantaneaSeries':
+        """Foto fija del contenido actual, O(número de bloques) y sin copiar series"""
+        # Sin escrituras a la vez (las excluye el cerrojo de SerieManager), dos lectores que
+        # lleguen juntos crearían la misma foto: da igual cuál de las dos se quede guardada
+        instantanea = self._instantanea
+        if instantanea is None:
+            bloques = [self._bloques[numero] for numero in self._numeros]
+            inicios = list(accumulate((self._vivas_por_bloque[numero] for numero in self._numeros), initial=0))
+            self._compartidos = set(self._numeros)
+            instantanea = self._instantanea = InstantaneaSeries(bloques, inicios, self._generacion)
+        return instantanea
+
+    def __len__(self) -> int:
+        return self._total
+
+
+class InstantaneaSeries(Sequence):
+    """
+    Lista de series de solo lectura, en orden de ID, tal como estaba el catálogo en
+    la generación 'generacion'. Los cambios posteriores no la afectan.
+    'inicios' dice cuántas series hay antes de cada bloque (y al final, el total): con
+    ellos, el índice i se busca por bisección y solo se recorre su bloque.
+    """
+
+    def __init__(self, bloques: List[list], inicios: List[int], generacion: int):
+        self._bloques = bloques
+        self._inicios = inicios
+        self._total = inicios[-1]
+        self.generacion = generacion
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __iter__(self) -> Iterator[Serie]:
+        # Todo en C: encadena los bloques y salta los huecos vacíos sin un bucle en Python
+        return filter(None, chain.from_iterable(self._bloques))
+
+    def _desde(self, indice: int) -> Iterator[Serie]:
+        """Series a partir de la posición 'indice' (0 <= indice < len)"""
+        numero = bisect_right(self._inicios, indice) - 1
+        series = filter(None, chain.from_iterable(islice(self._bloques, numero, None)))
+        return islice(series, indice - self._inicios[numero], None)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(self._total)
+            if paso < 0:
+                # Las mismas posiciones recorridas hacia delante y dadas la vuelta
+                return self[fin + 1:inicio + 1][::-1][::-paso]
+            if fin <= inicio:
+                return []
+            return list(islice(self._desde(inicio), 0, fin - inicio, paso))
+        if indice < 0:
+            indice += self._total
+        if not 0 <= indice < self._total:
+            raise IndexError("índice fuera de rango")
+        return next(self._desde(indice))
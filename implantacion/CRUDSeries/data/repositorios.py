@@ -0,0 +1,40 @@
+"""
+Elección del repositorio al arrancar (app.py, exportar.py e importar.py).
+"""
+
+import os
+from typing import Optional
+from data.serie_repository_base import SerieRepository
+from data.serie_repository_indexado import SerieRepositoryIndexado
+from data.serie_repository_columnar import SerieRepositoryColumnar
+from data.serie_repository_persistente import SerieRepositoryPersistente
+from data.serie_repository_sqlite import SerieRepositorySQLite
+
+# Repositorios disponibles: los dos primeros viven en memoria, los otros en el directorio de datos
+TIPOS_REPOSITORIO = ("indexado", "columnar", "persistente", "sqlite")
+DIRECTORIO_DATOS = "datos_series"
+ARCHIVO_SQLITE = "series.db"
+
+
+def crear_repositorio(tipo: Optional[str] = None, datos: Optional[str] = None, fsync: str = "siempre",
+                      datos_ejemplo: bool = True) -> SerieRepository:
+    """
+    Crea el repositorio pedido. Sin tipo, se usa el persistente si hay directorio de
+    datos y el indexado en memoria si no (el comportamiento de siempre).
+    """
+    if tipo is None:
+        tipo = "persistente" if datos else "indexado"
+    if tipo not in TIPOS_REPOSITORIO:
+        raise ValueError(f"Repositorio no válido: {tipo}")
+
+    if tipo in ("indexado", "columnar"):
+        if datos:
+            raise ValueError(f"El repositorio '{tipo}' vive en memoria: no usa directorio de datos")
+        if tipo == "indexado":
+            return SerieRepositoryIndexado(datos_ejemplo)
+        return SerieRepositoryColumnar(datos_ejemplo)
+
+    datos = datos or DIRECTORIO_DATOS
+    if tipo == "persistente":
+        return SerieRepositoryPersistente(datos, fsync=fsync, datos_ejemplo=datos_ejemplo)
+    return SerieRepositorySQLite(os.path.join(datos, ARCHIVO_SQLITE), fsync=fsync, datos_ejemplo=datos_ejemplo)
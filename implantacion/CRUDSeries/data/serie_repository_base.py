@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+from domain.model.serie import Serie
+
+class SerieRepository(ABC):
+    """
+    Operaciones que SerieManager necesita de un repositorio de series.
+    Las implementaciones solo están obligadas a dar los métodos abstractos; el resto
+    tiene una versión por defecto que pueden sustituir por otra más rápida.
+    """
+
+    @abstractmethod
+    def save(self, serie: Serie) -> Serie:
+        """Guarda una serie (crear si su ID es 0, si no actualizar) y la devuelve con su ID"""
+
+    def save_all(self, series: List[Serie]) -> List[Serie]:
+        """Guarda varias series (importación masiva)"""
+        for serie in series:
+            self.save(serie)
+        return series
+
+    @abstractmethod
+    def find_by_id(self, id: int) -> Optional[Serie]:
+        """Busca una serie por ID"""
+
+    @abstractmethod
+    def find_all(self) -> Sequence[Serie]:
+        """Retorna todas las series (una lista o una vista de solo lectura)"""
+
+    @abstractmethod
+    def find_by_titulo_containing(self, titulo: str) -> List[Serie]:
+        """Busca series que contengan el texto en el título"""
+
+    @abstractmethod
+    def find_by_titulo_starting(self, prefijo: str, limite: int = 10) -> List[Serie]:
+        """Autocompletado: series cuyo título empieza por el prefijo"""
+
+    @abstractmethod
+    def find_by_genero_containing(self, genero: str) -> List[Serie]:
+        """Busca series cuyo género contenga el texto (sin distinguir mayúsculas)"""
+
+    def find_by_genero(self, genero: str) -> List[Serie]:
+        """Busca series de un género exacto (sin distinguir mayúsculas)"""
+        genero_lower = genero.lower()
+        return [serie for serie in self.find_by_genero_containing(genero)
+                if serie.genero.lower() == genero_lower]
+
+    def find_by_año_estreno(self, año_estreno: int) -> List[Serie]:
+        """Busca series estrenadas en un año"""
+        return [serie for serie in self.find_all() if serie.año_estreno == año_estreno]
+
+    def find_by_año_estreno_entre(self, desde: Optional[int], hasta: Optional[int]) -> List[Serie]:
+        """Busca series estrenadas entre dos años, ambos incluidos (None: sin límite por ese lado)"""
+        return [serie for serie in self.find_all()
+                if (desde is None or serie.año_estreno >= desde) and (hasta is None or serie.año_estreno <= hasta)]
+
+    def estimar_resultados(self, criterio: str, valor) -> Optional[int]:
+        """
+        Cuántas series devolvería, aproximadamente, la búsqueda por índice de un criterio
+        de consulta: 'genero' (find_by_genero), 'años' ((desde, hasta), find_by_año_estreno_entre)
+        o 'titulo' (find_by_titulo_containing). None si no hay índice para él.
+        """
+        return None
+
+    @abstractmethod
+    def delete_by_id(self, id: int) -> bool:
+        """Elimina una serie por ID"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Retorna el número total de series"""
+
+    def exists_by_id(self, id: int) -> bool:
+        """Verifica si existe una serie con el ID especificado"""
+        return self.find_by_id(id) is not None
+
+    def cerrar(self):
+        """Libera los recursos del repositorio (archivos, conexiones); en memoria no hace nada"""
@@ -0,0 +1,127 @@
+import heapq
+from typing import List, Optional
+from domain.model.serie import Serie
+from data.serie_repository_base import SerieRepository
+from data.serie_repository import crear_series_ejemplo
+from data.almacen_columnar import AlmacenColumnar, VistaSeries
+from data.indice_titulos import IndiceTitulos, normalizar
+
+class SerieRepositoryColumnar(SerieRepository):
+    """
+    Repositorio en memoria compacto para catálogos muy grandes.
+    Guarda las series en un AlmacenColumnar (unas decenas de bytes por serie en lugar
+    de cientos) y crea los objetos Serie solo cuando se devuelven. Las búsquedas por
+    género y año recorren columnas de enteros; la búsqueda por título puede usar el
+    índice de trigramas (más rápido, pero ocupa bastante más memoria).
+    """
+
+    def __init__(self, datos_ejemplo: bool = True, indexar_titulos: bool = False):
+        self._almacen = AlmacenColumnar()
+        self._indice_titulos = IndiceTitulos() if indexar_titulos else None
+        self._next_id: int = 1
+        if datos_ejemplo:
+            self._initialize_data()
+
+    def _initialize_data(self):
+        """Inicializa datos de ejemplo"""
+        for serie in crear_series_ejemplo():
+            self.save(serie)
+
+    def save(self, serie: Serie) -> Serie:
+        """
+        Guarda una serie (crear o actualizar).
+        Se copian sus valores al almacén: cambiar el objeto después no afecta hasta volver a guardarlo.
+        """
+        nueva = serie.id == 0
+        if nueva:
+            # Nueva serie - asignar nuevo ID
+            serie.id = self._next_id
+        try:
+            self._almacen.guardar(serie)
+        except (ValueError, TypeError):
+            # El almacén no ha cambiado: tampoco se gasta el ID
+            if nueva:
+                serie.id = 0
+            raise
+        if serie.id >= self._next_id:
+            self._next_id = serie.id + 1
+        if self._indice_titulos is not None:
+            self._indice_titulos.agregar(serie.id, serie.titulo)
+        return serie
+
+    def find_by_id(self, id: int) -> Optional[Serie]:
+        """Busca una serie por ID"""
+        return self._almacen.obtener(id)
+
+    def find_all(self) -> VistaSeries:
+        """
+        Retorna todas las series: vista sobre una copia de las columnas (no cambia aunque después
+        se escriba o se compacte) que crea cada Serie al recorrerla
+        """
+        return self._almacen.instantanea()
+
+    def columnas(self) -> dict:
+        """Columnas del almacén, para análisis vectorizados sin crear objetos Serie"""
+        return self._almacen.columnas()
+
+    def find_by_titulo_containing(self, titulo: str) -> List[Serie]:
+        """Busca series que contengan el título especificado (sin distinguir tildes ni mayúsculas)"""
+        if self._indice_titulos is not None:
+            return [self._almacen.obtener(id) for id in self._indice_titulos.buscar(titulo)]
+        buscado = normalizar(titulo)
+        return [self._almacen.serie(fila) for fila in self._almacen.filas()
+                if buscado in normalizar(self._almacen.titulo(fila))]
+
+    def find_by_titulo_starting(self, prefijo: str, limite: int = 10) -> List[Serie]:
+        """Autocompletado: series cuyo título empieza por el prefijo"""
+        if self._indice_titulos is not None:
+            return [self._almacen.obtener(id) for id in self._indice_titulos.autocompletar(prefijo, limite)]
+        buscado = normalizar(prefijo)
+        encontradas = (fila for fila in self._almacen.filas()
+                       if normalizar(self._almacen.titulo(fila)).startswith(buscado))
+        mejores = heapq.nsmallest(limite, encontradas,
+                                  key=lambda fila: (len(self._almacen.titulo(fila)), fila))
+        return [self._almacen.serie(fila) for fila in mejores]
+
+    def find_by_genero_containing(self, genero: str) -> List[Serie]:
+        """Busca series por género (compara los géneros distintos y después recorre sus códigos)"""
+        genero_lower = genero.lower()
+        codigos = self._almacen.codigos_genero(lambda nombre: genero_lower in nombre.lower())
+        series = [self._almacen.serie(fila) for fila in self._almacen.filas_con_genero(codigos)]
+        return sorted(series, key=lambda serie: serie.id)
+
+    def find_by_genero(self, genero: str) -> List[Serie]:
+        """Busca series de un género exacto (sin distinguir mayúsculas)"""
+        genero_lower = genero.lower()
+        codigos = self._almacen.codigos_genero(lambda nombre: nombre.lower() == genero_lower)
+        return [self._almacen.serie(fila) for fila in self._almacen.filas_con_genero(codigos)]
+
+    def find_by_año_estreno(self, año_estreno: int) -> List[Serie]:
+        """Busca series estrenadas en un año"""
+        return [self._almacen.serie(fila) for fila in self._almacen.filas_con_año(año_estreno)]
+
+    def find_by_año_estreno_entre(self, desde: Optional[int], hasta: Optional[int]) -> List[Serie]:
+        """Busca series estrenadas entre dos años, ambos incluidos (recorre la columna de años)"""
+        return [self._almacen.serie(fila) for fila in self._almacen.filas_con_años(desde, hasta)]
+
+    def estimar_resultados(self, criterio: str, valor) -> Optional[int]:
+        """Solo el título puede tener índice; género y años se buscan recorriendo columnas"""
+        if criterio == 'titulo' and self._indice_titulos is not None:
+            return self._indice_titulos.estimar(valor)
+        return None
+
+    def delete_by_id(self, id: int) -> bool:
+        """Elimina una serie por ID"""
+        if not self._almacen.eliminar(id):
+            return False
+        if self._indice_titulos is not None:
+            self._indice_titulos.eliminar(id)
+        return True
+
+    def count(self) -> int:
+        """Retorna el número total de series"""
+        return len(self._almacen)
+
+    def exists_by_id(self, id: int) -> bool:
+        """Verifica si existe una serie con el ID especificado"""
+        return self._almacen.fila_de(id) is not None
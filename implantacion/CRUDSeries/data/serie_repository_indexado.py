@@ -0,0 +1,185 @@
+from typing import Dict, List, Optional, Tuple
+from domain.model.serie import Serie
+from data.serie_repository_base import SerieRepository
+from data.serie_repository import crear_series_ejemplo
+from data.indice_titulos import IndiceTitulos
+from data.instantaneas import InstantaneaSeries, SeriesVersionadas
+
+class SerieRepositoryIndexado(SerieRepository):
+    """
+    Repositorio en memoria indexado.
+    Las series se guardan en un diccionario id -> Serie (que conserva el orden de inserción)
+    y hay índices secundarios por género y por año de estreno, así que buscar, actualizar
+    y borrar por ID son O(1) en lugar de recorrer toda la lista.
+    Los títulos se indexan por trigramas para las búsquedas por texto.
+    find_all() devuelve una instantánea (data/instantaneas.py) en lugar de copiar el catálogo.
+    """
+
+    def __init__(self, datos_ejemplo: bool = True):
+        self._series: Dict[int, Serie] = {}
+        # Índices secundarios: clave -> {id: None} (un "set" que mantiene el orden)
+        self._por_genero: Dict[str, Dict[int, None]] = {}
+        self._por_año: Dict[int, Dict[int, None]] = {}
+        # Valores indexados de cada serie, para poder reindexarla aunque se modifique el objeto
+        self._claves: Dict[int, Tuple[str, int]] = {}
+        self._indice_titulos = IndiceTitulos()
+        # Las mismas series por bloques de IDs, para dar instantáneas sin copiarlas
+        self._versiones = SeriesVersionadas()
+        self._next_id: int = 1
+        if datos_ejemplo:
+            self._initialize_data()
+
+    def _initialize_data(self):
+        """Inicializa datos de ejemplo"""
+        series_ejemplo = crear_series_ejemplo()
+
+        for serie in series_ejemplo:
+            self.save(serie)
+
+    def _indexar(self, serie: Serie):
+        """Añade la serie a los índices secundarios (el de títulos solo cambia si cambia el título)"""
+        genero = serie.genero.lower()
+        self._por_genero.setdefault(genero, {})[serie.id] = None
+        self._por_año.setdefault(serie.año_estreno, {})[serie.id] = None
+        self._claves[serie.id] = (genero, serie.año_estreno)
+        self._indice_titulos.agregar(serie.id, serie.titulo)
+
+    def _desindexar(self, id: int):
+        """Quita la serie de los índices de género y año"""
+        genero, año = self._claves.pop(id)
+        ids_genero = self._por_genero[genero]
+        del ids_genero[id]
+        if not ids_genero:
+            del self._por_genero[genero]
+        ids_año = self._por_año[año]
+        del ids_año[id]
+        if not ids_año:
+            del self._por_año[año]
+
+    def save(self, serie: Serie) -> Serie:
+        """Guarda una serie (crear o actualizar)"""
+        if serie.id == 0:
+            # Nueva serie - asignar nuevo ID
+            serie.id = self._next_id
+            self._next_id += 1
+        elif serie.id in self._series:
+            # Actualizar serie existente (puede ser el mismo objeto ya modificado)
+            self._desindexar(serie.id)
+        elif serie.id >= self._next_id:
+            # Serie con ID explícito: los IDs nuevos seguirán a partir de él
+            self._next_id = serie.id + 1
+
+        self._series[serie.id] = serie
+        self._versiones.poner(serie)
+        self._indexar(serie)
+        return serie
+
+    def save_all(self, series: List[Serie]) -> List[Serie]:
+        """
+        Guarda varias series nuevas de una vez (importación masiva).
+        Mismo resultado que llamar a save() con cada una, pero los títulos se indexan juntos.
+        Las series con un ID que aún no existe (p. ej. asignado antes por una subclase)
+        también van por el camino rápido.
+        """
+        nuevas = []
+        nuevas_series = []
+        for serie in series:
+            if serie.id in self._series:
+                # Antes se indexa lo pendiente: la serie puede ser de este mismo lote
+                self._indice_titulos.agregar_varios(nuevas)
+                self._versiones.poner_varias(nuevas_series)
+                nuevas, nuevas_series = [], []
+                # Sin pasar por save() de las subclases: ellas registran el lote entero
+                SerieRepositoryIndexado.save(self, serie)
+                continue
+            if serie.id == 0:
+                serie.id = self._next_id
+            self._next_id = max(self._next_id, serie.id + 1)
+            self._series[serie.id] = serie
+            genero = serie.genero.lower()
+            self._por_genero.setdefault(genero, {})[serie.id] = None
+            self._por_año.setdefault(serie.año_estreno, {})[serie.id] = None
+            self._claves[serie.id] = (genero, serie.año_estreno)
+            nuevas.append((serie.id, serie.titulo))
+            nuevas_series.append(serie)
+        self._indice_titulos.agregar_varios(nuevas)
+        self._versiones.poner_varias(nuevas_series)
+        return series
+
+    def find_by_id(self, id: int) -> Optional[Serie]:
+        """Busca una serie por ID"""
+        return self._series.get(id)
+
+    def find_all(self) -> InstantaneaSeries:
+        """
+        Retorna todas las series, por orden de ID: una foto fija del catálogo que no cambia
+        aunque después se guarden o borren series. Mientras no haya cambios, todas las
+        llamadas devuelven la misma; tras un cambio, crearla cuesta un puntero por cada
+        1024 IDs, no copiar la lista.
+        """
+        return self._versiones.instantanea()
+
+    def find_by_titulo_containing(self, titulo: str) -> List[Serie]:
+        """
+        Busca series que contengan el título especificado (sin distinguir tildes ni mayúsculas).
+        Las mejores coincidencias van primero: título exacto, empieza por el texto, etc.
+        """
+        return [self._series[id] for id in self._indice_titulos.buscar(titulo)]
+
+    def find_by_titulo_starting(self, prefijo: str, limite: int = 10) -> List[Serie]:
+        """Autocompletado: series cuyo título empieza por el prefijo"""
+        return [self._series[id] for id in self._indice_titulos.autocompletar(prefijo, limite)]
+
+    def find_by_genero_containing(self, genero: str) -> List[Serie]:
+        """Busca series por género (recorre los géneros distintos, no todas las series)"""
+        genero_lower = genero.lower()
+        ids = [id for clave, ids_genero in self._por_genero.items() if genero_lower in clave
+               for id in ids_genero]
+        return [self._series[id] for id in sorted(ids)]
+
+    def find_by_genero(self, genero: str) -> List[Serie]:
+        """Busca series de un género exacto (sin distinguir mayúsculas)"""
+        ids = self._por_genero.get(genero.lower(), {})
+        return [self._series[id] for id in ids]
+
+    def find_by_año_estreno(self, año_estreno: int) -> List[Serie]:
+        """Busca series estrenadas en un año"""
+        ids = self._por_año.get(año_estreno, {})
+        return [self._series[id] for id in ids]
+
+    def _años_entre(self, desde: Optional[int], hasta: Optional[int]) -> List[int]:
+        """Años del índice entre 'desde' y 'hasta' (recorre los años distintos, no las series)"""
+        return [año for año in self._por_año
+                if (desde is None or año >= desde) and (hasta is None or año <= hasta)]
+
+    def find_by_año_estreno_entre(self, desde: Optional[int], hasta: Optional[int]) -> List[Serie]:
+        """Busca series estrenadas entre dos años, ambos incluidos (None: sin límite por ese lado)"""
+        return [self._series[id] for año in self._años_entre(desde, hasta) for id in self._por_año[año]]
+
+    def estimar_resultados(self, criterio: str, valor) -> Optional[int]:
+        """Tamaño de las listas del índice: exacto para género y años, cota superior para el título"""
+        if criterio == 'genero':
+            return len(self._por_genero.get(valor.lower(), ()))
+        if criterio == 'años':
+            return sum(len(self._por_año[año]) for año in self._años_entre(*valor))
+        if criterio == 'titulo':
+            return self._indice_titulos.estimar(valor)
+        return None
+
+    def delete_by_id(self, id: int) -> bool:
+        """Elimina una serie por ID"""
+        if id in self._series:
+            del self._series[id]
+            self._versiones.quitar(id)
+            self._desindexar(id)
+            self._indice_titulos.eliminar(id)
+            return True
+        return False
+
+    def count(self) -> int:
+        """Retorna el número total de series"""
+        return len(self._series)
+
+    def exists_by_id(self, id: int) -> bool:
+        """Verifica si existe una serie con el ID especificado"""
+        return id in self._series
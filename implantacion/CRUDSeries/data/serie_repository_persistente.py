@@ -0,0 +1,238 @@
+import json
+import os
+import time
+from typing import List
+from domain.model.serie import Serie
+from data.serie_repository_indexado import SerieRepositoryIndexado
+
+# Políticas de fsync del log
+FSYNC_SIEMPRE = "siempre"      # fsync tras cada operación: no se pierde nada confirmado
+FSYNC_INTERVALO = "intervalo"  # fsync como mucho cada 'intervalo_fsync' segundos
+FSYNC_NUNCA = "nunca"          # solo flush: el sistema operativo decide cuándo escribir a disco
+
+class SerieRepositoryPersistente(SerieRepositoryIndexado):
+    """
+    Repositorio indexado con persistencia en disco.
+    - Cada alta, cambio o baja se añade a un log (una línea JSON por operación)
+      antes de aplicarla en memoria (write-ahead): si falla la escritura o el fsync,
+      el catálogo en memoria no cambia y no hay nada que se pierda al reiniciar.
+    - Cada 'operaciones_por_snapshot' operaciones (o tantas como series haya, si son
+      más) se escribe un snapshot compacto con todo el catálogo y se vacía el log.
+    - Al arrancar se carga el último snapshot y se reaplican las operaciones del log.
+    """
+
+    def __init__(self, directorio: str = "datos_series", fsync: str = FSYNC_SIEMPRE,
+                 intervalo_fsync: float = 1.0, operaciones_por_snapshot: int = 10000,
+                 datos_ejemplo: bool = True):
+        super().__init__(datos_ejemplo=False)
+        if fsync not in (FSYNC_SIEMPRE, FSYNC_INTERVALO, FSYNC_NUNCA):
+            raise ValueError(f"Política de fsync no válida: {fsync}")
+
+        self._directorio = directorio
+        self._ruta_log = os.path.join(directorio, "series.log")
+        self._ruta_snapshot = os.path.join(directorio, "series.snapshot.json")
+        self._fsync = fsync
+        self._intervalo_fsync = intervalo_fsync
+        self._operaciones_por_snapshot = operaciones_por_snapshot
+        self._ultimo_fsync = time.monotonic()
+        self._lsn = 0  # Número de la última operación registrada
+        self._operaciones_en_log = 0
+        self._log = None
+
+        os.makedirs(directorio, exist_ok=True)
+        hay_datos = self._recuperar()
+        self._log = open(self._ruta_log, "a", encoding="utf-8")
+
+        if not hay_datos and datos_ejemplo:
+            self._initialize_data()
+
+    # ---------- Recuperación ----------
+
+    def _recuperar(self) -> bool:
+        """Carga el snapshot y reaplica el log. Devuelve False si no había datos guardados."""
+        hay_datos = False
+
+        if os.path.exists(self._ruta_snapshot):
+            with open(self._ruta_snapshot, encoding="utf-8") as fichero:
+                snapshot = json.load(fichero)
+            for datos in snapshot["series"]:
+                SerieRepositoryIndexado.save(self, Serie.from_dict(datos))
+            self._lsn = snapshot["lsn"]
+            self._next_id = max(self._next_id, snapshot["next_id"])
+            hay_datos = True
+
+        if os.path.exists(self._ruta_log):
+            with open(self._ruta_log, "rb") as fichero:
+                posicion_valida = 0
+                for linea in fichero:
+                    try:
+                        operacion = json.loads(linea)
+                    except ValueError:
+                        # Última línea a medio escribir (el proceso murió escribiéndola)
+                        break
+                    if not linea.endswith(b"\n"):
+                        break
+                    posicion_valida += len(linea)
+                    hay_datos = True
+                    if operacion["lsn"] <= self._lsn:
+                        continue  # Ya incluida en el snapshot
+                    self._aplicar(operacion)
+                    self._lsn = operacion["lsn"]
+                    self._operaciones_en_log += 1
+
+            # Se descarta la cola corrupta para que las siguientes operaciones no queden detrás
+            if posicion_valida != os.path.getsize(self._ruta_log):
+                with open(self._ruta_log, "r+b") as fichero:
+                    fichero.truncate(posicion_valida)
+
+        return hay_datos
+
+    def _aplicar(self, operacion: dict):
+        """Reaplica una operación del log sin volver a registrarla"""
+        if operacion["op"] == "save":
+            SerieRepositoryIndexado.save(self, Serie.from_dict(operacion["serie"]))
+        elif operacion["op"] == "delete":
+            SerieRepositoryIndexado.delete_by_id(self, operacion["id"])
+
+    # ---------- Escritura ----------
+
+    def _registrar(self, operacion: dict):
+        """Añade la operación al log respetando la política de fsync"""
+        self._registrar_varias([operacion])
+
+    def _registrar_varias(self, operaciones: List[dict]):
+        """
+        Añade varias operaciones al log con una sola escritura (y como mucho un fsync).
+        Si algo falla, el log vuelve a quedar como estaba y se relanza el error.
+        """
+        lsn_anterior = self._lsn
+        # Tras cada registro se hace flush: el tamaño del fichero es donde empieza este
+        tamaño_anterior = os.fstat(self._log.fileno()).st_size
+        lineas = []
+        for operacion in operaciones:
+            self._lsn += 1
+            operacion["lsn"] = self._lsn
+            lineas.append(json.dumps(operacion, ensure_ascii=False) + "\n")
+        try:
+            self._log.write("".join(lineas))
+            self._log.flush()
+
+            if self._fsync == FSYNC_SIEMPRE:
+                os.fsync(self._log.fileno())
+            elif self._fsync == FSYNC_INTERVALO:
+                ahora = time.monotonic()
+                if ahora - self._ultimo_fsync >= self._intervalo_fsync:
+                    os.fsync(self._log.fileno())
+                    self._ultimo_fsync = ahora
+        except BaseException:
+            self._lsn = lsn_anterior
+            self._descartar_log_desde(tamaño_anterior)
+            raise
+
+        self._operaciones_en_log += len(operaciones)
+
+    def _descartar_log_desde(self, posicion: int):
+        """Quita del log lo escrito a partir de 'posicion' (una escritura que ha fallado)"""
+        try:
+            self._log.close()  # Puede volver a fallar al vaciar el buffer: da igual, se trunca
+        except OSError:
+            pass
+        with open(self._ruta_log, "r+b") as fichero:
+            fichero.truncate(posicion)
+        self._log = open(self._ruta_log, "a", encoding="utf-8")
+
+    def _compactar_si_toca(self):
+        """Escribe un snapshot si el log ya es largo (después de aplicar la operación en memoria)"""
+        # Con catálogos grandes el snapshot se escribe cuando el log ya es tan largo como el
+        # catálogo: así una carga masiva no reescribe millones de series cada pocos miles
+        if self._operaciones_en_log >= max(self._operaciones_por_snapshot, len(self._series)):
+            self.compactar()
+
+    def save(self, serie: Serie) -> Serie:
+        """Registra la serie en el log y después la guarda en memoria (crear o actualizar)"""
+        # El ID se asigna antes de escribir el log: el registro tiene que llevarlo
+        next_id_anterior = self._next_id
+        nueva = serie.id == 0
+        if nueva:
+            serie.id = self._next_id
+            self._next_id += 1
+        try:
+            self._registrar({"op": "save", "serie": serie.to_dict()})
+        except BaseException:
+            if nueva:
+                serie.id = 0
+            self._next_id = next_id_anterior
+            raise
+        super().save(serie)
+        self._compactar_si_toca()
+        return serie
+
+    def save_all(self, series: List[Serie]) -> List[Serie]:
+        """Registra varias series en el log con una sola escritura y después las guarda"""
+        # Mismos IDs que con save() una a una: un ID explícito mayor adelanta a los siguientes
+        next_id_anterior = self._next_id
+        nuevas = []
+        for serie in series:
+            if serie.id == 0:
+                serie.id = self._next_id
+                nuevas.append(serie)
+            self._next_id = max(self._next_id, serie.id + 1)
+        try:
+            self._registrar_varias([{"op": "save", "serie": serie.to_dict()} for serie in series])
+        except BaseException:
+            for serie in nuevas:
+                serie.id = 0
+            self._next_id = next_id_anterior
+            raise
+        super().save_all(series)
+        self._compactar_si_toca()
+        return series
+
+    def delete_by_id(self, id: int) -> bool:
+        """Registra la baja en el log y después elimina la serie"""
+        if id not in self._series:
+            return False
+        self._registrar({"op": "delete", "id": id})
+        super().delete_by_id(id)
+        self._compactar_si_toca()
+        return True
+
+    # ---------- Snapshots ----------
+
+    def compactar(self):
+        """Escribe un snapshot con todo el catálogo y vacía el log"""
+        temporal = self._ruta_snapshot + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as fichero:
+            json.dump({
+                "lsn": self._lsn,
+                "next_id": self._next_id,
+                "series": [serie.to_dict() for serie in self._series.values()]
+            }, fichero, ensure_ascii=False)
+            fichero.flush()
+            os.fsync(fichero.fileno())
+
+        # Sustitución atómica: o queda el snapshot anterior o el nuevo, nunca uno a medias
+        os.replace(temporal, self._ruta_snapshot)
+        self._sincronizar_directorio()
+
+        # Si el proceso muere aquí, el log se reaplica igual: sus operaciones tienen lsn <= snapshot
+        self._log.close()
+        self._log = open(self._ruta_log, "w", encoding="utf-8")
+        self._operaciones_en_log = 0
+
+    def _sincronizar_directorio(self):
+        """Hace fsync del directorio para que el rename sobreviva a un apagón (no existe en Windows)"""
+        if os.name == "nt":
+            return
+        descriptor = os.open(self._directorio, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def cerrar(self):
+        """Escribe los datos pendientes y cierra el log"""
+        if self._log and not self._log.closed:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._log.close()
@@ -0,0 +1,542 @@
+import os
+import sqlite3
+import threading
+import weakref
+from collections.abc import Sequence
+from contextlib import contextmanager
+from bisect import bisect_left
+from typing import Iterator, List, Optional, Tuple
+from domain.model.serie import Serie
+from data.serie_repository_base import SerieRepository
+from data.serie_repository import crear_series_ejemplo
+from data.indice_titulos import normalizar
+
+# Política de fsync (la misma que SerieRepositoryPersistente) -> PRAGMA synchronous.
+# Con WAL, NORMAL no corrompe nunca la base, pero un apagón puede perder las últimas transacciones
+SINCRONIZACION = {
+    "siempre": "FULL",
+    "intervalo": "NORMAL",
+    "nunca": "OFF",
+}
+
+# Caché de páginas (por defecto SQLite usa 2 MB) y tamaño del WAL antes de volcarlo a la base:
+# con más margen, los lotes grandes tocan menos veces las mismas páginas de los índices
+CACHE_KB = 64 * 1024
+PAGINAS_WAL_CHECKPOINT = 10000
+
+# Cuánto espera una escritura a que otra conexión suelte el bloqueo antes de dar error
+ESPERA_BLOQUEO_S = 30.0
+
+# Los títulos se guardan también normalizados (sin tildes ni mayúsculas, como en IndiceTitulos):
+# el índice B-tree sirve para autocompletar y la tabla FTS5 de trigramas para buscar texto
+# en cualquier parte del título. Las bajas y los cambios de título se pasan a la tabla FTS
+# con triggers; las altas las indexa el repositorio por lotes (ver INDEXAR_TITULOS).
+# El género se compara en minúsculas de Python (genero_normalizado, str.lower, como el resto
+# de repositorios): COLLATE NOCASE solo pasa a minúsculas las letras ASCII y no juntaría "Ñ"
+# con "ñ". La columna genero no tiene COLLATE: ORDER BY genero y los cursores de las consultas
+# comparan como las cadenas de Python, y una consulta pagina igual que en memoria.
+TABLA = """
+CREATE TABLE IF NOT EXISTS {nombre} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    titulo TEXT NOT NULL,
+    titulo_normalizado TEXT NOT NULL,
+    genero TEXT NOT NULL,
+    genero_normalizado TEXT NOT NULL,
+    temporadas INTEGER NOT NULL,
+    año_estreno INTEGER NOT NULL,
+    calificacion REAL NOT NULL DEFAULT 0
+)"""
+
+ESQUEMA = TABLA.format(nombre="series") + """;
+CREATE INDEX IF NOT EXISTS series_titulo ON series (titulo_normalizado);
+CREATE INDEX IF NOT EXISTS series_genero_normalizado ON series (genero_normalizado);
+CREATE INDEX IF NOT EXISTS series_año_estreno ON series (año_estreno);
+CREATE INDEX IF NOT EXISTS series_genero ON series (genero);
+CREATE INDEX IF NOT EXISTS series_calificacion ON series (calificacion, temporadas);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS series_fts USING fts5 (
+    titulo_normalizado, content='series', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS series_borrada AFTER DELETE ON series BEGIN
+    INSERT INTO series_fts (series_fts, rowid, titulo_normalizado)
+    VALUES ('delete', old.id, old.titulo_normalizado);
+END;
+CREATE TRIGGER IF NOT EXISTS series_titulo_cambiado AFTER UPDATE OF titulo_normalizado ON series
+WHEN old.titulo_normalizado <> new.titulo_normalizado BEGIN
+    INSERT INTO series_fts (series_fts, rowid, titulo_normalizado)
+    VALUES ('delete', old.id, old.titulo_normalizado);
+    INSERT INTO series_fts (rowid, titulo_normalizado) VALUES (new.id, new.titulo_normalizado);
+END;
+"""
+
+# Consultas fijas: el módulo sqlite3 guarda compiladas las últimas usadas, así que cada
+# una se prepara una sola vez y después solo se le pasan los parámetros
+COLUMNAS = "id, titulo, genero, temporadas, año_estreno, calificacion"
+
+INSERTAR = """
+INSERT INTO series (id, titulo, titulo_normalizado, genero, genero_normalizado, temporadas, año_estreno,
+    calificacion)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ACTUALIZAR = """
+UPDATE series SET titulo = ?, titulo_normalizado = ?, genero = ?, genero_normalizado = ?, temporadas = ?,
+    año_estreno = ?, calificacion = ?
+WHERE id = ?
+"""
+
+# Un INSERT ... SELECT por lote es varias veces más rápido que un trigger que indexe fila a fila
+INDEXAR_TITULOS = """
+INSERT INTO series_fts (rowid, titulo_normalizado)
+SELECT id, titulo_normalizado FROM series WHERE id BETWEEN ? AND ?
+"""
+
+ULTIMO_ID = "SELECT seq FROM sqlite_sequence WHERE name = 'series'"
+
+# Géneros distintos (en minúsculas) saltando por el índice (un salto por género, no una fila por serie)
+GENEROS = """
+WITH RECURSIVE generos (genero) AS (
+    SELECT MIN(genero_normalizado) FROM series
+    UNION ALL
+    SELECT (SELECT MIN(genero_normalizado) FROM series WHERE genero_normalizado > generos.genero)
+    FROM generos WHERE genero IS NOT NULL
+)
+SELECT genero FROM generos WHERE genero IS NOT NULL
+"""
+
+# Estadísticas con los índices de calificación y de género: los totales recorren el índice
+# (más estrecho que la tabla) y la mejor calificada es el último valor del índice
+ESTADISTICAS = "SELECT COUNT(*), SUM(calificacion), SUM(temporadas) FROM series"
+TOTALES_GENERO = "SELECT genero, COUNT(*) FROM series GROUP BY genero"
+MEJOR_CALIFICADA = f"SELECT {COLUMNAS} FROM series ORDER BY calificacion DESC LIMIT 1"
+
+# Orden de las coincidencias por título, el mismo que IndiceTitulos.buscar: título exacto,
+# empieza por el texto, alguna palabra empieza por el texto y el resto
+ORDEN_COINCIDENCIAS = """
+ORDER BY CASE
+        WHEN s.titulo_normalizado = :buscado THEN 0
+        WHEN substr(s.titulo_normalizado, 1, length(:buscado)) = :buscado THEN 1
+        WHEN instr(s.titulo_normalizado, ' ' || :buscado) > 0 THEN 2
+        ELSE 3
+    END,
+    instr(s.titulo_normalizado, :buscado), length(s.titulo_normalizado), s.id
+"""
+
+BUSCAR_TITULO_FTS = f"""
+SELECT {', '.join('s.' + columna for columna in COLUMNAS.split(', '))}
+FROM series_fts JOIN series AS s ON s.id = series_fts.rowid
+WHERE series_fts MATCH :frase
+{ORDEN_COINCIDENCIAS}
+"""
+
+BUSCAR_TITULO_LIKE = f"""
+SELECT {COLUMNAS} FROM series AS s
+WHERE s.titulo_normalizado LIKE :patron ESCAPE '\\'
+{ORDEN_COINCIDENCIAS}
+"""
+
+# Último carácter posible: cota superior de las cadenas que empiezan por un prefijo
+MAXIMO_UNICODE = "\U0010ffff"
+
+FILAS_POR_BLOQUE = 1000
+
+
+def patron_contiene(texto: str) -> str:
+    """Patrón LIKE (con ESCAPE '\\') que encuentra el texto en cualquier posición"""
+    return "%" + texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+class SerieRepositorySQLite(SerieRepository):
+    """
+    Repositorio en una base de datos SQLite.
+    El catálogo vive en disco (puede ser mayor que la memoria) y sobrevive a los reinicios.
+    Hay índices por título, género y año de estreno y una tabla FTS5 de trigramas para
+    buscar texto dentro de los títulos. La base usa WAL: las lecturas no esperan a las
+    escrituras y cada confirmación solo añade al final del archivo -wal.
+    """
+
+    def __init__(self, ruta: str = "series.db", fsync: str = "siempre", datos_ejemplo: bool = True):
+        if fsync not in SINCRONIZACION:
+            raise ValueError(f"Política de fsync no válida: {fsync}")
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        self._ruta = ruta
+        self._sincronizacion = SINCRONIZACION[fsync]
+        # Una conexión por hilo: con WAL, cada lector ve una foto coherente de la base y no
+        # espera a nadie; las escrituras se turnan con el bloqueo de SQLite (BEGIN IMMEDIATE)
+        self._local = threading.local()
+        self._conexiones: List[sqlite3.Connection] = []
+        self._cerrojo_conexiones = threading.Lock()
+        self._abierta = True
+        # Escrituras hechas con este repositorio y la última vista de find_all (con las
+        # escrituras que había al crearla), para no abrir otra conexión si nada ha cambiado
+        self._cambios = 0
+        self._vista = (-1, lambda: None)
+        self._conexion.execute("PRAGMA journal_mode = WAL")
+        self._añadir_genero_normalizado()
+        self._quitar_nocase_genero()
+        self._conexion.executescript(ESQUEMA)
+
+        if datos_ejemplo and self._ultimo_id() == 0:
+            self.save_all(crear_series_ejemplo())
+
+    def _abrir_conexion(self) -> sqlite3.Connection:
+        if not self._abierta:
+            raise sqlite3.ProgrammingError("El repositorio SQLite está cerrado")
+        # Sin transacciones implícitas: se abren a mano donde hacen falta (save_all).
+        # check_same_thread=False para poder cerrarlas desde otro hilo (cerrar() y las vistas)
+        conexion = sqlite3.connect(self._ruta, isolation_level=None, check_same_thread=False,
+                                   timeout=ESPERA_BLOQUEO_S)
+        conexion.execute(f"PRAGMA synchronous = {self._sincronizacion}")
+        conexion.execute(f"PRAGMA cache_size = -{CACHE_KB}")
+        conexion.execute(f"PRAGMA wal_autocheckpoint = {PAGINAS_WAL_CHECKPOINT}")
+        return conexion
+
+    @property
+    def _conexion(self) -> sqlite3.Connection:
+        """Conexión del hilo actual (la abre la primera vez)"""
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            conexion = self._local.conexion = self._abrir_conexion()
+            with self._cerrojo_conexiones:
+                self._conexiones.append(conexion)
+        return conexion
+
+    def _añadir_genero_normalizado(self):
+        """Las bases creadas antes de la columna genero_normalizado la reciben rellena"""
+        columnas = [fila[1] for fila in self._conexion.execute("PRAGMA table_info(series)")]
+        if not columnas or 'genero_normalizado' in columnas:
+            return
+        self._conexion.create_function("minusculas", 1, str.lower, deterministic=True)
+        with self._transaccion():
+            self._conexion.execute("ALTER TABLE series ADD COLUMN genero_normalizado TEXT NOT NULL DEFAULT ''")
+            self._conexion.execute("UPDATE series SET genero_normalizado = minusculas(genero)")
+            self._conexion.execute("DROP INDEX IF EXISTS series_genero")
+
+    def _quitar_nocase_genero(self):
+        """
+        Las bases con genero COLLATE NOCASE se copian a una tabla nueva sin él (SQLite no
+        cambia la intercalación de una columna). Los índices, los triggers y la tabla FTS
+        (que sigue las filas por ID) se vuelven a crear después con ESQUEMA.
+        """
+        fila = self._conexion.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'series'").fetchone()
+        if fila is None or 'COLLATE NOCASE' not in fila[0].upper():
+            return
+        columnas = "id, titulo, titulo_normalizado, genero, genero_normalizado, temporadas, año_estreno, calificacion"
+        with self._transaccion():
+            ultimo_id = self._ultimo_id()
+            self._conexion.execute(TABLA.format(nombre="series_nueva"))
+            self._conexion.execute(f"INSERT INTO series_nueva ({columnas}) SELECT {columnas} FROM series")
+            self._conexion.execute("DROP TABLE series")
+            self._conexion.execute("ALTER TABLE series_nueva RENAME TO series")
+            # Sin esto, los IDs de series borradas por encima del mayor actual se reutilizarían
+            self._conexion.execute("DELETE FROM sqlite_sequence WHERE name = 'series'")
+            self._conexion.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('series', ?)", (ultimo_id,))
+
+    # ---------- Escritura ----------
+
+    @contextmanager
+    def _transaccion(self):
+        """BEGIN IMMEDIATE: toma el bloqueo de escritura al empezar, así nadie reparte los mismos IDs"""
+        self._conexion.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conexion.execute("ROLLBACK")
+            raise
+        self._conexion.execute("COMMIT")
+
+    def _ultimo_id(self) -> int:
+        """Mayor ID que se ha usado nunca (con AUTOINCREMENT los IDs borrados no se reutilizan)"""
+        fila = self._conexion.execute(ULTIMO_ID).fetchone()
+        return fila[0] if fila else 0
+
+    @staticmethod
+    def _valores(serie: Serie) -> tuple:
+        return (serie.titulo, normalizar(serie.titulo), serie.genero, serie.genero.lower(),
+                serie.temporadas, serie.año_estreno, serie.calificacion)
+
+    def _guardar(self, serie: Serie):
+        """Actualiza la serie si ya existe y si no la inserta (dentro de una transacción)"""
+        if serie.id != 0 and self._conexion.execute(ACTUALIZAR, self._valores(serie) + (serie.id,)).rowcount:
+            return
+        cursor = self._conexion.execute(INSERTAR, (serie.id or None,) + self._valores(serie))
+        serie.id = cursor.lastrowid
+        self._conexion.execute(INDEXAR_TITULOS, (serie.id, serie.id))
+
+    def save(self, serie: Serie) -> Serie:
+        """Guarda una serie (crear o actualizar)"""
+        with self._transaccion():
+            self._guardar(serie)
+        self._cambios += 1
+        return serie
+
+    def save_all(self, series: List[Serie]) -> List[Serie]:
+        """
+        Guarda varias series en una sola transacción (un solo fsync).
+        Las nuevas reciben IDs consecutivos, se insertan con executemany y sus títulos
+        se indexan con una sola consulta.
+        """
+        with self._transaccion():
+            nuevas = []
+            for serie in series:
+                if serie.id == 0:
+                    nuevas.append(serie)
+                else:
+                    self._guardar(serie)
+            if nuevas:
+                primero = self._ultimo_id() + 1
+                for id, serie in enumerate(nuevas, start=primero):
+                    serie.id = id
+                self._conexion.executemany(INSERTAR, ((serie.id,) + self._valores(serie) for serie in nuevas))
+                self._conexion.execute(INDEXAR_TITULOS, (primero, nuevas[-1].id))
+        self._cambios += 1
+        return series
+
+    def delete_by_id(self, id: int) -> bool:
+        """Elimina una serie por ID"""
+        borrada = self._conexion.execute("DELETE FROM series WHERE id = ?", (id,)).rowcount > 0
+        self._cambios += 1
+        return borrada
+
+    # ---------- Lectura ----------
+
+    def _series(self, consulta: str, parametros=()) -> List[Serie]:
+        return [Serie(*fila) for fila in self._conexion.execute(consulta, parametros)]
+
+    def find_by_id(self, id: int) -> Optional[Serie]:
+        """Busca una serie por ID"""
+        fila = self._conexion.execute(f"SELECT {COLUMNAS} FROM series WHERE id = ?", (id,)).fetchone()
+        return Serie(*fila) if fila else None
+
+    def find_all(self) -> 'VistaSeriesSQLite':
+        """
+        Retorna todas las series (vista que las lee de la base por bloques al recorrerla).
+        Si no se ha escrito desde la anterior y esta sigue viva, se devuelve la misma.
+        """
+        cambios, vista = self._vista
+        vista = vista() if cambios == self._cambios else None
+        if vista is None:
+            vista = VistaSeriesSQLite(self)
+            # Una sola asignación: otro hilo nunca ve la vista con el contador de otra
+            self._vista = (self._cambios, weakref.ref(vista))
+        return vista
+
+    def find_by_titulo_containing(self, titulo: str) -> List[Serie]:
+        """
+        Busca series que contengan el texto en el título (sin distinguir tildes ni mayúsculas),
+        las mejores coincidencias primero. Con 3 caracteres o más se usa el índice FTS5.
+        """
+        buscado = normalizar(titulo)
+        if len(buscado) >= 3:
+            # Entre comillas es una frase: con trigramas, la frase es una subcadena del título
+            frase = '"' + buscado.replace('"', '""') + '"'
+            return self._series(BUSCAR_TITULO_FTS, {'frase': frase, 'buscado': buscado})
+        return self._series(BUSCAR_TITULO_LIKE, {'patron': patron_contiene(buscado), 'buscado': buscado})
+
+    def find_by_titulo_starting(self, prefijo: str, limite: int = 10) -> List[Serie]:
+        """Autocompletado: recorre solo el tramo del índice de títulos que empieza por el prefijo"""
+        buscado = normalizar(prefijo)
+        return self._series(
+            f"SELECT {COLUMNAS} FROM series WHERE titulo_normalizado >= ? AND titulo_normalizado < ? "
+            "ORDER BY length(titulo_normalizado), id LIMIT ?",
+            (buscado, buscado + MAXIMO_UNICODE, limite))
+
+    def find_by_genero_containing(self, genero: str) -> List[Serie]:
+        """Busca series por género: compara los géneros distintos y después usa el índice de género"""
+        genero_lower = genero.lower()
+        generos = [nombre for (nombre,) in self._conexion.execute(GENEROS) if genero_lower in nombre]
+        if not generos:
+            return []
+        marcas = ", ".join("?" * len(generos))
+        return self._series(f"SELECT {COLUMNAS} FROM series WHERE genero_normalizado IN ({marcas}) ORDER BY id",
+                            generos)
+
+    def find_by_genero(self, genero: str) -> List[Serie]:
+        """Busca series de un género exacto (sin distinguir mayúsculas)"""
+        return self._series(f"SELECT {COLUMNAS} FROM series WHERE genero_normalizado = ? ORDER BY id",
+                            (genero.lower(),))
+
+    def find_by_año_estreno(self, año_estreno: int) -> List[Serie]:
+        """Busca series estrenadas en un año"""
+        return self._series(f"SELECT {COLUMNAS} FROM series WHERE año_estreno = ? ORDER BY id", (año_estreno,))
+
+    def find_by_año_estreno_entre(self, desde: Optional[int], hasta: Optional[int]) -> List[Serie]:
+        """Busca series estrenadas entre dos años, ambos incluidos (None: sin límite por ese lado)"""
+        return self._series(
+            f"SELECT {COLUMNAS} FROM series WHERE año_estreno BETWEEN ? AND ? ORDER BY año_estreno, id",
+            (-2 ** 63 if desde is None else desde, 2 ** 63 - 1 if hasta is None else hasta))
+
+    def consultar(self, consulta) -> List[Serie]:
+        """
+        Ejecuta una consulta de domain/consultas.py como una sola sentencia SQL: el
+        planificador de SQLite elige el índice más selectivo (con las estadísticas que
+        guarda PRAGMA optimize) y con LIMIT ordena solo las primeras filas.
+        """
+        tablas = "series AS s"
+        condiciones = []
+        parametros = []
+        if consulta.titulo_contiene:
+            buscado = normalizar(consulta.titulo_contiene)
+            if len(buscado) >= 3:
+                tablas = "series_fts JOIN series AS s ON s.id = series_fts.rowid"
+                condiciones.append("series_fts MATCH ?")
+                parametros.append('"' + buscado.replace('"', '""') + '"')
+            else:
+                condiciones.append("s.titulo_normalizado LIKE ? ESCAPE '\\'")
+                parametros.append(patron_contiene(buscado))
+        if consulta.genero is not None:
+            condiciones.append("s.genero_normalizado = ?")
+            parametros.append(consulta.genero.lower())
+        if consulta.genero_contiene is not None:
+            # Como find_by_genero_containing: los géneros que encajan y después el índice de género
+            texto = consulta.genero_contiene.lower()
+            generos = [nombre for (nombre,) in self._conexion.execute(GENEROS) if texto in nombre]
+            if not generos:
+                return []
+            condiciones.append(f"s.genero_normalizado IN ({', '.join('?' * len(generos))})")
+            parametros.extend(generos)
+        for columna, operador, valor in (
+                ("año_estreno", ">=", consulta.año_desde), ("año_estreno", "<=", consulta.año_hasta),
+                ("calificacion", ">=", consulta.calificacion_minima), ("calificacion", "<=", consulta.calificacion_maxima),
+                ("temporadas", ">=", consulta.temporadas_minimas), ("temporadas", "<=", consulta.temporadas_maximas)):
+            if valor is not None:
+                condiciones.append(f"s.{columna} {operador} ?")
+                parametros.append(valor)
+
+        # El campo de orden ya está validado por la consulta (es uno de los de Serie)
+        if consulta.despues is not None:
+            comparacion = "<" if consulta.descendente else ">"
+            condiciones.append(f"(s.{consulta.orden} {comparacion} ? OR (s.{consulta.orden} = ? AND s.id > ?))")
+            parametros.extend((consulta.despues[0], consulta.despues[0], consulta.despues[1]))
+        sentido = " DESC" if consulta.descendente else ""
+        orden = f"s.{consulta.orden}{sentido}" + (", s.id" if consulta.orden != 'id' else "")
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        parametros += [-1 if consulta.limite is None else consulta.limite, consulta.desplazamiento]
+        columnas = ', '.join('s.' + columna for columna in COLUMNAS.split(', '))
+        return self._series(f"SELECT {columnas} FROM {tablas} {donde} ORDER BY {orden} LIMIT ? OFFSET ?",
+                            parametros)
+
+    def count(self) -> int:
+        """Retorna el número total de series"""
+        return self._conexion.execute("SELECT COUNT(*) FROM series").fetchone()[0]
+
+    def estadisticas(self) -> dict:
+        """
+        Estadísticas en el formato de SerieManager.obtener_estadisticas, calculadas por la
+        base (sin cargar las series): SerieManager las usa en lugar de mantenerlas en memoria
+        """
+        total, suma_calificaciones, total_temporadas = self._conexion.execute(ESTADISTICAS).fetchone()
+        if not total:
+            return {
+                'total_series': 0,
+                'promedio_calificacion': 0,
+                'generos': {},
+                'serie_mejor_calificada': None,
+                'total_temporadas': 0
+            }
+        mejor = self._conexion.execute(MEJOR_CALIFICADA).fetchone()
+        return {
+            'total_series': total,
+            'promedio_calificacion': round(suma_calificaciones / total, 2),
+            'generos': dict(self._conexion.execute(TOTALES_GENERO)),
+            'serie_mejor_calificada': Serie(*mejor),
+            'total_temporadas': total_temporadas
+        }
+
+    def exists_by_id(self, id: int) -> bool:
+        """Verifica si existe una serie con el ID especificado"""
+        return self._conexion.execute("SELECT 1 FROM series WHERE id = ?", (id,)).fetchone() is not None
+
+    def cerrar(self):
+        """Actualiza las estadísticas del planificador y cierra las conexiones de todos los hilos"""
+        if self._abierta:
+            self._conexion.execute("PRAGMA optimize")
+            self._abierta = False
+            with self._cerrojo_conexiones:
+                for conexion in self._conexiones:
+                    conexion.close()
+                self._conexiones.clear()
+
+
+class VistaSeriesSQLite(Sequence):
+    """
+    Lista de series de solo lectura sobre la base de datos.
+    Tiene su propia conexión con una transacción de lectura abierta: con WAL ve la base tal
+    como estaba al crearla (su len() y lo que se recorre coinciden aunque después se escriba)
+    sin bloquear a nadie. Al recorrerla se leen las series por bloques, así que listar o
+    exportar un catálogo enorme no lo carga en memoria. Mientras la vista existe el WAL no se
+    puede volcar entero a la base: no conviene guardarla mucho tiempo.
+    """
+
+    def __init__(self, repositorio: SerieRepositorySQLite):
+        self._conexion = repositorio._abrir_conexion()
+        weakref.finalize(self, self._conexion.close)
+        # La foto de la base se fija en la primera lectura de la transacción: una consulta
+        # barata, el total solo se cuenta si se pide
+        self._conexion.execute("BEGIN")
+        self._conexion.execute(ULTIMO_ID).fetchone()
+        self._total: Optional[int] = None
+        # Posiciones ya leídas con el ID de su serie, ordenadas: un acceso por índice sigue
+        # desde la anterior más cercana (WHERE id > ?) en lugar de saltar filas desde el principio
+        self._marcas: List[Tuple[int, int]] = []
+        self._cerrojo_marcas = threading.Lock()
+
+    def __len__(self) -> int:
+        if self._total is None:
+            self._total = self._conexion.execute("SELECT COUNT(*) FROM series").fetchone()[0]
+        return self._total
+
+    def _series(self, inicio: int, limite: int) -> List[Serie]:
+        """Hasta 'limite' series (-1: todas) desde la posición 'inicio', en orden de ID"""
+        if limite == 0:
+            return []
+        with self._cerrojo_marcas:
+            anterior = bisect_left(self._marcas, (inicio,)) - 1
+            posicion, desde = self._marcas[anterior] if anterior >= 0 else (-1, 0)
+        series = [Serie(*fila) for fila in self._conexion.execute(
+            f"SELECT {COLUMNAS} FROM series WHERE id > ? ORDER BY id LIMIT ? OFFSET ?",
+            (desde, limite, inicio - posicion - 1))]
+        if series:
+            marca = (inicio + len(series) - 1, series[-1].id)
+            with self._cerrojo_marcas:
+                siguiente = bisect_left(self._marcas, marca)
+                if siguiente == len(self._marcas) or self._marcas[siguiente] != marca:
+                    self._marcas.insert(siguiente, marca)
+        return series
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            if ((indice.step is None or indice.step > 0) and (indice.start or 0) >= 0
+                    and (indice.stop is None or indice.stop >= 0)):
+                # Sin posiciones negativas no hace falta contar las series
+                inicio = indice.start or 0
+                limite = -1 if indice.stop is None else max(indice.stop - inicio, 0)
+                return self._series(inicio, limite)[::indice.step or 1]
+            inicio, fin, paso = indice.indices(len(self))
+            if paso < 0:
+                return list(self)[indice]
+            return self._series(inicio, max(fin - inicio, 0))[::paso]
+        if indice < 0:
+            indice += len(self)
+        series = self._series(indice, 1) if indice >= 0 else []
+        if not series:
+            raise IndexError("índice fuera de rango")
+        return series[0]
+
+    def __iter__(self) -> Iterator[Serie]:
+        """
+        Series en orden de ID, en bloques. Cada bloque es una consulta que sigue donde acabó
+        la anterior (WHERE id > ?), así no queda ningún cursor abierto entre bloques.
+        """
+        desde = 0
+        while True:
+            bloque = [Serie(*fila) for fila in self._conexion.execute(
+                f"SELECT {COLUMNAS} FROM series WHERE id > ? ORDER BY id LIMIT ?", (desde, FILAS_POR_BLOQUE))]
+            if not bloque:
+                return
+            yield from bloque
+            desde = bloque[-1].id
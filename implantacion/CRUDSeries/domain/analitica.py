@@ -0,0 +1,181 @@
+"""
+Análisis del catálogo: histograma de calificaciones, estadísticas por género y por
+década y mejores series de cada género.
+Con NumPy se calcula todo sobre columnas (arrays) sin recorrer las series una a una;
+sin NumPy se usa la versión en Python puro, que da los mismos resultados.
+"""
+
+from array import array
+from typing import Dict, Iterable, List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+PERCENTILES = (25, 50, 75, 90)
+INTERVALOS_HISTOGRAMA = 10
+
+
+def columnas_desde_series(series: Iterable) -> dict:
+    """Pasa una lista de series al formato por columnas que usa el análisis"""
+    columnas = {
+        'ids': array('q'),
+        'calificaciones': array('d'),
+        'años': array('q'),
+        'codigos_genero': array('I'),
+        'generos': [],
+    }
+    codigo_de_genero = {}
+    for serie in series:
+        codigo = codigo_de_genero.get(serie.genero)
+        if codigo is None:
+            codigo = codigo_de_genero[serie.genero] = len(columnas['generos'])
+            columnas['generos'].append(serie.genero)
+        columnas['ids'].append(serie.id)
+        columnas['calificaciones'].append(serie.calificacion)
+        columnas['años'].append(serie.año_estreno)
+        columnas['codigos_genero'].append(codigo)
+    return columnas
+
+
+def analizar(columnas: dict, top_k: int = 3, usar_numpy: bool = True) -> dict:
+    """
+    Calcula el análisis completo. 'columnas' tiene los arrays 'ids', 'calificaciones',
+    'años' y 'codigos_genero' (las filas con id 0 se ignoran) y la lista 'generos'.
+    En 'mejores_por_genero' se devuelven IDs de serie.
+    """
+    if usar_numpy and np is not None:
+        return _analizar_numpy(columnas, top_k)
+    return _analizar_python(columnas, top_k)
+
+
+# ---------- Versión vectorizada (NumPy) ----------
+
+def _analizar_numpy(columnas: dict, top_k: int) -> dict:
+    # frombuffer no copia: los arrays del almacén columnar se leen directamente
+    ids = np.frombuffer(columnas['ids'], dtype=np.int64)
+    vivas = ids != 0
+    ids = ids[vivas]
+    calificaciones = np.frombuffer(columnas['calificaciones'], dtype=np.float64)[vivas]
+    # El almacén columnar usa 16 bits y columnas_desde_series más: el tipo sale del array
+    años = np.frombuffer(columnas['años'], dtype=columnas['años'].typecode)[vivas].astype(np.int64)
+    codigos = np.frombuffer(columnas['codigos_genero'],
+                            dtype=columnas['codigos_genero'].typecode)[vivas].astype(np.int64)
+    generos = columnas['generos']
+
+    # Histograma: intervalos de 1 punto, el último incluye el 10
+    cuentas, bordes = np.histogram(calificaciones, bins=INTERVALOS_HISTOGRAMA, range=(0, 10))
+    histograma = [(float(bordes[i]), float(bordes[i + 1]), int(cuentas[i]))
+                  for i in range(INTERVALOS_HISTOGRAMA)]
+
+    # Ordenar por (género, calificación descendente, id): cada género queda en un tramo contiguo
+    orden = np.lexsort((ids, -calificaciones, codigos))
+    codigos_ordenados = codigos[orden]
+    calificaciones_ordenadas = calificaciones[orden]
+    presentes, inicios, cantidades = np.unique(codigos_ordenados, return_index=True, return_counts=True)
+    sumas = np.add.reduceat(calificaciones_ordenadas, inicios) if len(inicios) else np.array([])
+
+    # Percentiles por interpolación lineal dentro de cada tramo (igual que np.percentile).
+    # El tramo está en orden descendente: la posición p del orden ascendente es fin - p
+    resultados_percentiles = {}
+    for percentil in PERCENTILES:
+        posicion = (cantidades - 1) * (percentil / 100)
+        abajo = np.floor(posicion).astype(np.int64)
+        arriba = np.minimum(abajo + 1, cantidades - 1)
+        fin = inicios + cantidades - 1
+        valor_abajo = calificaciones_ordenadas[fin - abajo]
+        valor_arriba = calificaciones_ordenadas[fin - arriba]
+        resultados_percentiles[percentil] = valor_abajo + (valor_arriba - valor_abajo) * (posicion - abajo)
+
+    por_genero = {}
+    for i, codigo in enumerate(presentes):
+        por_genero[generos[codigo]] = _resumen_genero(
+            int(cantidades[i]), float(sumas[i]) / int(cantidades[i]),
+            {p: float(valores[i]) for p, valores in resultados_percentiles.items()})
+
+    # Mejores de cada género: las primeras 'top_k' posiciones de cada tramo
+    posicion_en_tramo = np.arange(len(orden)) - np.repeat(inicios, cantidades)
+    seleccion = posicion_en_tramo < top_k
+    mejores_por_genero = {generos[codigo]: [] for codigo in presentes}
+    for codigo, id in zip(codigos_ordenados[seleccion].tolist(), ids[orden][seleccion].tolist()):
+        mejores_por_genero[generos[codigo]].append(id)
+
+    # Por década
+    decadas = años // 10 * 10
+    valores_decada, indices_decada = np.unique(decadas, return_inverse=True)
+    series_decada = np.bincount(indices_decada)
+    suma_decada = np.bincount(indices_decada, weights=calificaciones)
+    por_decada = {int(decada): {'series': int(series_decada[i]),
+                                'media': round(float(suma_decada[i]) / int(series_decada[i]), 2)}
+                  for i, decada in enumerate(valores_decada)}
+
+    return {
+        'total_series': int(len(ids)),
+        'histograma': histograma,
+        'por_genero': por_genero,
+        'por_decada': por_decada,
+        'mejores_por_genero': mejores_por_genero,
+    }
+
+
+# ---------- Versión en Python puro ----------
+
+def _percentil(ordenadas: List[float], percentil: float) -> float:
+    """Percentil con interpolación lineal sobre una lista ordenada de menor a mayor"""
+    posicion = (len(ordenadas) - 1) * (percentil / 100)
+    abajo = int(posicion)
+    arriba = min(abajo + 1, len(ordenadas) - 1)
+    return ordenadas[abajo] + (ordenadas[arriba] - ordenadas[abajo]) * (posicion - abajo)
+
+
+def _analizar_python(columnas: dict, top_k: int) -> dict:
+    generos = columnas['generos']
+    filas = [(id, calificacion, año, generos[codigo]) for id, calificacion, año, codigo
+             in zip(columnas['ids'], columnas['calificaciones'], columnas['años'], columnas['codigos_genero'])
+             if id != 0]
+
+    cuentas = [0] * INTERVALOS_HISTOGRAMA
+    por_genero_filas: Dict[str, List[tuple]] = {}
+    por_decada_filas: Dict[int, List[float]] = {}
+    for id, calificacion, año, genero in filas:
+        if 0 <= calificacion <= 10:
+            cuentas[min(int(calificacion * INTERVALOS_HISTOGRAMA / 10), INTERVALOS_HISTOGRAMA - 1)] += 1
+        por_genero_filas.setdefault(genero, []).append((calificacion, id))
+        por_decada_filas.setdefault(año // 10 * 10, []).append(calificacion)
+
+    ancho = 10 / INTERVALOS_HISTOGRAMA
+    histograma = [(i * ancho, (i + 1) * ancho, cuentas[i]) for i in range(INTERVALOS_HISTOGRAMA)]
+
+    por_genero = {}
+    mejores_por_genero = {}
+    for genero in sorted(por_genero_filas, key=generos.index):
+        valores = por_genero_filas[genero]
+        ordenadas = sorted(calificacion for calificacion, _ in valores)
+        por_genero[genero] = _resumen_genero(
+            len(valores), sum(ordenadas) / len(ordenadas),
+            {p: _percentil(ordenadas, p) for p in PERCENTILES})
+        mejores = sorted(valores, key=lambda valor: (-valor[0], valor[1]))[:top_k]
+        mejores_por_genero[genero] = [id for _, id in mejores]
+
+    por_decada = {decada: {'series': len(valores), 'media': round(sum(valores) / len(valores), 2)}
+                  for decada, valores in sorted(por_decada_filas.items())}
+
+    return {
+        'total_series': len(filas),
+        'histograma': histograma,
+        'por_genero': por_genero,
+        'por_decada': por_decada,
+        'mejores_por_genero': mejores_por_genero,
+    }
+
+
+def _resumen_genero(series: int, media: float, percentiles: dict) -> dict:
+    return {
+        'series': series,
+        'media': round(media, 2),
+        'mediana': round(percentiles[50], 2),
+        'p25': round(percentiles[25], 2),
+        'p75': round(percentiles[75], 2),
+        'p90': round(percentiles[90], 2),
+    }
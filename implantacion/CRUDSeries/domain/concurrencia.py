@@ -0,0 +1,48 @@
+import threading
+from contextlib import contextmanager
+
+
+class CerrojoLectoresEscritor:
+    """
+    Cerrojo de lectores/escritor: muchos hilos pueden leer a la vez, pero quien escribe
+    lo hace solo. Si hay un escritor esperando no entran lectores nuevos, así un flujo
+    continuo de lecturas no deja a las escrituras esperando para siempre.
+    No es reentrante: un hilo que ya lo tiene no debe volver a pedirlo.
+    """
+
+    def __init__(self):
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = 0
+        self._escribiendo = False
+        self._escritores_esperando = 0
+
+    @contextmanager
+    def lectura(self):
+        with self._condicion:
+            while self._escribiendo or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._lectores -= 1
+                if not self._lectores:
+                    self._condicion.notify_all()
+
+    @contextmanager
+    def escritura(self):
+        with self._condicion:
+            self._escritores_esperando += 1
+            try:
+                while self._escribiendo or self._lectores:
+                    self._condicion.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escribiendo = True
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._escribiendo = False
+                self._condicion.notify_all()
@@ -0,0 +1,231 @@
+"""
+Consultas de series con varios criterios a la vez: filtros, orden, paginación y proyección.
+
+    consulta = (Consulta().del_genero("Drama").estrenadas_entre(2010, 2020)
+                .con_calificacion_entre(minima=8.5).ordenar_por("calificacion", descendente=True)
+                .paginar(10))
+    serie_manager.consultar(consulta)
+
+El planificador pregunta al repositorio cuántas series devolvería cada índice que
+puede usar la consulta (género, rango de años, título) y empieza por el más selectivo;
+el resto de criterios se comprueban solo sobre esas series. Si hay límite, las primeras
+se eligen con un montículo de tamaño desplazamiento + límite en lugar de ordenarlas todas.
+"""
+
+import heapq
+from operator import attrgetter
+from typing import Iterable, List, Optional, Tuple
+from domain.model.serie import Serie
+from data.indice_titulos import normalizar
+
+# Campos por los que se puede ordenar y que se pueden seleccionar
+CAMPOS = Serie.__slots__
+# Tipos que puede tener el valor de cada campo (bool no vale aunque sea un int)
+TIPOS_CAMPOS = {
+    'id': (int,),
+    'titulo': (str,),
+    'genero': (str,),
+    'temporadas': (int,),
+    'año_estreno': (int,),
+    'calificacion': (int, float),
+}
+
+# Accesos posibles, en el orden en que se prefieren si estiman las mismas series
+ACCESOS = ('genero', 'años', 'titulo', 'todas')
+
+
+class Consulta:
+    """
+    Criterios de una consulta. Cada método devuelve la propia consulta, para encadenarlos;
+    un criterio sin indicar no filtra. Sin orden, las series salen por ID.
+    """
+
+    def __init__(self):
+        self.genero: Optional[str] = None            # Género exacto (sin distinguir mayúsculas)
+        self.genero_contiene: Optional[str] = None
+        self.titulo_contiene: Optional[str] = None   # Sin distinguir tildes ni mayúsculas
+        self.año_desde: Optional[int] = None
+        self.año_hasta: Optional[int] = None
+        self.calificacion_minima: Optional[float] = None
+        self.calificacion_maxima: Optional[float] = None
+        self.temporadas_minimas: Optional[int] = None
+        self.temporadas_maximas: Optional[int] = None
+        self.orden: str = 'id'
+        self.descendente: bool = False
+        self.limite: Optional[int] = None
+        self.desplazamiento: int = 0
+        self.campos: Optional[Tuple[str, ...]] = None
+        self.despues: Optional[tuple] = None         # (valor del campo de orden, id)
+
+    def del_genero(self, genero: str) -> 'Consulta':
+        self.genero = genero
+        return self
+
+    def con_genero_que_contiene(self, texto: str) -> 'Consulta':
+        self.genero_contiene = texto
+        return self
+
+    def con_titulo_que_contiene(self, texto: str) -> 'Consulta':
+        self.titulo_contiene = texto
+        return self
+
+    def estrenadas_entre(self, desde: Optional[int] = None, hasta: Optional[int] = None) -> 'Consulta':
+        """Años de estreno entre 'desde' y 'hasta', ambos incluidos"""
+        self.año_desde, self.año_hasta = desde, hasta
+        return self
+
+    def con_calificacion_entre(self, minima: Optional[float] = None, maxima: Optional[float] = None) -> 'Consulta':
+        self.calificacion_minima, self.calificacion_maxima = minima, maxima
+        return self
+
+    def con_temporadas_entre(self, minimas: Optional[int] = None, maximas: Optional[int] = None) -> 'Consulta':
+        self.temporadas_minimas, self.temporadas_maximas = minimas, maximas
+        return self
+
+    def ordenar_por(self, campo: str, descendente: bool = False) -> 'Consulta':
+        """Orden del resultado; a igual valor, por ID"""
+        if campo not in CAMPOS:
+            raise ValueError(f"No se puede ordenar por '{campo}'")
+        self.orden, self.descendente = campo, descendente
+        return self
+
+    def paginar(self, limite: Optional[int], desplazamiento: int = 0) -> 'Consulta':
+        """Como máximo 'limite' series, saltándose las 'desplazamiento' primeras"""
+        if (limite is not None and limite < 0) or desplazamiento < 0:
+            raise ValueError("El límite y el desplazamiento no pueden ser negativos")
+        self.limite, self.desplazamiento = limite, desplazamiento
+        return self
+
+    def despues_de(self, valor, id: int) -> 'Consulta':
+        """
+        Solo las series que van detrás de (valor, id) en el orden de la consulta: paginación
+        por cursor, que sigue donde acabó la página anterior aunque entre medias se añadan
+        o borren series. 'valor' es el del campo de orden en la última serie de esa página
+        (se comprueba con el orden ya elegido: ValueError si no es de su tipo).
+        """
+        if (isinstance(valor, bool) or not isinstance(valor, TIPOS_CAMPOS[self.orden])
+                or isinstance(id, bool) or not isinstance(id, int)):
+            raise ValueError(f"Valor no válido para seguir un listado ordenado por '{self.orden}'")
+        self.despues = (valor, id)
+        return self
+
+    def seleccionar(self, *campos: str) -> 'Consulta':
+        """Devolver diccionarios solo con estos campos en lugar de objetos Serie"""
+        desconocidos = [campo for campo in campos if campo not in CAMPOS]
+        if desconocidos:
+            raise ValueError(f"Campos desconocidos: {', '.join(desconocidos)}")
+        self.campos = campos or None
+        return self
+
+    def filtro(self):
+        """Función que dice si una serie cumple todos los criterios"""
+        genero = self.genero.lower() if self.genero is not None else None
+        genero_contiene = self.genero_contiene.lower() if self.genero_contiene is not None else None
+        titulo = normalizar(self.titulo_contiene) if self.titulo_contiene else None
+        año_desde, año_hasta = self.año_desde, self.año_hasta
+        calificacion_minima, calificacion_maxima = self.calificacion_minima, self.calificacion_maxima
+        temporadas_minimas, temporadas_maximas = self.temporadas_minimas, self.temporadas_maximas
+        orden, descendente = self.orden, self.descendente
+        ultimo_valor, ultimo_id = self.despues if self.despues is not None else (None, None)
+
+        def cumple(serie: Serie) -> bool:
+            # Primero las comparaciones numéricas, que son las más baratas
+            if año_desde is not None and serie.año_estreno < año_desde:
+                return False
+            if año_hasta is not None and serie.año_estreno > año_hasta:
+                return False
+            if calificacion_minima is not None and serie.calificacion < calificacion_minima:
+                return False
+            if calificacion_maxima is not None and serie.calificacion > calificacion_maxima:
+                return False
+            if temporadas_minimas is not None and serie.temporadas < temporadas_minimas:
+                return False
+            if temporadas_maximas is not None and serie.temporadas > temporadas_maximas:
+                return False
+            if genero is not None and serie.genero.lower() != genero:
+                return False
+            if genero_contiene is not None and genero_contiene not in serie.genero.lower():
+                return False
+            if titulo is not None and titulo not in normalizar(serie.titulo):
+                return False
+            if ultimo_id is not None:
+                # A igual valor de orden, siempre por ID ascendente
+                valor = getattr(serie, orden)
+                if valor == ultimo_valor:
+                    return serie.id > ultimo_id
+                return valor < ultimo_valor if descendente else valor > ultimo_valor
+            return True
+
+        return cumple
+
+    def proyectar(self, series: List[Serie]) -> list:
+        """Las series tal cual o, si se seleccionaron campos, diccionarios con esos campos"""
+        if self.campos is None:
+            return series
+        campos = self.campos
+        if len(campos) == 1:
+            campo = campos[0]
+            return [{campo: getattr(serie, campo)} for serie in series]
+        valores = attrgetter(*campos)
+        return [dict(zip(campos, valores(serie))) for serie in series]
+
+
+def planificar(consulta: Consulta, repositorio) -> Tuple[str, int]:
+    """
+    Elige por dónde empezar: el acceso ('genero', 'años', 'titulo' o 'todas') que el
+    repositorio estima que devuelve menos series, con esa estimación. Un repositorio sin
+    índice para un criterio no da estimación: se cuenta como recorrer el catálogo, pero
+    aun así se prefiere a 'todas' (su búsqueda nunca devuelve más series).
+    """
+    total = repositorio.count()
+    criterios = {
+        'genero': consulta.genero,
+        'años': ((consulta.año_desde, consulta.año_hasta)
+                 if consulta.año_desde is not None or consulta.año_hasta is not None else None),
+        'titulo': consulta.titulo_contiene or None,
+    }
+    opciones = []
+    for acceso in ACCESOS[:-1]:
+        if criterios[acceso] is not None:
+            estimacion = repositorio.estimar_resultados(acceso, criterios[acceso])
+            opciones.append((acceso, total if estimacion is None else estimacion))
+    opciones.append(('todas', total))
+    # min() se queda con el primero de los empatados: los índices van antes que 'todas'
+    return min(opciones, key=lambda opcion: opcion[1])
+
+
+def _candidatas(acceso: str, consulta: Consulta, repositorio) -> Iterable[Serie]:
+    """Series que devuelve el acceso elegido (después hay que filtrarlas con la consulta)"""
+    if acceso == 'genero':
+        return repositorio.find_by_genero(consulta.genero)
+    if acceso == 'años':
+        return repositorio.find_by_año_estreno_entre(consulta.año_desde, consulta.año_hasta)
+    if acceso == 'titulo':
+        return repositorio.find_by_titulo_containing(consulta.titulo_contiene)
+    return repositorio.find_all()
+
+
+def ejecutar_consulta(consulta: Consulta, repositorio) -> List[Serie]:
+    """Ejecuta la consulta sobre un repositorio con los métodos de SerieRepository"""
+    acceso, _ = planificar(consulta, repositorio)
+    encontradas = filter(consulta.filtro(), _candidatas(acceso, consulta, repositorio))
+
+    campo = consulta.orden
+    if consulta.descendente:
+        # Mayor valor primero y, a igual valor, menor ID
+        clave = lambda serie: (getattr(serie, campo), -serie.id)
+    else:
+        clave = attrgetter(campo, 'id') if campo != 'id' else attrgetter('id')
+
+    desde = consulta.desplazamiento
+    if consulta.limite is None:
+        ordenadas = sorted(encontradas, key=clave, reverse=consulta.descendente)
+        return ordenadas[desde:] if desde else ordenadas
+
+    # Top-k: un montículo de k elementos, O(n log k) en lugar de ordenar todo el resultado
+    k = desde + consulta.limite
+    if consulta.descendente:
+        primeras = heapq.nlargest(k, encontradas, key=clave)
+    else:
+        primeras = heapq.nsmallest(k, encontradas, key=clave)
+    return primeras[desde:]
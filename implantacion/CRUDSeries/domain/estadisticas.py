@@ -0,0 +1,174 @@
+import heapq
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from domain.model.serie import Serie
+
+class EstadisticasCatalogo:
+    """
+    Estadísticas del catálogo mantenidas de forma incremental.
+    En cada alta, cambio o baja se actualizan contadores, sumas y un montículo
+    de calificaciones, así que consultarlas es O(1) en vez de recorrer todas las series.
+    """
+
+    def __init__(self, series: Iterable[Serie] = ()):
+        self._total_series = 0
+        self._suma_calificaciones = 0.0
+        self._total_temporadas = 0
+        self._generos: Dict[str, int] = {}
+        # Montículo de máximos (calificación negada) con borrado perezoso
+        self._monticulo: List[Tuple[float, int]] = []
+        self._calificaciones: Dict[int, float] = {}
+        # La limpieza perezosa del montículo lo modifica al consultar: dos lectores a la vez
+        # podrían sacar la misma entrada obsoleta y después una válida
+        self._cerrojo_monticulo = threading.Lock()
+        for serie in series:
+            self.agregar(serie)
+
+    def agregar(self, serie: Serie):
+        """Suma una serie a las estadísticas"""
+        self._total_series += 1
+        self._suma_calificaciones += serie.calificacion
+        self._total_temporadas += serie.temporadas
+        self._generos[serie.genero] = self._generos.get(serie.genero, 0) + 1
+        self._calificaciones[serie.id] = serie.calificacion
+        heapq.heappush(self._monticulo, (-serie.calificacion, serie.id))
+
+    def quitar(self, serie: Serie):
+        """Resta una serie de las estadísticas (con los valores que tenía al agregarla)"""
+        self._total_series -= 1
+        self._suma_calificaciones -= serie.calificacion
+        self._total_temporadas -= serie.temporadas
+        restantes = self._generos[serie.genero] - 1
+        if restantes:
+            self._generos[serie.genero] = restantes
+        else:
+            del self._generos[serie.genero]
+        # La entrada del montículo se descarta cuando llegue a la cima
+        del self._calificaciones[serie.id]
+        if len(self._monticulo) > 2 * len(self._calificaciones) + 64:
+            self._compactar()
+
+    def _compactar(self):
+        """Reconstruye el montículo sin entradas obsoletas"""
+        self._monticulo = [(-calificacion, id) for id, calificacion in self._calificaciones.items()]
+        heapq.heapify(self._monticulo)
+
+    def id_mejor_calificada(self) -> Optional[int]:
+        """ID de la serie con mayor calificación (None si no hay series)"""
+        with self._cerrojo_monticulo:
+            while self._monticulo:
+                calificacion_negada, id = self._monticulo[0]
+                if self._calificaciones.get(id) == -calificacion_negada:
+                    return id
+                heapq.heappop(self._monticulo)
+            return None
+
+    def obtener(self, buscar_por_id) -> dict:
+        """Estadísticas en el mismo formato que SerieManager.obtener_estadisticas"""
+        if not self._total_series:
+            return {
+                'total_series': 0,
+                'promedio_calificacion': 0,
+                'generos': {},
+                'serie_mejor_calificada': None,
+                'total_temporadas': 0
+            }
+
+        return {
+            'total_series': self._total_series,
+            'promedio_calificacion': round(self._suma_calificaciones / self._total_series, 2),
+            'generos': dict(self._generos),
+            'serie_mejor_calificada': buscar_por_id(self.id_mejor_calificada()),
+            'total_temporadas': self._total_temporadas
+        }
+
+
+class AcumuladorEstadisticas:
+    """
+    Estadísticas calculadas en una sola pasada y con memoria constante
+    (para recorrer catálogos que no caben en memoria, p. ej. al exportar)
+    """
+
+    def __init__(self):
+        self.total_series = 0
+        self._suma_calificaciones = 0.0
+        self._total_temporadas = 0
+        self._generos: Dict[str, int] = {}
+        self._mejor: Optional[Serie] = None
+
+    def agregar(self, serie: Serie):
+        """Suma una serie a las estadísticas"""
+        self.total_series += 1
+        self._suma_calificaciones += serie.calificacion
+        self._total_temporadas += serie.temporadas
+        self._generos[serie.genero] = self._generos.get(serie.genero, 0) + 1
+        if self._mejor is None or serie.calificacion > self._mejor.calificacion:
+            self._mejor = serie
+
+    def obtener(self) -> dict:
+        """Estadísticas en el mismo formato que calcular_estadisticas"""
+        if not self.total_series:
+            return calcular_estadisticas([])
+        return {
+            'total_series': self.total_series,
+            'promedio_calificacion': round(self._suma_calificaciones / self.total_series, 2),
+            'generos': dict(self._generos),
+            'serie_mejor_calificada': self._mejor,
+            'total_temporadas': self._total_temporadas
+        }
+
+
+def calcular_estadisticas(series: List[Serie]) -> dict:
+    """Calcula las estadísticas recorriendo todas las series (cálculo completo)"""
+    if not series:
+        return {
+            'total_series': 0,
+            'promedio_calificacion': 0,
+            'generos': {},
+            'serie_mejor_calificada': None,
+            'total_temporadas': 0
+        }
+
+    total_series = len(series)
+    promedio_calificacion = sum(serie.calificacion for serie in series) / total_series
+
+    # Contar géneros
+    generos = {}
+    for serie in series:
+        generos[serie.genero] = generos.get(serie.genero, 0) + 1
+
+    # Serie mejor calificada
+    serie_mejor_calificada = max(series, key=lambda s: s.calificacion)
+
+    # Total de temporadas
+    total_temporadas = sum(serie.temporadas for serie in series)
+
+    return {
+        'total_series': total_series,
+        'promedio_calificacion': round(promedio_calificacion, 2),
+        'generos': generos,
+        'serie_mejor_calificada': serie_mejor_calificada,
+        'total_temporadas': total_temporadas
+    }
+
+
+def comparar_estadisticas(incrementales: dict, completas: dict) -> List[str]:
+    """Diferencias entre las estadísticas incrementales y las calculadas de cero"""
+    diferencias = []
+    for clave in ('total_series', 'total_temporadas', 'generos'):
+        if incrementales[clave] != completas[clave]:
+            diferencias.append(f"{clave}: {incrementales[clave]} != {completas[clave]}")
+
+    if abs(incrementales['promedio_calificacion'] - completas['promedio_calificacion']) > 0.01:
+        diferencias.append(f"promedio_calificacion: {incrementales['promedio_calificacion']} "
+                           f"!= {completas['promedio_calificacion']}")
+
+    # Puede haber empates: basta con que la calificación máxima coincida
+    mejor_incremental = incrementales['serie_mejor_calificada']
+    mejor_completa = completas['serie_mejor_calificada']
+    if (mejor_incremental is None) != (mejor_completa is None) or (
+            mejor_incremental is not None
+            and mejor_incremental.calificacion != mejor_completa.calificacion):
+        diferencias.append(f"serie_mejor_calificada: {mejor_incremental} != {mejor_completa}")
+
+    return diferencias
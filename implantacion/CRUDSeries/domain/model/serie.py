@@ -1,6 +1,9 @@
 class Serie:
     """Clase que representa una serie de TV"""
     
+    # Sin __dict__ por instancia: cada serie ocupa bastante menos memoria
+    __slots__ = ('id', 'titulo', 'genero', 'temporadas', 'año_estreno', 'calificacion')
+    
     def __init__(self, id: int, titulo: str, genero: str, temporadas: int, año_estreno: int, calificacion: float = 0.0):
         self.id = id
         self.titulo = titulo
@@ -1,12 +1,84 @@
-from typing import List, Optional
+import time
+import uuid
+from collections import deque
+from typing import Iterable, List, Optional, Set, Tuple
 from domain.model.serie import Serie
-from data.serie_repository import SerieRepositoryInMemory
+from data.serie_repository_indexado import SerieRepositoryIndexado
+from domain.estadisticas import EstadisticasCatalogo, calcular_estadisticas, comparar_estadisticas
+from domain.analitica import analizar, columnas_desde_series
+from domain.consultas import Consulta, ejecutar_consulta
+from domain.concurrencia import CerrojoLectoresEscritor
+
+# Cambios que recuerda el manager para cambios_desde (los más antiguos se olvidan)
+CAMBIOS_REGISTRADOS = 10000
+
+def ids_de(series: List[Serie]) -> Iterable[int]:
+    """IDs de un lote de series: un range si son consecutivos (lo normal en una importación)"""
+    if series and all(serie.id == series[0].id + i for i, serie in enumerate(series)):
+        return range(series[0].id, series[-1].id + 1)
+    return [serie.id for serie in series]
 
 class SerieManager:
-    """Clase que maneja las operaciones CRUD de las series (Capa de Servicio)"""
+    """
+    Clase que maneja las operaciones CRUD de las series (Capa de Servicio).
+    Se puede usar desde varios hilos (p. ej. la API web): las lecturas van a la vez y
+    cada escritura va sola, junto con sus estadísticas y la versión del catálogo.
+    Los repositorios no se protegen solos: hay que acceder a ellos a través del manager.
+    """
+    
+    def __init__(self, repository=None, verificar_estadisticas: bool = False):
+        # Inyección de dependencias: por defecto, repositorio en memoria indexado
+        self._repository = repository if repository is not None else SerieRepositoryIndexado()
+        # Estadísticas incrementales: se calculan una vez al arrancar y se actualizan en cada cambio.
+        # Si el repositorio las calcula él mismo (SQLite, con sus índices), se le piden una vez por
+        # versión del catálogo: arrancar no recorre un catálogo que puede no caber en memoria
+        if hasattr(self._repository, 'estadisticas'):
+            self._estadisticas = None
+        else:
+            self._estadisticas = EstadisticasCatalogo(self._repository.find_all())
+        self._estadisticas_repositorio = (-1, None)
+        # Modo comprobación: cada consulta de estadísticas se compara con un cálculo completo
+        self._verificar_estadisticas = verificar_estadisticas
+        # Versión del catálogo: sube con cada cambio (para cachés y ETags de la API web)
+        self._version = 0
+        self._modificado = time.time()
+        # IDs tocados en cada versión, para cambios_desde. Las versiones vuelven a empezar en
+        # cada ejecución: el identificador distingue las de este manager de las de otro
+        self._instancia = uuid.uuid4().hex
+        self._registro = deque(maxlen=CAMBIOS_REGISTRADOS)
+        self._cerrojo = CerrojoLectoresEscritor()
+    
+    def _cambio(self, ids: Iterable[int]):
+        """Anota que el catálogo ha cambiado (en las series con esos IDs)"""
+        self._version += 1
+        self._modificado = time.time()
+        self._registro.append((self._version, ids))
+    
+    def version_catalogo(self) -> Tuple[int, float]:
+        """Versión actual del catálogo y momento (epoch) del último cambio"""
+        with self._cerrojo.lectura():
+            return self._version, self._modificado
     
-    def __init__(self):
-        self._repository = SerieRepositoryInMemory()
+    def cambios_desde(self, referencia: Optional[list]) -> Tuple[list, Optional[Set[int]]]:
+        """
+        Referencia de la versión actual (para pasarla en la próxima llamada; se puede guardar
+        en JSON) e IDs de las series creadas, cambiadas o eliminadas desde 'referencia'.
+        Los IDs son None si no se saben: referencia de otro manager (u otra ejecución) o
+        cambios que ya no están en el registro.
+        """
+        with self._cerrojo.lectura():
+            actual = [self._instancia, self._version]
+            if not referencia or referencia[0] != self._instancia or referencia[1] > self._version:
+                return actual, None
+            version = referencia[1]
+            if version < self._version and (not self._registro or self._registro[0][0] > version + 1):
+                return actual, None
+            ids: Set[int] = set()
+            for version_cambio, ids_cambio in reversed(self._registro):
+                if version_cambio <= version:
+                    break
+                ids.update(ids_cambio)
+            return actual, ids
     
     # Los datos se manejan a través del repositorio, no hay necesidad de cargar/guardar archivos
     
@@ -14,79 +86,151 @@ class SerieManager:
         """Crea una nueva serie"""
         # El repositorio manejará la asignación del ID
         nueva_serie = Serie(0, titulo, genero, temporadas, año_estreno, calificacion)  # ID temporal
-        return self._repository.save(nueva_serie)
+        with self._cerrojo.escritura():
+            # Con el cerrojo de escritura, dos hilos nunca reciben el mismo ID
+            serie = self._repository.save(nueva_serie)
+            if self._estadisticas is not None:
+                self._estadisticas.agregar(serie)
+            self._cambio((serie.id,))
+        return serie
+    
+    def crear_varias_series(self, series: List[Serie]) -> List[Serie]:
+        """Crea de una vez varias series ya validadas (con ID 0), p. ej. en una importación masiva"""
+        # El repositorio puede guardarlas en bloque (una escritura del log, índices juntos...)
+        with self._cerrojo.escritura():
+            self._repository.save_all(series)
+            if self._estadisticas is not None:
+                for serie in series:
+                    self._estadisticas.agregar(serie)
+            self._cambio(ids_de(series))
+        return series
     
     def listar_series(self) -> List[Serie]:
         """Retorna todas las series"""
-        return self._repository.find_all()
+        with self._cerrojo.lectura():
+            return self._repository.find_all()
     
     def buscar_serie_por_id(self, id: int) -> Optional[Serie]:
         """Busca una serie por su ID"""
-        return self._repository.find_by_id(id)
+        with self._cerrojo.lectura():
+            return self._repository.find_by_id(id)
+    
+    def buscar_series_por_ids(self, ids: Iterable[int]) -> List[Serie]:
+        """Series que existen de entre esos IDs (con una sola espera del cerrojo para todas)"""
+        with self._cerrojo.lectura():
+            return [serie for serie in map(self._repository.find_by_id, ids) if serie is not None]
     
     def buscar_series_por_titulo(self, titulo: str) -> List[Serie]:
         """Busca series que contengan el título especificado"""
-        return self._repository.find_by_titulo_containing(titulo)
+        with self._cerrojo.lectura():
+            return self._repository.find_by_titulo_containing(titulo)
+    
+    def autocompletar_titulo(self, prefijo: str, limite: int = 10) -> List[Serie]:
+        """Busca series cuyo título empieza por el prefijo (para autocompletar)"""
+        with self._cerrojo.lectura():
+            return self._repository.find_by_titulo_starting(prefijo, limite)
     
     def buscar_series_por_genero(self, genero: str) -> List[Serie]:
         """Busca series por género"""
-        return self._repository.find_by_genero_containing(genero)
+        with self._cerrojo.lectura():
+            return self._repository.find_by_genero_containing(genero)
+    
+    def consultar(self, consulta: Consulta) -> list:
+        """Series que cumplen todos los criterios de la consulta, ordenadas y paginadas (ver domain/consultas.py)"""
+        with self._cerrojo.lectura():
+            if hasattr(self._repository, 'consultar'):
+                # El repositorio resuelve la consulta entera (SQLite la traduce a SQL)
+                series = self._repository.consultar(consulta)
+            else:
+                series = ejecutar_consulta(consulta, self._repository)
+        return consulta.proyectar(series)
     
     def actualizar_serie(self, id: int, titulo: Optional[str] = None, genero: Optional[str] = None, 
                         temporadas: Optional[int] = None, año_estreno: Optional[int] = None, 
                         calificacion: Optional[float] = None) -> bool:
         """Actualiza una serie existente"""
-        serie = self._repository.find_by_id(id)
-        if serie:
-            if titulo is not None:
-                serie.titulo = titulo
-            if genero is not None:
-                serie.genero = genero
-            if temporadas is not None:
-                serie.temporadas = temporadas
-            if año_estreno is not None:
-                serie.año_estreno = año_estreno
-            if calificacion is not None:
-                serie.calificacion = calificacion
+        with self._cerrojo.escritura():
+            anterior = self._repository.find_by_id(id)
+            if not anterior:
+                return False
+            # Se guarda un objeto nuevo en lugar de modificar el que tiene el repositorio:
+            # un hilo que ya lo haya leído sigue viendo la serie entera, antes del cambio
+            serie = Serie(id,
+                          titulo if titulo is not None else anterior.titulo,
+                          genero if genero is not None else anterior.genero,
+                          temporadas if temporadas is not None else anterior.temporadas,
+                          año_estreno if año_estreno is not None else anterior.año_estreno,
+                          calificacion if calificacion is not None else anterior.calificacion)
             self._repository.save(serie)
+            # Se quita con los valores antiguos y se vuelve a sumar con los nuevos
+            if self._estadisticas is not None:
+                self._estadisticas.quitar(anterior)
+                self._estadisticas.agregar(serie)
+            self._cambio((id,))
             return True
-        return False
     
     def eliminar_serie(self, id: int) -> bool:
         """Elimina una serie por su ID"""
-        return self._repository.delete_by_id(id)
+        with self._cerrojo.escritura():
+            serie = self._repository.find_by_id(id)
+            if serie and self._repository.delete_by_id(id):
+                if self._estadisticas is not None:
+                    self._estadisticas.quitar(serie)
+                self._cambio((id,))
+                return True
+            return False
     
     def obtener_estadisticas(self) -> dict:
-        """Obtiene estadísticas de las series"""
-        series = self._repository.find_all()
+        """
+        Obtiene estadísticas de las series (O(1): se mantienen al crear, actualizar y eliminar,
+        o el repositorio las calcula una vez por versión del catálogo)
+        """
+        with self._cerrojo.lectura():
+            estadisticas = self._estadisticas_actuales()
+            diferencias = self._comprobar_estadisticas() if self._verificar_estadisticas else None
         
-        if not series:
-            return {
-                'total_series': 0,
-                'promedio_calificacion': 0,
-                'generos': {},
-                'serie_mejor_calificada': None,
-                'total_temporadas': 0
-            }
+        if diferencias:
+            raise RuntimeError(f"Estadísticas incoherentes: {'; '.join(diferencias)}")
         
-        total_series = len(series)
-        promedio_calificacion = sum(serie.calificacion for serie in series) / total_series
-        
-        # Contar géneros
-        generos = {}
-        for serie in series:
-            generos[serie.genero] = generos.get(serie.genero, 0) + 1
-        
-        # Serie mejor calificada
-        serie_mejor_calificada = max(series, key=lambda s: s.calificacion)
-        
-        # Total de temporadas
-        total_temporadas = sum(serie.temporadas for serie in series)
-        
-        return {
-            'total_series': total_series,
-            'promedio_calificacion': round(promedio_calificacion, 2),
-            'generos': generos,
-            'serie_mejor_calificada': serie_mejor_calificada,
-            'total_temporadas': total_temporadas
-        }
\ No newline at end of file
+        return estadisticas
+    
+    def obtener_analitica(self, top_k: int = 3) -> dict:
+        """
+        Análisis detallado: histograma de calificaciones, media/mediana/percentiles por género,
+        calificación por década y las 'top_k' mejores series de cada género
+        """
+        with self._cerrojo.lectura():
+            if hasattr(self._repository, 'columnas'):
+                # El repositorio columnar ya tiene los datos en arrays
+                columnas = self._repository.columnas()
+            else:
+                columnas = columnas_desde_series(self._repository.find_all())
+            
+            analitica = analizar(columnas, top_k)
+            analitica['mejores_por_genero'] = {
+                genero: [self._repository.find_by_id(id) for id in ids]
+                for genero, ids in analitica['mejores_por_genero'].items()
+            }
+        return analitica
+    
+    def _estadisticas_actuales(self) -> dict:
+        # Sin cerrojo, como _comprobar_estadisticas. Con el de lectura la versión no cambia;
+        # la caché se guarda en una sola asignación por si dos lectores la rellenan a la vez
+        if self._estadisticas is not None:
+            return self._estadisticas.obtener(self._repository.find_by_id)
+        version, estadisticas = self._estadisticas_repositorio
+        if version != self._version:
+            estadisticas = self._repository.estadisticas()
+            self._estadisticas_repositorio = (self._version, estadisticas)
+        return dict(estadisticas, generos=dict(estadisticas['generos']))
+
+    def comprobar_estadisticas(self) -> List[str]:
+        """Compara las estadísticas incrementales con un cálculo completo y devuelve las diferencias"""
+        with self._cerrojo.lectura():
+            return self._comprobar_estadisticas()
+    
+    def _comprobar_estadisticas(self) -> List[str]:
+        # Sin cerrojo: la llaman métodos que ya lo tienen (no es reentrante)
+        incrementales = self._estadisticas_actuales()
+        completas = calcular_estadisticas(self._repository.find_all())
+        return comparar_estadisticas(incrementales, completas)
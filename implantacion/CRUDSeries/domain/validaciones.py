@@ -0,0 +1,105 @@
+"""
+Reglas que debe cumplir una serie. Las usan tanto el menú (campo a campo, según se
+escriben) como la importación masiva (fila a fila), así que las dos aceptan lo mismo.
+"""
+
+from typing import Tuple
+
+AÑO_MINIMO = 1900
+AÑO_MAXIMO = 2030
+TEMPORADAS_MINIMAS = 1
+# Cabe en las columnas de 16 bits del repositorio columnar (data/almacen_columnar.py)
+TEMPORADAS_MAXIMAS = 1000
+CALIFICACION_MINIMA = 0.0
+CALIFICACION_MAXIMA = 10.0
+
+
+class ErrorValidacion(ValueError):
+    """Un dato de la serie no es válido (el mensaje se puede mostrar tal cual al usuario)"""
+
+
+def validar_titulo(titulo: str) -> str:
+    titulo = titulo.strip()
+    if not titulo:
+        raise ErrorValidacion("El título no puede estar vacío.")
+    return titulo
+
+
+def validar_genero(genero: str) -> str:
+    genero = genero.strip()
+    if not genero:
+        raise ErrorValidacion("El género no puede estar vacío.")
+    return genero
+
+
+def validar_temporadas(temporadas: int) -> int:
+    if not TEMPORADAS_MINIMAS <= temporadas <= TEMPORADAS_MAXIMAS:
+        raise ErrorValidacion(f"El número de temporadas debe estar entre {TEMPORADAS_MINIMAS} y {TEMPORADAS_MAXIMAS}.")
+    return temporadas
+
+
+def validar_año_estreno(año_estreno: int) -> int:
+    if not AÑO_MINIMO <= año_estreno <= AÑO_MAXIMO:
+        raise ErrorValidacion(f"Año de estreno inválido (debe estar entre {AÑO_MINIMO} y {AÑO_MAXIMO}).")
+    return año_estreno
+
+
+def validar_calificacion(calificacion: float) -> float:
+    # Escrito así también rechaza NaN (cualquier comparación con NaN es falsa)
+    if not CALIFICACION_MINIMA <= calificacion <= CALIFICACION_MAXIMA:
+        raise ErrorValidacion("La calificación debe estar entre 0 y 10.")
+    return calificacion
+
+
+def _entero(valor, campo: str) -> int:
+    """Convierte texto o número a entero sin redondear en silencio (7.5 temporadas es un error)"""
+    tipo = type(valor)
+    if tipo is int:
+        return valor
+    if tipo is str:
+        try:
+            return int(valor)
+        except ValueError:
+            raise ErrorValidacion(f"{campo}: {valor!r} no es un número entero.") from None
+    if tipo is float and valor.is_integer():
+        return int(valor)
+    raise ErrorValidacion(f"{campo}: se esperaba un número entero.")
+
+
+def _decimal(valor, campo: str) -> float:
+    tipo = type(valor)
+    if tipo is float or tipo is int:
+        return float(valor)
+    if tipo is str:
+        try:
+            return float(valor)
+        except ValueError:
+            raise ErrorValidacion(f"{campo}: {valor!r} no es un número.") from None
+    raise ErrorValidacion(f"{campo}: se esperaba un número.")
+
+
+def validar_serie(titulo, genero, temporadas, año_estreno, calificacion=None) -> Tuple[str, str, int, int, float]:
+    """
+    Convierte y valida los datos de una serie tal como llegan de un archivo (texto o números).
+    La calificación es opcional (vacía o None = 0.0), igual que en el menú.
+    Devuelve los valores ya convertidos o lanza ErrorValidacion.
+    """
+    if type(titulo) is not str or type(genero) is not str:
+        raise ErrorValidacion("El título y el género deben ser texto.")
+    titulo = titulo.strip()
+    genero = genero.strip()
+    temporadas = _entero(temporadas, "temporadas")
+    año_estreno = _entero(año_estreno, "año_estreno")
+    calificacion = 0.0 if calificacion is None or calificacion == "" else _decimal(calificacion, "calificacion")
+
+    # Se comprueba todo de una vez (una importación valida millones de filas); si algo
+    # falla, las reglas se repasan una a una para dar el mensaje de la primera que no se cumple
+    if not (titulo and genero and TEMPORADAS_MINIMAS <= temporadas <= TEMPORADAS_MAXIMAS
+            and AÑO_MINIMO <= año_estreno <= AÑO_MAXIMO
+            and CALIFICACION_MINIMA <= calificacion <= CALIFICACION_MAXIMA):
+        validar_titulo(titulo)
+        validar_genero(genero)
+        validar_temporadas(temporadas)
+        validar_año_estreno(año_estreno)
+        validar_calificacion(calificacion)
+    return titulo, genero, temporadas, año_estreno, calificacion
@@ -0,0 +1 @@
+# Exportadores del catálogo (CSV, JSON Lines, columnar y HTML)
\ No newline at end of file
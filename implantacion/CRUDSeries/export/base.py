@@ -0,0 +1,50 @@
+import gzip
+from abc import ABC, abstractmethod
+from typing import List
+from domain.model.serie import Serie
+
+# Columnas que exportan todos los formatos, en este orden
+COLUMNAS = ('id', 'titulo', 'genero', 'temporadas', 'año_estreno', 'calificacion')
+
+
+class Exportador(ABC):
+    """
+    Formato de exportación. El pipeline llama a empezar(), después a escribir_bloque()
+    con cada bloque de series y al final a terminar(); el exportador solo escribe
+    en 'destino', no abre ni cierra archivos.
+    """
+
+    formato = ""
+    extension = ""
+    binario = False  # True si 'destino' debe abrirse en modo binario
+
+    def __init__(self, destino):
+        self.destino = destino
+        self.filas = 0
+
+    def empezar(self):
+        """Escribe lo que va antes de las filas (cabecera)"""
+
+    @abstractmethod
+    def escribir_bloque(self, series: List[Serie]):
+        """Escribe un bloque de series"""
+
+    def terminar(self):
+        """Escribe lo que va después de las filas (pie, índices...)"""
+
+    def resultado(self) -> dict:
+        """Datos del exportador que se añaden al resultado de la exportación"""
+        return {'filas': self.filas}
+
+
+# Nivel de gzip: el 9 (por defecto en gzip.open) es varias veces más lento y apenas comprime más
+NIVEL_GZIP = 6
+
+
+def abrir_destino(ruta: str, binario: bool, comprimir: bool = False):
+    """Abre el archivo de salida (comprimido con gzip si se pide)"""
+    if comprimir:
+        if binario:
+            return gzip.open(ruta, 'wb', compresslevel=NIVEL_GZIP)
+        return gzip.open(ruta, 'wt', compresslevel=NIVEL_GZIP, encoding='utf-8', newline='')
+    return open(ruta, 'wb') if binario else open(ruta, 'w', encoding='utf-8', newline='')
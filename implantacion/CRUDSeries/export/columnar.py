@@ -0,0 +1,165 @@
+"""
+Formato binario por columnas (parecido a Parquet, pero sin dependencias).
+
+    SERC | grupo 1 | grupo 2 | ... | pie (JSON) | largo del pie (uint32) | SERC
+
+Cada grupo guarda 'filas_por_grupo' series columna a columna (todos los IDs seguidos,
+después todas las temporadas, etc.), en little-endian. Los géneros se guardan como
+códigos de un diccionario y los títulos como desplazamientos + texto UTF-8 seguido.
+El pie dice dónde empieza cada columna de cada grupo, así que se puede leer una sola
+columna sin leer el resto del archivo.
+"""
+
+import gzip
+import json
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List
+from domain.model.serie import Serie
+from export.base import Exportador
+
+MAGIA = b"SERC"
+# Versión 2: temporadas y años en 64 bits y géneros en 32 (la 1 usaba 16 bits y no cabía
+# cualquier serie). El lector usa los tipos del pie, así que lee las dos
+VERSION = 2
+FILAS_POR_GRUPO = 65536
+
+# Columna -> código de tipo de array
+TIPOS = {
+    'id': 'q',
+    'temporadas': 'q',
+    'año_estreno': 'q',
+    'calificacion': 'd',
+    'genero': 'I',
+    'titulo_fin': 'I',  # fin de cada título dentro del bloque de texto del grupo
+}
+
+
+def _bytes_little_endian(datos: array) -> bytes:
+    if sys.byteorder == 'big':
+        datos = array(datos.typecode, datos)
+        datos.byteswap()
+    return datos.tobytes()
+
+
+class ExportadorColumnar(Exportador):
+    """Escribe las series agrupadas por columnas (ver la descripción del módulo)"""
+
+    formato = "columnar"
+    extension = ".serc"
+    binario = True
+
+    def __init__(self, destino, filas_por_grupo: int = FILAS_POR_GRUPO):
+        super().__init__(destino)
+        self._filas_por_grupo = filas_por_grupo
+        self._generos: Dict[str, int] = {}
+        self._grupos: List[dict] = []
+        self._posicion = 0
+        self._nuevo_grupo()
+
+    def _nuevo_grupo(self):
+        self._columnas = {nombre: array(tipo) for nombre, tipo in TIPOS.items()}
+        self._titulos = bytearray()
+
+    def _escribir(self, datos: bytes) -> list:
+        """Escribe y devuelve [inicio, largo] para el pie"""
+        self.destino.write(datos)
+        inicio = self._posicion
+        self._posicion += len(datos)
+        return [inicio, len(datos)]
+
+    def empezar(self):
+        self._escribir(MAGIA)
+
+    def escribir_bloque(self, series: List[Serie]):
+        columnas = self._columnas
+        for serie in series:
+            codigo = self._generos.get(serie.genero)
+            if codigo is None:
+                codigo = self._generos[serie.genero] = len(self._generos)
+            self._titulos += serie.titulo.encode('utf-8')
+            columnas['id'].append(serie.id)
+            columnas['temporadas'].append(serie.temporadas)
+            columnas['año_estreno'].append(serie.año_estreno)
+            columnas['calificacion'].append(serie.calificacion)
+            columnas['genero'].append(codigo)
+            columnas['titulo_fin'].append(len(self._titulos))
+            if len(columnas['id']) >= self._filas_por_grupo:
+                self._cerrar_grupo()
+                columnas = self._columnas
+        self.filas += len(series)
+
+    def _cerrar_grupo(self):
+        filas = len(self._columnas['id'])
+        if not filas:
+            return
+        grupo = {'filas': filas, 'columnas': {}}
+        for nombre, datos in self._columnas.items():
+            grupo['columnas'][nombre] = self._escribir(_bytes_little_endian(datos))
+        grupo['columnas']['titulo'] = self._escribir(bytes(self._titulos))
+        self._grupos.append(grupo)
+        self._nuevo_grupo()
+
+    def terminar(self):
+        self._cerrar_grupo()
+        pie = json.dumps({
+            'version': VERSION,
+            'filas': self.filas,
+            'tipos': TIPOS,
+            'generos': list(self._generos),
+            'grupos': self._grupos,
+        }, ensure_ascii=False).encode('utf-8')
+        self._escribir(pie)
+        self._escribir(struct.pack('<I', len(pie)) + MAGIA)
+
+
+def _tamaño(archivo) -> int:
+    """Tamaño (sin comprimir) del archivo; gzip no permite hacer seek desde el final"""
+    if isinstance(archivo, gzip.GzipFile):
+        while archivo.read(1 << 20):
+            pass
+        return archivo.tell()
+    return archivo.seek(0, 2)
+
+
+def leer_pie(archivo) -> dict:
+    """Lee los metadatos del final del archivo"""
+    tamaño = _tamaño(archivo)
+    archivo.seek(tamaño - 8)
+    largo, magia = struct.unpack('<I4s', archivo.read(8))
+    if magia != MAGIA:
+        raise ValueError("No es un archivo columnar de series")
+    archivo.seek(tamaño - 8 - largo)
+    return json.loads(archivo.read(largo))
+
+
+def _leer_columna(archivo, grupo: dict, nombre: str, tipo: str) -> array:
+    inicio, largo = grupo['columnas'][nombre]
+    archivo.seek(inicio)
+    datos = array(tipo)
+    datos.frombytes(archivo.read(largo))
+    if sys.byteorder == 'big':
+        datos.byteswap()
+    return datos
+
+
+def leer_columnar(ruta: str) -> Iterator[Serie]:
+    """Lee las series de un archivo columnar (grupo a grupo, sin cargarlo entero)"""
+    abrir = gzip.open if ruta.endswith('.gz') else open
+    with abrir(ruta, 'rb') as archivo:
+        pie = leer_pie(archivo)
+        generos = pie['generos']
+        for grupo in pie['grupos']:
+            columnas = {nombre: _leer_columna(archivo, grupo, nombre, tipo)
+                        for nombre, tipo in pie['tipos'].items()}
+            inicio, largo = grupo['columnas']['titulo']
+            archivo.seek(inicio)
+            titulos = archivo.read(largo)
+            inicio_titulo = 0
+            for i in range(grupo['filas']):
+                fin_titulo = columnas['titulo_fin'][i]
+                yield Serie(columnas['id'][i], titulos[inicio_titulo:fin_titulo].decode('utf-8'),
+                            generos[columnas['genero'][i]], columnas['temporadas'][i],
+                            columnas['año_estreno'][i], columnas['calificacion'][i])
+                inicio_titulo = fin_titulo
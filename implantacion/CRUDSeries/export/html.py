@@ -0,0 +1,261 @@
+import html
+from datetime import datetime
+from typing import List
+from domain.model.serie import Serie
+from domain.estadisticas import AcumuladorEstadisticas
+from export.base import Exportador
+
+# Plantilla HTML con estilos CSS, partida en trozos para escribir las filas entre medias
+INICIO_HTML = """
+<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Catálogo de Series de TV</title>
+    <style>
+        body {{
+            font-family: Arial, sans-serif;
+            margin: 40px;
+            background-color: #f5f5f5;
+        }}
+        
+        .container {{
+            max-width: 1200px;
+            margin: 0 auto;
+            background-color: white;
+            padding: 30px;
+            border-radius: 10px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        }}
+        
+        h1 {{
+            color: #2c3e50;
+            text-align: center;
+            margin-bottom: 10px;
+            font-size: 2.5em;
+        }}
+        
+        .subtitle {{
+            text-align: center;
+            color: #7f8c8d;
+            margin-bottom: 30px;
+            font-style: italic;
+        }}
+        
+        table {{
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 20px;
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+        }}
+        
+        th {{
+            background-color: #3498db;
+            color: white;
+            padding: 15px 10px;
+            text-align: left;
+            font-weight: bold;
+            border-bottom: 2px solid #2980b9;
+        }}
+        
+        td {{
+            padding: 12px 10px;
+            border-bottom: 1px solid #ecf0f1;
+        }}
+        
+        tr:nth-child(even) {{
+            background-color: #f8f9fa;
+        }}
+        
+        tr:hover {{
+            background-color: #e8f4fd;
+            transition: background-color 0.3s ease;
+        }}
+        
+        .calificacion {{
+            font-weight: bold;
+            padding: 5px 10px;
+            border-radius: 15px;
+            color: white;
+        }}
+        
+        .calificacion.excelente {{
+            background-color: #27ae60;
+        }}
+        
+        .calificacion.muy-buena {{
+            background-color: #2ecc71;
+        }}
+        
+        .calificacion.buena {{
+            background-color: #f39c12;
+        }}
+        
+        .calificacion.regular {{
+            background-color: #e67e22;
+        }}
+        
+        .calificacion.mala {{
+            background-color: #e74c3c;
+        }}
+        
+        .genero {{
+            background-color: #ecf0f1;
+            padding: 5px 10px;
+            border-radius: 12px;
+            font-size: 0.9em;
+            color: #2c3e50;
+        }}
+        
+        .stats {{
+            margin-top: 30px;
+            padding: 20px;
+            background-color: #f8f9fa;
+            border-radius: 8px;
+            border-left: 4px solid #3498db;
+        }}
+        
+        .stats h3 {{
+            color: #2c3e50;
+            margin-top: 0;
+        }}
+        
+        .footer {{
+            text-align: center;
+            margin-top: 30px;
+            color: #95a5a6;
+            font-size: 0.9em;
+        }}
+        
+        .navegacion {{
+            display: flex;
+            justify-content: space-between;
+            margin: 15px 0;
+        }}
+        
+        .navegacion a {{
+            color: #3498db;
+            text-decoration: none;
+            font-weight: bold;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>{titulo_pagina}</h1>
+        <p class="subtitle">Generado el {fecha_generacion}</p>
+        
+"""
+
+INICIO_TABLA_HTML = """        <table>
+            <thead>
+                <tr>
+                    <th>ID</th>
+                    <th>Título</th>
+                    <th>Género</th>
+                    <th>Temporadas</th>
+                    <th>Año de Estreno</th>
+                    <th>Calificación</th>
+                </tr>
+            </thead>
+            <tbody>
+"""
+
+FIN_TABLA_HTML = """
+            </tbody>
+        </table>
+"""
+
+FIN_HTML = """    </div>
+</body>
+</html>
+"""
+
+CABECERA_HTML = INICIO_HTML + INICIO_TABLA_HTML
+
+PIE_HTML = FIN_TABLA_HTML + """        
+        <div class="stats">
+            <h3>📊 Estadísticas del Catálogo</h3>
+            {estadisticas}
+        </div>
+        
+        <div class="footer">
+            <p>Exportado desde CRUD Series TV - Total de series: {total_series}</p>
+        </div>
+""" + FIN_HTML
+
+TITULO_CATALOGO = "🎬 Catálogo de Series de TV"
+
+def clase_calificacion(calificacion: float) -> str:
+    """Clase CSS según la calificación"""
+    if calificacion >= 9.0:
+        return "excelente"
+    elif calificacion >= 8.0:
+        return "muy-buena"
+    elif calificacion >= 7.0:
+        return "buena"
+    elif calificacion >= 5.0:
+        return "regular"
+    return "mala"
+
+def fila_html(serie) -> str:
+    """Fila <tr> de la tabla para una serie"""
+    return f"""
+                <tr id="serie-{serie.id}">
+                    <td>{serie.id}</td>
+                    <td><strong>{html.escape(serie.titulo)}</strong></td>
+                    <td><span class="genero">{html.escape(serie.genero)}</span></td>
+                    <td>{serie.temporadas}</td>
+                    <td>{serie.año_estreno}</td>
+                    <td><span class="calificacion {clase_calificacion(serie.calificacion)}">{serie.calificacion}/10</span></td>
+                </tr>"""
+
+def estadisticas_html(estadisticas: dict) -> str:
+    """Bloque HTML con las estadísticas del catálogo"""
+    if not estadisticas['total_series']:
+        return "<p>No hay series en el catálogo.</p>"
+    
+    generos_str = ", ".join([f"{html.escape(genero)}: {cantidad}" for genero, cantidad in estadisticas['generos'].items()])
+    mejor_serie = estadisticas['serie_mejor_calificada']
+    
+    return f"""
+            <p><strong>Total de series:</strong> {estadisticas['total_series']}</p>
+            <p><strong>Calificación promedio:</strong> {estadisticas['promedio_calificacion']:.2f}/10</p>
+            <p><strong>Total de temporadas:</strong> {estadisticas['total_temporadas']}</p>
+            <p><strong>Serie mejor calificada:</strong> {html.escape(mejor_serie.titulo)} ({mejor_serie.calificacion}/10)</p>
+            <p><strong>Géneros:</strong> {generos_str}</p>
+        """
+
+class ExportadorHTML(Exportador):
+    """Tabla HTML con estilos; las estadísticas del pie se calculan en la misma pasada"""
+
+    formato = "html"
+    extension = ".html"
+
+    def __init__(self, destino, estadisticas: dict = None):
+        super().__init__(destino)
+        # Si ya vienen calculadas (SerieManager.obtener_estadisticas) no se recalculan
+        self.estadisticas = estadisticas
+        self._acumulador = AcumuladorEstadisticas() if estadisticas is None else None
+
+    def empezar(self):
+        self.destino.write(CABECERA_HTML.format(
+            titulo_pagina=TITULO_CATALOGO,
+            fecha_generacion=datetime.now().strftime("%d de %B de %Y a las %H:%M")))
+
+    def escribir_bloque(self, series: List[Serie]):
+        self.destino.write("".join(fila_html(serie) for serie in series))
+        if self._acumulador is not None:
+            for serie in series:
+                self._acumulador.agregar(serie)
+        self.filas += len(series)
+
+    def terminar(self):
+        if self._acumulador is not None:
+            self.estadisticas = self._acumulador.obtener()
+        self.destino.write(PIE_HTML.format(estadisticas=estadisticas_html(self.estadisticas),
+                                           total_series=self.filas))
+
+    def resultado(self) -> dict:
+        return {'filas': self.filas, 'estadisticas': self.estadisticas}
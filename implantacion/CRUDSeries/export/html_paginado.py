@@ -0,0 +1,588 @@
+"""
+Exportación HTML en páginas estáticas para catálogos grandes.
+
+    directorio/
+    ├── index.html                  # Estadísticas, buscador y enlaces a páginas y géneros
+    ├── pagina-00001.html ...       # Todo el catálogo por tramos de N IDs
+    ├── generos/<genero>/pagina-00001.html ...   # Las mismas páginas por género (opcional)
+    ├── busqueda/<letra>-00000.json # Índice de búsqueda: [título, página, id] por inicial y tramo
+    └── .manifiesto.json            # Huellas de los archivos y páginas de cada sección
+
+El navegador solo descarga la página que se abre y, al buscar, el trozo del índice
+de la inicial escrita. Cada página se escribe en cuanto se completa, así que en
+memoria solo está la página en curso (una por género).
+
+La página k tiene las series con ID entre (k-1)·N+1 y k·N: una alta o una baja solo
+cambia su página (y los enlaces de sus vecinas si la deja vacía o deja de estarlo).
+Al volver a exportar al mismo directorio solo se reescriben las páginas cuyas series
+han cambiado: la huella de cada página se calcula a partir de sus filas (sin generar
+el HTML) y se compara con la guardada en el manifiesto. Si además se sabe qué series
+han cambiado desde la exportación anterior (ExportadorHTMLPaginado.actualizar con
+SerieManager.cambios_desde), ni siquiera se recorre el catálogo: solo se leen esas páginas.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+from datetime import datetime
+from operator import attrgetter, itemgetter
+from typing import Callable, Dict, Iterable, List, Optional
+from domain.model.serie import Serie
+from domain.estadisticas import AcumuladorEstadisticas
+from data.indice_titulos import normalizar
+from export.base import Exportador
+from export.html import (INICIO_HTML, INICIO_TABLA_HTML, FIN_TABLA_HTML, FIN_HTML, TITULO_CATALOGO,
+                         fila_html, estadisticas_html)
+
+FILAS_POR_PAGINA = 1000
+# Páginas de cada tramo del índice de búsqueda: al actualizar una página solo se rehacen
+# los trozos de su tramo, no todo lo de una inicial
+PAGINAS_POR_TRAMO = 10
+MANIFIESTO = ".manifiesto.json"
+TROZOS = "trozos.json"
+
+BUSCADOR_JS = """
+        <script>
+            const fragmentos = {};
+            let trozos = null;
+            const entrada = document.getElementById('buscar');
+            const resultados = document.getElementById('resultados');
+            const normalizar = texto => texto.normalize('NFKD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase();
+            const escapar = texto => texto.replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})[c]);
+            const clave = texto => /[a-z0-9]/.test(texto[0]) ? texto[0] : '_';
+
+            entrada.addEventListener('input', async () => {
+                const buscado = normalizar(entrada.value.trim());
+                if (!buscado) {
+                    resultados.innerHTML = '';
+                    return;
+                }
+                const letra = clave(buscado);
+                if (!(letra in fragmentos)) {
+                    // Solo se descargan los trozos del índice de esa inicial (y una sola vez)
+                    trozos = trozos || fetch('busqueda/trozos.json').then(respuesta => respuesta.ok ? respuesta.json() : {});
+                    fragmentos[letra] = trozos
+                        .then(tramos => Promise.all((tramos[letra] || []).map(tramo =>
+                            fetch(`busqueda/${letra}-${String(tramo).padStart(5, '0')}.json`)
+                                .then(respuesta => respuesta.ok ? respuesta.json() : []))))
+                        .then(partes => partes.flat().map(([titulo, pagina, id]) => [normalizar(titulo), titulo, pagina, id]));
+                }
+                const lista = await fragmentos[letra];
+                if (normalizar(entrada.value.trim()) !== buscado) return;  // Ya se escribió otra cosa
+                resultados.innerHTML = lista
+                    .filter(([normalizado]) => normalizado.startsWith(buscado))
+                    .slice(0, 20)
+                    .map(([, titulo, pagina, id]) =>
+                        `<li><a href="pagina-${String(pagina).padStart(5, '0')}.html#serie-${id}">${escapar(titulo)}</a></li>`)
+                    .join('');
+            });
+        </script>
+"""
+
+
+def _huella():
+    return hashlib.blake2b(digest_size=16)
+
+
+# Si cambia la plantilla cambian todas las páginas, aunque no cambien las series
+HUELLA_PLANTILLA = hashlib.blake2b(
+    (INICIO_HTML + INICIO_TABLA_HTML + FIN_TABLA_HTML + FIN_HTML + BUSCADOR_JS
+     + fila_html(Serie(1, "Título", "Género", 1, 2000, 5.0))).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def nombre_pagina(numero: int) -> str:
+    return f"pagina-{numero:05d}.html"
+
+
+def numero_pagina(id: int, filas_por_pagina: int) -> int:
+    """Página de una serie: la página k tiene los IDs de (k-1)·N+1 a k·N"""
+    return (id - 1) // filas_por_pagina + 1
+
+
+def ids_pagina(numero: int, filas_por_pagina: int) -> range:
+    """IDs que caen en una página"""
+    return range((numero - 1) * filas_por_pagina + 1, numero * filas_por_pagina + 1)
+
+
+def slug(texto: str) -> str:
+    """Nombre de carpeta seguro para un género ("Ciencia Ficción" -> "ciencia-ficcion")"""
+    return re.sub(r'[^a-z0-9]+', '-', normalizar(texto)).strip('-') or 'sin-genero'
+
+
+def clave_busqueda(titulo: str) -> str:
+    """Trozo del índice de búsqueda de un título: su inicial normalizada (o '_')"""
+    inicial = normalizar(titulo[:1])[:1]
+    return inicial if inicial and inicial in "abcdefghijklmnopqrstuvwxyz0123456789" else "_"
+
+
+def _vecinas(numeros: List[int]) -> Dict[int, tuple]:
+    """Página anterior y siguiente de cada página (None en los extremos)"""
+    return {numero: (numeros[i - 1] if i else None, numeros[i + 1] if i + 1 < len(numeros) else None)
+            for i, numero in enumerate(numeros)}
+
+
+def leer_manifiesto(directorio: str) -> dict:
+    """Manifiesto de la exportación anterior (vacío si no hay o si cambió la plantilla)"""
+    try:
+        with open(os.path.join(directorio, MANIFIESTO), encoding='utf-8') as archivo:
+            manifiesto = json.load(archivo)
+    except (OSError, ValueError):
+        return {}
+    if manifiesto.get('plantilla') != HUELLA_PLANTILLA:
+        return {}
+    return manifiesto
+
+
+def _paginas(datos: dict) -> Dict[int, list]:
+    """Páginas de una sección leídas del manifiesto (JSON guarda los números como texto)"""
+    return {int(numero): pagina for numero, pagina in datos.items()}
+
+
+class PaginadorHTML:
+    """
+    Reparte las series de una sección (el catálogo o un género) en páginas por tramos de IDs
+    (ver numero_pagina). Las series llegan en orden de ID; cada página se escribe cuando llega
+    la primera serie de otra (o al terminar), para saber a qué página enlaza "Siguiente".
+    """
+
+    def __init__(self, directorio: str, titulo: str, fecha: str, filas_por_pagina: int,
+                 enlace_indice: str, guardar: Callable[[str, str, Callable[[], str]], None]):
+        self.directorio = directorio
+        self.titulo = titulo
+        # Número -> [primer id, último id, filas] de cada página con series
+        self.paginas: Dict[int, list] = {}
+        self._fecha = fecha
+        self._filas_por_pagina = filas_por_pagina
+        self._enlace_indice = enlace_indice
+        self._guardar = guardar
+        self._actual: Optional[int] = None
+        self._anterior: Optional[int] = None
+        self._pendientes: List[Serie] = []
+        os.makedirs(directorio, exist_ok=True)
+
+    @property
+    def filas(self) -> int:
+        return sum(filas for _, _, filas in self.paginas.values())
+
+    def agregar(self, serie: Serie) -> int:
+        """Añade la serie y devuelve el número de la página en la que queda"""
+        numero = numero_pagina(serie.id, self._filas_por_pagina)
+        if numero != self._actual:
+            if self._actual is not None:
+                if numero < self._actual:
+                    raise ValueError(f"Las series deben llegar en orden de ID (la {serie.id} llega tarde)")
+                self._cerrar(siguiente=numero)
+            self._actual = numero
+        self._pendientes.append(serie)
+        return numero
+
+    def terminar(self):
+        """Escribe la última página"""
+        if self._actual is not None:
+            self._cerrar(siguiente=None)
+
+    def _cerrar(self, siguiente: Optional[int]):
+        self.escribir_pagina(self._actual, self._pendientes, self._anterior, siguiente)
+        self._anterior = self._actual
+        self._pendientes = []
+
+    def actualizar(self, cambiadas: Dict[int, List[Serie]],
+                   series_de_pagina: Callable[[int], List[Serie]]) -> List[int]:
+        """
+        Exportación incremental: 'cambiadas' son las series actuales de las páginas en las que
+        algo ha cambiado. Reescribe esas páginas y las vecinas cuyos enlaces cambian (leyendo
+        sus series con series_de_pagina) y devuelve las que se han quedado vacías.
+        """
+        antes = _vecinas(sorted(self.paginas))
+        vacias = [numero for numero, series in cambiadas.items() if not series and numero in self.paginas]
+        for numero in vacias:
+            del self.paginas[numero]
+        despues = _vecinas(sorted(self.paginas.keys() | {numero for numero, series in cambiadas.items() if series}))
+        for numero, vecinas in despues.items():
+            if numero in cambiadas:
+                series = cambiadas[numero]
+            elif antes.get(numero) != vecinas:
+                series = series_de_pagina(numero)
+            else:
+                continue
+            self.escribir_pagina(numero, series, *vecinas)
+        return vacias
+
+    def _navegacion(self, numero: int, anterior: Optional[int], siguiente: Optional[int]) -> str:
+        anterior = f'<a href="{nombre_pagina(anterior)}">← Anterior</a>' if anterior else '<span></span>'
+        siguiente = f'<a href="{nombre_pagina(siguiente)}">Siguiente →</a>' if siguiente else '<span></span>'
+        return (f'        <div class="navegacion">{anterior}'
+                f'<a href="{self._enlace_indice}">Página {numero} · Índice</a>{siguiente}</div>\n')
+
+    def contenido_pagina(self, numero: int, series: List[Serie], anterior: Optional[int],
+                         siguiente: Optional[int]) -> str:
+        """HTML completo de una página"""
+        navegacion = self._navegacion(numero, anterior, siguiente)
+        return (INICIO_HTML.format(titulo_pagina=f"{html.escape(self.titulo)} · página {numero}",
+                                   fecha_generacion=self._fecha)
+                + navegacion + INICIO_TABLA_HTML
+                + "".join(fila_html(serie) for serie in series)
+                + FIN_TABLA_HTML + navegacion + FIN_HTML)
+
+    def escribir_pagina(self, numero: int, series: List[Serie], anterior: Optional[int],
+                        siguiente: Optional[int]):
+        """Escribe una página (si su huella ha cambiado) con sus series en orden de ID"""
+        series.sort(key=attrgetter('id'))
+        # La huella depende de todo lo que sale en la página salvo la fecha
+        huella = _huella()
+        huella.update(repr((self.titulo, numero, anterior, siguiente, self._enlace_indice)).encode('utf-8'))
+        for serie in series:
+            huella.update(repr((serie.id, serie.titulo, serie.genero, serie.temporadas,
+                                serie.año_estreno, serie.calificacion)).encode('utf-8'))
+        self._guardar(os.path.join(self.directorio, nombre_pagina(numero)), huella.hexdigest(),
+                      lambda: self.contenido_pagina(numero, series, anterior, siguiente))
+        self.paginas[numero] = [series[0].id, series[-1].id, len(series)]
+
+
+class IndiceBusqueda:
+    """
+    Índice de búsqueda partido por la inicial del título y por tramos de PAGINAS_POR_TRAMO
+    páginas (busqueda/<inicial>-<tramo>.json; trozos.json dice qué tramos tiene cada inicial).
+    Se escribe en streaming: las series llegan en orden de ID, así que solo hay abiertos los
+    trozos del tramo en curso. Cada trozo se escribe a un temporal calculando su huella; al
+    cerrarlo solo sustituye al anterior si ha cambiado.
+    """
+
+    def __init__(self, directorio: str, confirmar: Callable[[str, str, str], None]):
+        self.directorio = directorio
+        self.tramos: Dict[str, set] = {}  # Inicial -> tramos con trozo
+        self._confirmar = confirmar
+        self._archivos: Dict[str, object] = {}
+        self._huellas: Dict[str, object] = {}
+        self._tramo: Optional[int] = None
+        os.makedirs(directorio, exist_ok=True)
+
+    def ruta(self, clave: str, tramo: int) -> str:
+        return os.path.join(self.directorio, f"{clave}-{tramo:05d}.json")
+
+    def leer_tramos(self):
+        """Tramos de cada inicial de la exportación anterior (para actualizarla)"""
+        try:
+            with open(os.path.join(self.directorio, TROZOS), encoding='utf-8') as archivo:
+                self.tramos = {clave: set(tramos) for clave, tramos in json.load(archivo).items()}
+        except (OSError, ValueError):
+            self.tramos = {}
+
+    def _abrir(self, clave: str, tramo: int):
+        self._archivos[clave] = open(self.ruta(clave, tramo) + ".tmp", 'w', encoding='utf-8')
+        self._huellas[clave] = _huella()
+        self.tramos.setdefault(clave, set()).add(tramo)
+
+    def _escribir(self, clave: str, texto: str):
+        self._archivos[clave].write(texto)
+        self._huellas[clave].update(texto.encode('utf-8'))
+
+    def _cerrar_trozos(self):
+        for clave, archivo in self._archivos.items():
+            self._escribir(clave, "]")
+            archivo.close()
+            ruta = self.ruta(clave, self._tramo)
+            self._confirmar(ruta, ruta + ".tmp", self._huellas[clave].hexdigest())
+        self._archivos, self._huellas = {}, {}
+
+    def agregar(self, serie: Serie, pagina: int) -> str:
+        """Añade la serie a su trozo y devuelve su inicial"""
+        tramo = (pagina - 1) // PAGINAS_POR_TRAMO
+        if tramo != self._tramo:
+            self._cerrar_trozos()
+            self._tramo = tramo
+        clave = clave_busqueda(serie.titulo)
+        if clave not in self._archivos:
+            self._abrir(clave, tramo)
+            self._escribir(clave, "[")
+        else:
+            self._escribir(clave, ",")
+        self._escribir(clave, f"[{json.dumps(serie.titulo, ensure_ascii=False)},{pagina},{serie.id}]")
+        return clave
+
+    def reescribir(self, clave: str, tramo: int, paginas: set, entradas: List[list]) -> bool:
+        """
+        Exportación incremental: rehace un trozo con las entradas que tenía de otras páginas
+        y las nuevas 'entradas' ([título, página, id]) de estas 'paginas'. Devuelve False
+        si el trozo se queda vacío (y entonces no escribe nada).
+        """
+        try:
+            with open(self.ruta(clave, tramo), encoding='utf-8') as archivo:
+                anteriores = json.load(archivo)
+        except (OSError, ValueError):
+            anteriores = []
+        entradas = [entrada for entrada in anteriores if entrada[1] not in paginas] + entradas
+        if not entradas:
+            self.tramos.get(clave, set()).discard(tramo)
+            return False
+        entradas.sort(key=itemgetter(2))
+        self._tramo = tramo
+        self._abrir(clave, tramo)
+        # De una vez, pero el mismo texto que escribe agregar() entrada a entrada
+        self._escribir(clave, json.dumps(entradas, ensure_ascii=False, separators=(',', ':'))[:-1])
+        self._cerrar_trozos()
+        return True
+
+    def cerrar(self):
+        """Cierra los últimos trozos y escribe qué tramos tiene cada inicial"""
+        self._cerrar_trozos()
+        ruta = os.path.join(self.directorio, TROZOS)
+        tramos = {clave: sorted(tramos) for clave, tramos in sorted(self.tramos.items()) if tramos}
+        texto = json.dumps(tramos, separators=(',', ':'))
+        with open(ruta + ".tmp", 'w', encoding='utf-8') as archivo:
+            archivo.write(texto)
+        self._confirmar(ruta, ruta + ".tmp", hashlib.blake2b(texto.encode('utf-8'), digest_size=16).hexdigest())
+
+
+class ExportadorHTMLPaginado(Exportador):
+    """
+    Exporta a un directorio de páginas HTML (ver la descripción del módulo).
+    'destino' es el directorio de salida en lugar de un archivo abierto. Las series tienen
+    que llegar en orden de ID, como las devuelven los repositorios.
+    'referencia' (SerieManager.cambios_desde) se guarda en el manifiesto para que la próxima
+    exportación sepa desde qué versión del catálogo actualizar.
+    """
+
+    formato = "html-paginado"
+
+    def __init__(self, destino: str, filas_por_pagina: int = FILAS_POR_PAGINA, por_genero: bool = True,
+                 estadisticas: Optional[dict] = None, incremental: bool = True,
+                 referencia: Optional[list] = None):
+        super().__init__(destino)
+        self._filas_por_pagina = filas_por_pagina
+        self._por_genero = por_genero
+        self._incremental = incremental
+        self.referencia = referencia
+        self._anterior: dict = {}
+        self._manifiesto_anterior: Dict[str, str] = {}
+        self._manifiesto: Dict[str, str] = {}
+        self.archivos_escritos = 0
+        self.archivos_sin_cambios = 0
+        self.archivos_borrados = 0
+        self.estadisticas = estadisticas
+        self._acumulador = AcumuladorEstadisticas() if estadisticas is None else None
+        self._generos: Dict[str, PaginadorHTML] = {}
+        self._slugs: Dict[str, str] = {}
+        # Claves del índice de búsqueda de cada página del catálogo: al actualizar una página
+        # se sabe qué trozos tenían sus series sin leerlos todos
+        self._claves_pagina: Dict[int, set] = {}
+
+    def empezar(self):
+        self._fecha = datetime.now().strftime("%d de %B de %Y a las %H:%M")
+        if self._incremental:
+            self._anterior = leer_manifiesto(self.destino)
+            self._manifiesto_anterior = self._anterior.get('archivos', {})
+        self._catalogo = PaginadorHTML(self.destino, TITULO_CATALOGO, self._fecha,
+                                       self._filas_por_pagina, "index.html", self._guardar)
+        self._busqueda = IndiceBusqueda(os.path.join(self.destino, "busqueda"), self._confirmar)
+
+    # ---------- Exportación incremental ----------
+
+    def _sin_cambios(self, ruta: str, huella: str) -> bool:
+        """Registra la huella del archivo y dice si el que hay en disco ya tiene ese contenido"""
+        clave = os.path.relpath(ruta, self.destino).replace(os.sep, '/')
+        self._manifiesto[clave] = huella
+        if self._manifiesto_anterior.get(clave) == huella and os.path.exists(ruta):
+            self.archivos_sin_cambios += 1
+            return True
+        self.archivos_escritos += 1
+        return False
+
+    def _guardar(self, ruta: str, huella: str, contenido: Callable[[], str]):
+        """Escribe la página solo si su huella ha cambiado (el HTML ni siquiera se genera si no)"""
+        if self._sin_cambios(ruta, huella):
+            return
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido())
+
+    def _confirmar(self, ruta: str, temporal: str, huella: str):
+        """Sustituye el archivo por el temporal ya escrito, o descarta el temporal si no cambió"""
+        if self._sin_cambios(ruta, huella):
+            os.remove(temporal)
+        else:
+            os.replace(temporal, ruta)
+
+    def _borrar(self, ruta: str):
+        """Borra un archivo de la exportación anterior (y su carpeta si se queda vacía)"""
+        self._manifiesto.pop(os.path.relpath(ruta, self.destino).replace(os.sep, '/'), None)
+        try:
+            os.remove(ruta)
+            self.archivos_borrados += 1
+        except FileNotFoundError:
+            pass
+        try:
+            os.rmdir(os.path.dirname(ruta))  # Solo si la carpeta del género se ha quedado vacía
+        except OSError:
+            pass
+
+    def _borrar_sobrantes(self):
+        """Borra los archivos de la exportación anterior que ya no existen (páginas o géneros de menos)"""
+        for clave in self._manifiesto_anterior.keys() - self._manifiesto.keys():
+            self._borrar(os.path.join(self.destino, *clave.split('/')))
+
+    def _escribir_manifiesto(self):
+        ruta = os.path.join(self.destino, MANIFIESTO)
+        manifiesto = {
+            'plantilla': HUELLA_PLANTILLA,
+            'filas_por_pagina': self._filas_por_pagina,
+            'por_genero': self._por_genero,
+            'referencia': self.referencia,
+            'archivos': self._manifiesto,
+            'paginas': self._catalogo.paginas,
+            'claves_busqueda': {numero: "".join(sorted(claves)) for numero, claves in self._claves_pagina.items()},
+            'generos': {genero: {'carpeta': self._slugs[genero], 'paginas': paginador.paginas}
+                        for genero, paginador in self._generos.items()},
+        }
+        with open(ruta + ".tmp", 'w', encoding='utf-8') as archivo:
+            json.dump(manifiesto, archivo)
+        os.replace(ruta + ".tmp", ruta)
+
+    def actualizar(self, ids: Iterable[int], buscar_por_ids: Callable[[range], List[Serie]]) -> bool:
+        """
+        Exportación incremental sin recorrer el catálogo: 'ids' son las series creadas,
+        cambiadas o eliminadas desde la exportación anterior de este directorio (ver
+        SerieManager.cambios_desde) y solo se leen, con buscar_por_ids (las series que
+        existen de un tramo de IDs), las series de sus páginas. Devuelve False sin escribir nada si no hay exportación anterior de la que
+        partir (o es de otra configuración o de otras plantillas): hay que exportar todo.
+        """
+        self.empezar()
+        anterior = self._anterior
+        if (not anterior or anterior.get('filas_por_pagina') != self._filas_por_pagina
+                or anterior.get('por_genero') != self._por_genero or self.estadisticas is None):
+            return False
+        self._manifiesto = dict(self._manifiesto_anterior)
+        self._catalogo.paginas = _paginas(anterior['paginas'])
+        self._claves_pagina = {numero: set(claves) for numero, claves in _paginas(anterior['claves_busqueda']).items()}
+        for genero, datos in anterior['generos'].items():
+            self._slugs[genero] = datos['carpeta']
+            self._paginador_genero(genero).paginas = _paginas(datos['paginas'])
+
+        def series_de_pagina(numero: int) -> List[Serie]:
+            return buscar_por_ids(ids_pagina(numero, self._filas_por_pagina))
+
+        cambiadas = {numero: series_de_pagina(numero)
+                     for numero in {numero_pagina(id, self._filas_por_pagina) for id in ids}}
+        for numero in self._catalogo.actualizar(cambiadas, series_de_pagina):
+            self._borrar(os.path.join(self.destino, nombre_pagina(numero)))
+
+        if self._por_genero:
+            por_genero: Dict[str, Dict[int, List[Serie]]] = {}
+            for numero, series in cambiadas.items():
+                for serie in series:
+                    por_genero.setdefault(serie.genero, {}).setdefault(numero, []).append(serie)
+            for genero in list(self._generos) + [genero for genero in por_genero if genero not in self._generos]:
+                paginas = por_genero.get(genero, {})
+                if not paginas and not self._generos[genero].paginas.keys() & cambiadas.keys():
+                    continue
+                paginador = self._paginador_genero(genero)
+                vacias = paginador.actualizar(
+                    {numero: paginas.get(numero, []) for numero in cambiadas},
+                    lambda numero: [serie for serie in series_de_pagina(numero) if serie.genero == genero])
+                for numero in vacias:
+                    self._borrar(os.path.join(paginador.directorio, nombre_pagina(numero)))
+                if not paginador.paginas:
+                    del self._generos[genero], self._slugs[genero]
+
+        # Trozos del índice de búsqueda con series de las páginas cambiadas, antes o ahora
+        self._busqueda.leer_tramos()
+        entradas: Dict[tuple, List[list]] = {}
+        paginas_tramo: Dict[int, set] = {}
+        for numero, series in cambiadas.items():
+            tramo = (numero - 1) // PAGINAS_POR_TRAMO
+            paginas_tramo.setdefault(tramo, set()).add(numero)
+            for clave in self._claves_pagina.pop(numero, ()):
+                entradas.setdefault((clave, tramo), [])
+            for serie in series:
+                clave = clave_busqueda(serie.titulo)
+                entradas.setdefault((clave, tramo), []).append([serie.titulo, numero, serie.id])
+                self._claves_pagina.setdefault(numero, set()).add(clave)
+        for (clave, tramo), nuevas in sorted(entradas.items()):
+            if not self._busqueda.reescribir(clave, tramo, paginas_tramo[tramo], nuevas):
+                self._borrar(self._busqueda.ruta(clave, tramo))
+        self._busqueda.cerrar()
+
+        self.filas = self._catalogo.filas
+        self._escribir_indice()
+        self._escribir_manifiesto()
+        return True
+
+    # ---------- Exportación completa ----------
+
+    def _paginador_genero(self, genero: str) -> PaginadorHTML:
+        paginador = self._generos.get(genero)
+        if paginador is None:
+            nombre = self._slugs.get(genero)
+            if nombre is None:
+                nombre = slug(genero)
+                while nombre in self._slugs.values():  # Dos géneros con el mismo nombre de carpeta
+                    nombre += "-"
+                self._slugs[genero] = nombre
+            paginador = PaginadorHTML(os.path.join(self.destino, "generos", nombre), f"🎭 {genero}",
+                                      self._fecha, self._filas_por_pagina, "../../index.html", self._guardar)
+            self._generos[genero] = paginador
+        return paginador
+
+    def escribir_bloque(self, series: List[Serie]):
+        for serie in series:
+            pagina = self._catalogo.agregar(serie)
+            self._claves_pagina.setdefault(pagina, set()).add(self._busqueda.agregar(serie, pagina))
+            if self._por_genero:
+                self._paginador_genero(serie.genero).agregar(serie)
+            if self._acumulador is not None:
+                self._acumulador.agregar(serie)
+        self.filas += len(series)
+
+    def terminar(self):
+        self._catalogo.terminar()
+        for paginador in self._generos.values():
+            paginador.terminar()
+        self._busqueda.cerrar()
+        if self._acumulador is not None:
+            self.estadisticas = self._acumulador.obtener()
+        self._escribir_indice()
+        self._borrar_sobrantes()
+        self._escribir_manifiesto()
+
+    def _escribir_indice(self):
+        # La portada es una sola página con la fecha y las estadísticas: se reescribe siempre
+        with open(os.path.join(self.destino, "index.html"), 'w', encoding='utf-8') as archivo:
+            archivo.write(self._indice_html())
+
+    def _indice_html(self) -> str:
+        partes = [INICIO_HTML.format(titulo_pagina=TITULO_CATALOGO, fecha_generacion=self._fecha)]
+        partes.append('        <p><input id="buscar" type="search" placeholder="🔍 Buscar por título..." '
+                      'style="width: 100%; padding: 10px; font-size: 1.1em;"></p>\n'
+                      '        <ul id="resultados"></ul>\n')
+
+        if self._generos:
+            partes.append('        <h3>🎭 Géneros</h3>\n        <ul>\n')
+            for genero, paginador in self._generos.items():
+                partes.append(f'            <li><a href="generos/{self._slugs[genero]}/'
+                              f'{nombre_pagina(min(paginador.paginas))}">'
+                              f'{html.escape(genero)}</a> ({paginador.filas} series, '
+                              f'{len(paginador.paginas)} páginas)</li>\n')
+            partes.append('        </ul>\n')
+
+        partes.append(f'        <h3>📄 Páginas ({len(self._catalogo.paginas)})</h3>\n        <p>\n')
+        for numero, (primero, ultimo, _) in sorted(self._catalogo.paginas.items()):
+            partes.append(f'            <a href="{nombre_pagina(numero)}" title="IDs {primero}–{ultimo}">{numero}</a>\n')
+        partes.append('        </p>\n')
+
+        partes.append('        <div class="stats">\n            <h3>📊 Estadísticas del Catálogo</h3>\n'
+                      f'            {estadisticas_html(self.estadisticas)}\n        </div>\n')
+        partes.append(BUSCADOR_JS)
+        partes.append(FIN_HTML)
+        return "".join(partes)
+
+    def resultado(self) -> dict:
+        return {
+            'filas': self.filas,
+            'paginas': len(self._catalogo.paginas),
+            'generos': len(self._generos),
+            'archivos_escritos': self.archivos_escritos,
+            'archivos_sin_cambios': self.archivos_sin_cambios,
+            'archivos_borrados': self.archivos_borrados,
+            'estadisticas': self.estadisticas,
+        }
@@ -0,0 +1,158 @@
+import os
+import queue
+import threading
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+from domain.model.serie import Serie
+from export.base import Exportador, abrir_destino
+from export.texto import ExportadorCSV, ExportadorJSONL
+from export.columnar import ExportadorColumnar
+from export.html import ExportadorHTML
+
+# Formatos disponibles: nombre -> clase del exportador
+EXPORTADORES = {
+    exportador.formato: exportador
+    for exportador in (ExportadorCSV, ExportadorJSONL, ExportadorColumnar, ExportadorHTML)
+}
+
+FILAS_POR_BLOQUE = 1000
+# Bloques que pueden esperar en la cola de cada exportador (limita la memoria en modo paralelo)
+BLOQUES_EN_COLA = 8
+
+
+def iterar_bloques(series: Iterable[Serie], filas_por_bloque: int = FILAS_POR_BLOQUE) -> Iterator[List[Serie]]:
+    """Recorre las series una sola vez devolviéndolas en bloques (lo que comparten todos los formatos)"""
+    iterador = iter(series)
+    while True:
+        bloque = list(islice(iterador, filas_por_bloque))
+        if not bloque:
+            return
+        yield bloque
+
+
+def _ejecutar(exportador: Exportador, bloques: Iterable[List[Serie]], tiempos: Dict[str, float]):
+    """Pasa los bloques a un exportador midiendo el tiempo que dedica a escribir"""
+    inicio = time.perf_counter()
+    exportador.empezar()
+    for bloque in bloques:
+        exportador.escribir_bloque(bloque)
+    exportador.terminar()
+    tiempos[exportador.formato] = time.perf_counter() - inicio
+
+
+def _bloques_de_cola(cola: queue.Queue) -> Iterator[List[Serie]]:
+    while True:
+        bloque = cola.get()
+        if bloque is None:
+            return
+        yield bloque
+
+
+def exportar(series: Iterable[Serie], exportadores: List[Exportador],
+             filas_por_bloque: int = FILAS_POR_BLOQUE, paralelo: bool = True) -> Dict[str, dict]:
+    """
+    Exporta las series a varios formatos recorriéndolas una sola vez.
+    En modo paralelo cada exportador escribe en su propio hilo y recibe los bloques por
+    una cola acotada; si no, cada bloque pasa por todos los exportadores uno detrás de otro.
+    Devuelve, por formato, las filas escritas, los segundos y lo que añada el exportador.
+    """
+    tiempos: Dict[str, float] = {}
+
+    if not paralelo or len(exportadores) == 1:
+        for exportador in exportadores:
+            exportador.empezar()
+        acumulado = {exportador.formato: 0.0 for exportador in exportadores}
+        for bloque in iterar_bloques(series, filas_por_bloque):
+            for exportador in exportadores:
+                inicio = time.perf_counter()
+                exportador.escribir_bloque(bloque)
+                acumulado[exportador.formato] += time.perf_counter() - inicio
+        for exportador in exportadores:
+            inicio = time.perf_counter()
+            exportador.terminar()
+            tiempos[exportador.formato] = acumulado[exportador.formato] + time.perf_counter() - inicio
+    else:
+        colas = [queue.Queue(maxsize=BLOQUES_EN_COLA) for _ in exportadores]
+        errores: List[BaseException] = []
+
+        def trabajar(exportador: Exportador, cola: queue.Queue):
+            try:
+                _ejecutar(exportador, _bloques_de_cola(cola), tiempos)
+            except BaseException as error:
+                errores.append(error)
+                # Se sigue vaciando la cola para no bloquear al resto
+                for _ in _bloques_de_cola(cola):
+                    pass
+
+        hilos = [threading.Thread(target=trabajar, args=(exportador, cola), daemon=True)
+                 for exportador, cola in zip(exportadores, colas)]
+        for hilo in hilos:
+            hilo.start()
+        try:
+            for bloque in iterar_bloques(series, filas_por_bloque):
+                for cola in colas:
+                    cola.put(bloque)
+        finally:
+            for cola in colas:
+                cola.put(None)
+            for hilo in hilos:
+                hilo.join()
+        if errores:
+            raise errores[0]
+
+    resultados = {}
+    for exportador in exportadores:
+        resultado = exportador.resultado()
+        segundos = tiempos[exportador.formato]
+        resultado['segundos'] = segundos
+        resultado['filas_por_segundo'] = resultado['filas'] / segundos if segundos else 0.0
+        resultados[exportador.formato] = resultado
+    return resultados
+
+
+def exportar_archivos(series: Iterable[Serie], formatos: List[str], directorio: str = ".",
+                      nombre: str = "series", comprimir: bool = False, paralelo: Optional[bool] = None,
+                      filas_por_bloque: int = FILAS_POR_BLOQUE) -> Dict[str, dict]:
+    """
+    Exporta a un archivo por formato (directorio/nombre.extensión[.gz]) en una sola pasada.
+    Por defecto solo usa hilos al comprimir: zlib suelta el GIL mientras comprime, pero
+    sin compresión los hilos solo añaden cambios de contexto.
+    """
+    if paralelo is None:
+        paralelo = comprimir
+    for formato in formatos:
+        if formato not in EXPORTADORES:
+            raise ValueError(f"Formato desconocido: {formato} (disponibles: {', '.join(EXPORTADORES)})")
+
+    os.makedirs(directorio, exist_ok=True)
+    rutas = {}
+    temporales = {}
+    archivos = []
+    exportadores = []
+    terminado = False
+    try:
+        for formato in formatos:
+            clase = EXPORTADORES[formato]
+            sufijo = clase.extension + (".gz" if comprimir else "")
+            rutas[formato] = os.path.join(directorio, nombre + sufijo)
+            # Se escribe en un temporal: si la exportación falla no queda un archivo a medias
+            temporales[formato] = os.path.join(directorio, nombre + ".tmp" + sufijo)
+            archivo = abrir_destino(temporales[formato], clase.binario, comprimir)
+            archivos.append(archivo)
+            exportadores.append(clase(archivo))
+        resultados = exportar(series, exportadores, filas_por_bloque, paralelo)
+        terminado = True
+    finally:
+        for archivo in archivos:
+            archivo.close()
+        for formato, temporal in temporales.items():
+            if terminado:
+                os.replace(temporal, rutas[formato])
+            elif os.path.exists(temporal):
+                os.remove(temporal)
+
+    for formato, resultado in resultados.items():
+        resultado['ruta'] = rutas[formato]
+        resultado['bytes'] = os.path.getsize(rutas[formato])
+    return resultados
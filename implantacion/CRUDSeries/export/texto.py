@@ -0,0 +1,34 @@
+import csv
+import json
+from typing import List
+from domain.model.serie import Serie
+from export.base import COLUMNAS, Exportador
+
+
+class ExportadorCSV(Exportador):
+    """Una línea por serie separada por comas, con fila de cabecera"""
+
+    formato = "csv"
+    extension = ".csv"
+
+    def empezar(self):
+        self._escritor = csv.writer(self.destino)
+        self._escritor.writerow(COLUMNAS)
+
+    def escribir_bloque(self, series: List[Serie]):
+        self._escritor.writerows(
+            (serie.id, serie.titulo, serie.genero, serie.temporadas, serie.año_estreno, serie.calificacion)
+            for serie in series)
+        self.filas += len(series)
+
+
+class ExportadorJSONL(Exportador):
+    """JSON Lines: un objeto JSON (Serie.to_dict) por línea"""
+
+    formato = "jsonl"
+    extension = ".jsonl"
+
+    def escribir_bloque(self, series: List[Serie]):
+        self.destino.write("".join(json.dumps(serie.to_dict(), ensure_ascii=False) + "\n"
+                                   for serie in series))
+        self.filas += len(series)
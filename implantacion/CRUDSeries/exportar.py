@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Exporta el catálogo de series a uno o varios formatos en una sola pasada
+Ejecutar: python exportar.py [--formatos csv jsonl columnar html] [--salida DIRECTORIO]
+"""
+
+import argparse
+import sys
+import os
+
+# Agregar el directorio raíz al path para importaciones
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from domain.serie_manager import SerieManager
+from data.repositorios import TIPOS_REPOSITORIO, crear_repositorio
+from export.pipeline import EXPORTADORES, exportar_archivos
+
+def main():
+    """Función principal del exportador"""
+    parser = argparse.ArgumentParser(description="Exporta el catálogo de series")
+    parser.add_argument("--formatos", nargs="+", choices=list(EXPORTADORES), default=list(EXPORTADORES),
+                        help="Formatos a generar (por defecto, todos)")
+    parser.add_argument("--salida", default="exportacion", help="Directorio de salida")
+    parser.add_argument("--nombre", default="series", help="Nombre de los archivos (sin extensión)")
+    parser.add_argument("--gzip", action="store_true", help="Comprimir los archivos con gzip")
+    parser.add_argument("--modo", choices=["auto", "paralelo", "secuencial"], default="auto",
+                        help="Escribir cada formato en su propio hilo o uno detrás de otro "
+                             "(auto: en paralelo solo al comprimir)")
+    parser.add_argument("--datos", help="Directorio del repositorio persistente (por defecto, datos de ejemplo)")
+    parser.add_argument("--repositorio", choices=TIPOS_REPOSITORIO,
+                        help="Tipo de repositorio (por defecto: 'persistente' con --datos, 'indexado' sin él)")
+    args = parser.parse_args()
+
+    try:
+        repositorio = crear_repositorio(args.repositorio, args.datos)
+    except ValueError as e:
+        parser.error(str(e))
+    serie_manager = SerieManager(repositorio)
+
+    series = serie_manager.listar_series()
+    print(f"🎬 Exportando {len(series)} series a: {', '.join(args.formatos)}")
+    paralelo = None if args.modo == "auto" else args.modo == "paralelo"
+    print(f"🔄 Una sola pasada sobre el catálogo (modo {args.modo})...\n")
+
+    try:
+        resultados = exportar_archivos(series, args.formatos, args.salida, args.nombre,
+                                       comprimir=args.gzip, paralelo=paralelo)
+    except OSError as e:
+        print(f"❌ Error al exportar: {e}")
+        sys.exit(1)
+    finally:
+        repositorio.cerrar()
+
+    for formato, resultado in resultados.items():
+        print(f"✅ {formato:9} {resultado['filas']:>10,} filas  {resultado['bytes'] / 1024:>10,.1f} KB  "
+              f"{resultado['filas_por_segundo']:>12,.0f} filas/s  → {resultado['ruta']}")
+
+if __name__ == "__main__":
+    main()
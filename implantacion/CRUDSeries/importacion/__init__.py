@@ -0,0 +1 @@
+# Importación masiva de series (CSV y JSON Lines)
\ No newline at end of file
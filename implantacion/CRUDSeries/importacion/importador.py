@@ -0,0 +1,159 @@
+"""
+Importación masiva de series desde CSV o JSON Lines (también comprimidos con gzip).
+
+El archivo se lee en streaming, cada fila se valida con las mismas reglas que el menú
+(domain/validaciones.py) y las válidas se guardan en lotes. Una fila con errores no
+detiene la importación: se cuenta y se informa con su número de línea.
+Los IDs del archivo se ignoran; cada serie importada recibe uno nuevo.
+"""
+
+import csv
+import gc
+import gzip
+import json
+import os
+import time
+from operator import itemgetter
+from typing import Iterator, List, Tuple, Union
+from domain.model.serie import Serie
+from domain.validaciones import ErrorValidacion, validar_serie
+
+FILAS_POR_LOTE = 5000
+# Errores que se guardan con su mensaje (el resto solo se cuentan)
+MAX_ERRORES_GUARDADOS = 100
+
+CAMPOS_OBLIGATORIOS = ('titulo', 'genero', 'temporadas', 'año_estreno')
+CAMPO_OPCIONAL = 'calificacion'
+
+# Cada lector devuelve (línea, campos): los cinco valores sin convertir o el error de la fila
+Fila = Tuple[int, Union[tuple, ErrorValidacion]]
+
+
+def detectar_formato(ruta: str) -> str:
+    """Formato según la extensión: .csv o .jsonl/.ndjson (con o sin .gz)"""
+    nombre = ruta[:-3] if ruta.endswith('.gz') else ruta
+    extension = os.path.splitext(nombre)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"No se reconoce el formato de '{ruta}' (usa .csv o .jsonl)")
+
+
+def abrir_origen(ruta: str):
+    """Abre el archivo como texto; utf-8-sig descarta el BOM que añaden algunas hojas de cálculo"""
+    if ruta.endswith('.gz'):
+        return gzip.open(ruta, 'rt', encoding='utf-8-sig', newline='')
+    return open(ruta, encoding='utf-8-sig', newline='')
+
+
+def leer_csv(archivo) -> Iterator[Fila]:
+    """Filas de un CSV con cabecera (la de ExportadorCSV sirve; el orden de columnas da igual)"""
+    lector = csv.reader(archivo)
+    try:
+        cabecera = [columna.strip() for columna in next(lector, [])]
+        faltan = [campo for campo in CAMPOS_OBLIGATORIOS if campo not in cabecera]
+        if faltan:
+            raise ValueError(f"Al CSV le faltan las columnas: {', '.join(faltan)}")
+
+        posiciones = [cabecera.index(campo) for campo in CAMPOS_OBLIGATORIOS]
+        con_calificacion = CAMPO_OPCIONAL in cabecera
+        if con_calificacion:
+            posiciones.append(cabecera.index(CAMPO_OPCIONAL))
+        obtener = itemgetter(*posiciones)
+
+        for fila in lector:
+            if not fila:
+                continue  # Línea en blanco
+            try:
+                campos = obtener(fila)
+            except IndexError:
+                yield lector.line_num, ErrorValidacion(
+                    f"Faltan columnas (tiene {len(fila)} de {len(cabecera)}).")
+                continue
+            yield lector.line_num, campos if con_calificacion else campos + (None,)
+    except csv.Error as error:
+        # El CSV está roto a partir de aquí (p. ej. un byte nulo): no se puede seguir leyendo
+        raise ValueError(f"CSV no válido en la línea {lector.line_num}: {error}") from None
+
+
+def leer_jsonl(archivo) -> Iterator[Fila]:
+    """Filas de un archivo JSON Lines: un objeto por línea (como Serie.to_dict)"""
+    for numero, linea in enumerate(archivo, start=1):
+        if not linea.strip():
+            continue
+        try:
+            datos = json.loads(linea)
+        except ValueError:
+            yield numero, ErrorValidacion("No es JSON válido.")
+            continue
+        if not isinstance(datos, dict):
+            yield numero, ErrorValidacion("Se esperaba un objeto JSON.")
+            continue
+        faltan = [campo for campo in CAMPOS_OBLIGATORIOS if campo not in datos]
+        if faltan:
+            yield numero, ErrorValidacion(f"Faltan los campos: {', '.join(faltan)}.")
+            continue
+        yield numero, (datos['titulo'], datos['genero'], datos['temporadas'],
+                       datos['año_estreno'], datos.get(CAMPO_OPCIONAL))
+
+
+LECTORES = {
+    'csv': leer_csv,
+    'jsonl': leer_jsonl,
+}
+
+
+def importar_series(manager, ruta: str, formato: str = None, filas_por_lote: int = FILAS_POR_LOTE) -> dict:
+    """
+    Importa las series del archivo al catálogo del manager (SerieManager).
+    Devuelve las series importadas, el número de filas con errores, los primeros errores
+    como (línea, mensaje), los segundos y las filas por segundo.
+    Lanza ValueError u OSError si no se puede leer el archivo; lo importado hasta ese
+    momento se queda en el catálogo.
+    """
+    leer = LECTORES[formato or detectar_formato(ruta)]
+    inicio = time.perf_counter()
+    importadas = 0
+    total_errores = 0
+    errores: List[Tuple[int, str]] = []
+    lote: List[Serie] = []
+
+    # Se crean millones de objetos sin ciclos: el recolector de ciclos solo haría recorrerlos
+    # una y otra vez mientras el catálogo crece
+    recolector_activo = gc.isenabled()
+    gc.disable()
+    try:
+        with abrir_origen(ruta) as archivo:
+            for linea, campos in leer(archivo):
+                if not isinstance(campos, ErrorValidacion):
+                    try:
+                        lote.append(Serie(0, *validar_serie(*campos)))
+                    except ErrorValidacion as error:
+                        campos = error
+                    else:
+                        if len(lote) >= filas_por_lote:
+                            manager.crear_varias_series(lote)
+                            importadas += len(lote)
+                            lote = []
+                        continue
+
+                total_errores += 1
+                if len(errores) < MAX_ERRORES_GUARDADOS:
+                    errores.append((linea, str(campos)))
+
+            if lote:
+                manager.crear_varias_series(lote)
+                importadas += len(lote)
+    finally:
+        if recolector_activo:
+            gc.enable()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        'importadas': importadas,
+        'errores': total_errores,
+        'detalle_errores': errores,
+        'segundos': segundos,
+        'filas_por_segundo': (importadas + total_errores) / segundos if segundos else 0.0,
+    }
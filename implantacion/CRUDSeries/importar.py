@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Importa series desde un archivo CSV o JSON Lines (también .gz)
+Ejecutar: python importar.py ARCHIVO [--datos DIRECTORIO]  (sin --datos solo se comprueba el archivo)
+"""
+
+import argparse
+import sys
+import os
+
+# Agregar el directorio raíz al path para importaciones
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from domain.serie_manager import SerieManager
+from data.repositorios import TIPOS_REPOSITORIO, crear_repositorio
+from importacion.importador import FILAS_POR_LOTE, LECTORES, importar_series
+
+def main():
+    """Función principal del importador"""
+    parser = argparse.ArgumentParser(description="Importa series desde CSV o JSON Lines")
+    parser.add_argument("archivo", help="Archivo .csv o .jsonl (con o sin .gz)")
+    parser.add_argument("--formato", choices=list(LECTORES), help="Formato (por defecto, según la extensión)")
+    parser.add_argument("--datos", help="Directorio del repositorio persistente donde guardarlas")
+    parser.add_argument("--repositorio", choices=TIPOS_REPOSITORIO,
+                        help="Tipo de repositorio (por defecto: 'persistente' con --datos, 'indexado' sin él)")
+    parser.add_argument("--fsync", choices=["siempre", "intervalo", "nunca"], default="siempre",
+                        help="Cuándo forzar la escritura del log a disco (una vez por lote)")
+    parser.add_argument("--lote", type=int, default=FILAS_POR_LOTE, help="Series por lote")
+    args = parser.parse_args()
+
+    en_disco = args.datos is not None or args.repositorio in ("persistente", "sqlite")
+    if not en_disco:
+        print("💡 Sin --datos las series se importan en memoria: sirve para comprobar el archivo")
+    try:
+        # En memoria no se añaden las series de ejemplo: solo se cuenta lo que trae el archivo
+        repositorio = crear_repositorio(args.repositorio, args.datos, args.fsync, datos_ejemplo=en_disco)
+    except ValueError as e:
+        parser.error(str(e))
+    serie_manager = SerieManager(repositorio)
+
+    print(f"📥 Importando {args.archivo}...")
+    try:
+        resultado = importar_series(serie_manager, args.archivo, args.formato, args.lote)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error al importar: {e}")
+        sys.exit(1)
+    finally:
+        repositorio.cerrar()
+
+    print(f"✅ {resultado['importadas']:,} series importadas en {resultado['segundos']:.2f} s "
+          f"({resultado['filas_por_segundo']:,.0f} filas/s)")
+    if resultado['errores']:
+        print(f"⚠️  {resultado['errores']:,} filas con errores (no importadas):")
+        for linea, mensaje in resultado['detalle_errores']:
+            print(f"   Línea {linea}: {mensaje}")
+        if resultado['errores'] > len(resultado['detalle_errores']):
+            print(f"   ... y {resultado['errores'] - len(resultado['detalle_errores']):,} más")
+
+if __name__ == "__main__":
+    main()
@@ -4,237 +4,76 @@ Exportador HTML para Series de TV
 Genera un archivo HTML con una tabla de todas las series
 """
 
+import io
 import sys
 import os
-from datetime import datetime
+import time
 
 # Agregar el directorio raíz al path para importaciones
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from domain.serie_manager import SerieManager
+from export.base import abrir_destino
+from export.html import ExportadorHTML
+from export.html_paginado import FILAS_POR_PAGINA, ExportadorHTMLPaginado, leer_manifiesto
+from export.pipeline import FILAS_POR_BLOQUE, exportar
 
-def generar_html_series(series, nombre_archivo="series_table.html"):
-    """Genera un archivo HTML con una tabla de series"""
-    
-    # Template HTML con estilos CSS
-    html_template = """
-<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Catálogo de Series de TV</title>
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            margin: 40px;
-            background-color: #f5f5f5;
-        }}
-        
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }}
-        
-        h1 {{
-            color: #2c3e50;
-            text-align: center;
-            margin-bottom: 10px;
-            font-size: 2.5em;
-        }}
-        
-        .subtitle {{
-            text-align: center;
-            color: #7f8c8d;
-            margin-bottom: 30px;
-            font-style: italic;
-        }}
-        
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-        }}
-        
-        th {{
-            background-color: #3498db;
-            color: white;
-            padding: 15px 10px;
-            text-align: left;
-            font-weight: bold;
-            border-bottom: 2px solid #2980b9;
-        }}
-        
-        td {{
-            padding: 12px 10px;
-            border-bottom: 1px solid #ecf0f1;
-        }}
-        
-        tr:nth-child(even) {{
-            background-color: #f8f9fa;
-        }}
-        
-        tr:hover {{
-            background-color: #e8f4fd;
-            transition: background-color 0.3s ease;
-        }}
-        
-        .calificacion {{
-            font-weight: bold;
-            padding: 5px 10px;
-            border-radius: 15px;
-            color: white;
-        }}
-        
-        .calificacion.excelente {{
-            background-color: #27ae60;
-        }}
-        
-        .calificacion.muy-buena {{
-            background-color: #2ecc71;
-        }}
-        
-        .calificacion.buena {{
-            background-color: #f39c12;
-        }}
-        
-        .calificacion.regular {{
-            background-color: #e67e22;
-        }}
-        
-        .calificacion.mala {{
-            background-color: #e74c3c;
-        }}
-        
-        .genero {{
-            background-color: #ecf0f1;
-            padding: 5px 10px;
-            border-radius: 12px;
-            font-size: 0.9em;
-            color: #2c3e50;
-        }}
-        
-        .stats {{
-            margin-top: 30px;
-            padding: 20px;
-            background-color: #f8f9fa;
-            border-radius: 8px;
-            border-left: 4px solid #3498db;
-        }}
-        
-        .stats h3 {{
-            color: #2c3e50;
-            margin-top: 0;
-        }}
-        
-        .footer {{
-            text-align: center;
-            margin-top: 30px;
-            color: #95a5a6;
-            font-size: 0.9em;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🎬 Catálogo de Series de TV</h1>
-        <p class="subtitle">Generado el {fecha_generacion}</p>
-        
-        <table>
-            <thead>
-                <tr>
-                    <th>ID</th>
-                    <th>Título</th>
-                    <th>Género</th>
-                    <th>Temporadas</th>
-                    <th>Año de Estreno</th>
-                    <th>Calificación</th>
-                </tr>
-            </thead>
-            <tbody>
-                {filas_series}
-            </tbody>
-        </table>
-        
-        <div class="stats">
-            <h3>📊 Estadísticas del Catálogo</h3>
-            {estadisticas}
-        </div>
-        
-        <div class="footer">
-            <p>Exportado desde CRUD Series TV - Total de series: {total_series}</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-    
-    # Generar filas de la tabla
-    filas_html = []
-    for serie in series:
-        # Determinar clase CSS para la calificación
-        if serie.calificacion >= 9.0:
-            clase_calificacion = "excelente"
-        elif serie.calificacion >= 8.0:
-            clase_calificacion = "muy-buena"
-        elif serie.calificacion >= 7.0:
-            clase_calificacion = "buena"
-        elif serie.calificacion >= 5.0:
-            clase_calificacion = "regular"
-        else:
-            clase_calificacion = "mala"
-        
-        fila = f"""
-                <tr>
-                    <td>{serie.id}</td>
-                    <td><strong>{serie.titulo}</strong></td>
-                    <td><span class="genero">{serie.genero}</span></td>
-                    <td>{serie.temporadas}</td>
-                    <td>{serie.año_estreno}</td>
-                    <td><span class="calificacion {clase_calificacion}">{serie.calificacion}/10</span></td>
-                </tr>"""
-        filas_html.append(fila)
-    
-    # Generar estadísticas
-    if series:
-        total_series = len(series)
-        promedio_calificacion = sum(s.calificacion for s in series) / total_series
-        total_temporadas = sum(s.temporadas for s in series)
-        
-        # Contar géneros
-        generos = {}
-        for serie in series:
-            generos[serie.genero] = generos.get(serie.genero, 0) + 1
-        
-        generos_str = ", ".join([f"{genero}: {cantidad}" for genero, cantidad in generos.items()])
-        
-        # Serie mejor calificada
-        mejor_serie = max(series, key=lambda s: s.calificacion)
-        
-        estadisticas_html = f"""
-            <p><strong>Total de series:</strong> {total_series}</p>
-            <p><strong>Calificación promedio:</strong> {promedio_calificacion:.2f}/10</p>
-            <p><strong>Total de temporadas:</strong> {total_temporadas}</p>
-            <p><strong>Serie mejor calificada:</strong> {mejor_serie.titulo} ({mejor_serie.calificacion}/10)</p>
-            <p><strong>Géneros:</strong> {generos_str}</p>
-        """
-    else:
-        estadisticas_html = "<p>No hay series en el catálogo.</p>"
-    
-    # Completar el template
-    html_completo = html_template.format(
-        fecha_generacion=datetime.now().strftime("%d de %B de %Y a las %H:%M"),
-        filas_series="".join(filas_html),
-        estadisticas=estadisticas_html,
-        total_series=len(series)
-    )
-    
-    return html_completo
+def escribir_html_series(series, destino, estadisticas=None, filas_por_bloque=FILAS_POR_BLOQUE) -> dict:
+    """
+    Escribe la tabla HTML en 'destino' (cualquier fichero de texto abierto) sin construirla en memoria:
+    primero la cabecera, después las filas en bloques y al final el pie.
+    'series' puede ser cualquier iterable (también un generador que lea de disco); las estadísticas
+    se calculan en la misma pasada salvo que se pasen ya calculadas.
+    Devuelve las filas escritas, los segundos, las filas por segundo y las estadísticas.
+    """
+    exportador = ExportadorHTML(destino, estadisticas)
+    return exportar(series, [exportador], filas_por_bloque)['html']
+
+def exportar_html_series(series, ruta, estadisticas=None, comprimir=None) -> dict:
+    """
+    Exporta la tabla HTML a un archivo. Con comprimir=True (o si la ruta acaba en .gz)
+    se escribe comprimida con gzip mientras se genera.
+    """
+    if comprimir is None:
+        comprimir = ruta.endswith('.gz')
+    with abrir_destino(ruta, binario=False, comprimir=comprimir) as archivo:
+        return escribir_html_series(series, archivo, estadisticas)
+
+def exportar_html_paginado(series, directorio, filas_por_pagina=FILAS_POR_PAGINA, por_genero=True,
+                           estadisticas=None, incremental=True) -> dict:
+    """
+    Exporta el catálogo a un directorio de páginas HTML de 'filas_por_pagina' series,
+    con navegación anterior/siguiente, páginas por género (opcional), un índice de
+    búsqueda en JSON e index.html como portada.
+    Si el directorio ya tiene una exportación, solo se reescriben las páginas que cambian.
+    """
+    exportador = ExportadorHTMLPaginado(directorio, filas_por_pagina, por_genero, estadisticas, incremental)
+    return exportar(series, [exportador])[exportador.formato]
+
+def actualizar_html_paginado(serie_manager, directorio, filas_por_pagina=FILAS_POR_PAGINA, por_genero=True) -> dict:
+    """
+    Exporta el catálogo del manager como exportar_html_paginado. Si el directorio tiene una
+    exportación anterior hecha con este mismo manager, solo se leen y se reescriben las
+    páginas de las series que han cambiado desde entonces (SerieManager.cambios_desde), sin
+    recorrer el catálogo; si no, se recorre entero y se comparan las huellas de las páginas.
+    """
+    # La referencia se toma antes de leer las series: lo que cambie mientras tanto se vuelve a mirar la próxima vez
+    referencia, ids = serie_manager.cambios_desde(leer_manifiesto(directorio).get('referencia'))
+    exportador = ExportadorHTMLPaginado(directorio, filas_por_pagina, por_genero,
+                                        serie_manager.obtener_estadisticas(), referencia=referencia)
+    inicio = time.perf_counter()
+    if ids is not None and exportador.actualizar(ids, serie_manager.buscar_series_por_ids):
+        return dict(exportador.resultado(), segundos=time.perf_counter() - inicio)
+    return exportar(serie_manager.listar_series(), [exportador])[exportador.formato]
+
+def generar_html_series(series, nombre_archivo="series_table.html", estadisticas=None):
+    """
+    Genera el HTML de la tabla de series como texto
+    Si se pasan las estadísticas (SerieManager.obtener_estadisticas) no se recalculan
+    """
+    salida = io.StringIO()
+    escribir_html_series(series, salida, estadisticas)
+    return salida.getvalue()
 
 def main():
     """Función principal para exportar series a HTML"""
@@ -254,31 +93,58 @@ def main():
         
         print(f"📚 Se encontraron {len(series)} series en el catálogo")
         
-        # Solicitar nombre del archivo
-        print("\n📁 Configuración del archivo:")
-        nombre_archivo = input("Nombre del archivo HTML (por defecto: series_table.html): ").strip()
-        if not nombre_archivo:
-            nombre_archivo = "series_table.html"
-        
-        # Asegurar extensión .html
-        if not nombre_archivo.endswith('.html'):
-            nombre_archivo += '.html'
-        
-        # Generar HTML
-        print("\n🔄 Generando archivo HTML...")
-        html_content = generar_html_series(series, nombre_archivo)
-        
-        # Guardar archivo
-        ruta_completa = os.path.join(os.getcwd(), nombre_archivo)
-        with open(ruta_completa, 'w', encoding='utf-8') as file:
-            file.write(html_content)
-        
-        print(f"✅ Archivo HTML generado exitosamente!")
-        print(f"📍 Ubicación: {ruta_completa}")
-        print(f"📊 Series exportadas: {len(series)}")
+        # Con muchas series, una sola tabla es inmanejable en el navegador: se ofrece dividirla
+        paginar = input("¿Dividir en páginas? (s/N): ").strip().lower() in ['s', 'si', 'sí', 'y', 'yes']
+        
+        if paginar:
+            print("\n📁 Configuración de las páginas:")
+            directorio = input("Directorio de salida (por defecto: series_html): ").strip() or "series_html"
+            try:
+                filas_por_pagina = int(input(f"Series por página (por defecto: {FILAS_POR_PAGINA}): ").strip()
+                                       or FILAS_POR_PAGINA)
+            except ValueError:
+                print("❌ Error: Ingresa un número válido.")
+                return
+            por_genero = input("¿Generar también páginas por género? (S/n): ").strip().lower() not in ['n', 'no']
+            
+            print("\n🔄 Generando páginas HTML...")
+            resultado = actualizar_html_paginado(serie_manager, directorio, filas_por_pagina, por_genero)
+            ruta_completa = os.path.join(os.getcwd(), directorio, "index.html")
+            
+            print(f"✅ Páginas HTML generadas exitosamente!")
+            print(f"📍 Portada: {ruta_completa}")
+            print(f"📄 Páginas: {resultado['paginas']}" + (f" (+ {resultado['generos']} géneros)" if por_genero else ""))
+            print(f"♻️  Archivos reescritos: {resultado['archivos_escritos']}, sin cambios: "
+                  f"{resultado['archivos_sin_cambios']}, borrados: {resultado['archivos_borrados']}")
+            print("💡 El buscador carga el índice con fetch: sirve el directorio con 'python -m http.server'")
+        else:
+            # Solicitar nombre del archivo
+            print("\n📁 Configuración del archivo:")
+            nombre_archivo = input("Nombre del archivo HTML (por defecto: series_table.html): ").strip()
+            if not nombre_archivo:
+                nombre_archivo = "series_table.html"
+            
+            # Asegurar extensión .html
+            if not nombre_archivo.endswith(('.html', '.html.gz')):
+                nombre_archivo += '.html'
+            
+            comprimir = input("¿Comprimir con gzip? (s/N): ").strip().lower() in ['s', 'si', 'sí', 'y', 'yes']
+            if comprimir and not nombre_archivo.endswith('.gz'):
+                nombre_archivo += '.gz'
+            
+            # Generar HTML escribiendo directamente en el archivo; las estadísticas se calculan en la misma pasada
+            print("\n🔄 Generando archivo HTML...")
+            ruta_completa = os.path.join(os.getcwd(), nombre_archivo)
+            resultado = exportar_html_series(series, ruta_completa, comprimir=comprimir)
+            
+            print(f"✅ Archivo HTML generado exitosamente!")
+            print(f"📍 Ubicación: {ruta_completa}")
+        
+        estadisticas = resultado['estadisticas']
+        print(f"📊 Series exportadas: {resultado['filas']}")
+        print(f"⚡ Velocidad: {resultado['filas_por_segundo']:,.0f} filas/s ({resultado['segundos']:.2f} s)")
         
         # Mostrar estadísticas
-        estadisticas = serie_manager.obtener_estadisticas()
         print(f"\n📈 Estadísticas del catálogo:")
         print(f"   • Total de series: {estadisticas['total_series']}")
         print(f"   • Calificación promedio: {estadisticas['promedio_calificacion']}/10")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+API web del CRUD de Series (necesita: pip install fastapi uvicorn; opcional: brotli)
+Ejecutar: python servidor.py [--host HOST] [--puerto PUERTO] [--datos DIRECTORIO] [--repositorio sqlite]
+"""
+
+import argparse
+import sys
+import os
+
+# Agregar el directorio raíz al path para importaciones
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from domain.serie_manager import SerieManager
+from data.repositorios import TIPOS_REPOSITORIO, crear_repositorio
+
+def main():
+    """Función principal del servidor web"""
+    parser = argparse.ArgumentParser(description="API web del CRUD de Series")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección en la que escuchar")
+    parser.add_argument("--puerto", type=int, default=8000, help="Puerto en el que escuchar")
+    parser.add_argument("--datos", help="Directorio donde guardar las series (log + snapshots o base SQLite)")
+    parser.add_argument("--repositorio", choices=TIPOS_REPOSITORIO,
+                        help="Dónde guardar las series (por defecto: 'persistente' con --datos, 'indexado' sin él)")
+    parser.add_argument("--fsync", choices=["siempre", "intervalo", "nunca"], default="siempre",
+                        help="Cuándo forzar la escritura del log a disco")
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+        from ui.web import crear_app
+    except ImportError as e:
+        print(f"❌ Falta una dependencia de la API web ({e.name}): pip install fastapi uvicorn")
+        sys.exit(1)
+
+    try:
+        repositorio = crear_repositorio(args.repositorio, args.datos, args.fsync)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        uvicorn.run(crear_app(SerieManager(repositorio)), host=args.host, port=args.puerto)
+    finally:
+        repositorio.cerrar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Prueba de estrés de SerieManager con cada repositorio: varios hilos crean, actualizan y
+borran series mientras otros buscan, consultan, recorren el catálogo y piden estadísticas.
+Al terminar se comprueban los IDs, el recuento, las estadísticas y que ninguna lectura
+haya visto una serie a medio actualizar.
+
+Ejecutar: python -m pytest test_concurrencia.py
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from domain.model.serie import Serie
+from domain.serie_manager import SerieManager
+from domain.consultas import Consulta
+from data.serie_repository import SerieRepositoryInMemory
+from data.serie_repository_indexado import SerieRepositoryIndexado
+from data.serie_repository_columnar import SerieRepositoryColumnar
+from data.serie_repository_persistente import SerieRepositoryPersistente
+from data.serie_repository_sqlite import SerieRepositorySQLite
+
+HILOS = 4
+OPERACIONES = 100  # Escrituras por hilo
+INICIALES = 500
+
+REPOSITORIOS = {
+    "lista": lambda directorio: SerieRepositoryInMemory(),
+    "indexado": lambda directorio: SerieRepositoryIndexado(datos_ejemplo=False),
+    "columnar": lambda directorio: SerieRepositoryColumnar(datos_ejemplo=False),
+    "persistente": lambda directorio: SerieRepositoryPersistente(os.path.join(directorio, "persistente"),
+                                                                 fsync="nunca", datos_ejemplo=False),
+    "sqlite": lambda directorio: SerieRepositorySQLite(os.path.join(directorio, "series.db"),
+                                                       fsync="nunca", datos_ejemplo=False),
+}
+
+
+def version_coherente(serie) -> bool:
+    """Las series de la prueba se llaman 'Hilo K vX' y tienen calificación X / 10"""
+    if not serie.titulo.startswith("Hilo "):
+        return True
+    return serie.calificacion == int(serie.titulo.rsplit(" v", 1)[1]) / 10
+
+
+@pytest.mark.parametrize("tipo", list(REPOSITORIOS))
+def test_lectores_y_escritores_a_la_vez(tmp_path, tipo):
+    repositorio = REPOSITORIOS[tipo](str(tmp_path))
+    repositorio.save_all([Serie(0, f"Serie {i}", "Drama", 1 + i % 9, 1990 + i % 30, i % 101 / 10)
+                          for i in range(INICIALES)])
+    serie_manager = SerieManager(repositorio)
+    total_inicial = repositorio.count()
+    ids_iniciales = {serie.id for serie in repositorio.find_all()}
+
+    creadas = [[] for _ in range(HILOS)]
+    borradas = [[] for _ in range(HILOS)]
+    errores = []
+    lecturas = [0] * HILOS
+    barrera = threading.Barrier(2 * HILOS)
+    escritores_activos = threading.Event()
+    escritores_activos.set()
+    escritores_terminados = []
+
+    def escritor(k: int):
+        aleatorio = random.Random(k)
+        barrera.wait()
+        try:
+            for _ in range(OPERACIONES):
+                version = aleatorio.randint(0, 100)
+                propias = [id for id in creadas[k] if id not in borradas[k]]
+                operacion = aleatorio.random()
+                if operacion < 0.5 or not propias:
+                    serie = serie_manager.crear_serie(f"Hilo {k} v{version}", "Drama", 1, 2020, version / 10)
+                    creadas[k].append(serie.id)
+                elif operacion < 0.8:
+                    serie_manager.actualizar_serie(aleatorio.choice(propias), titulo=f"Hilo {k} v{version}",
+                                                   calificacion=version / 10)
+                else:
+                    id = aleatorio.choice(propias)
+                    if serie_manager.eliminar_serie(id):
+                        borradas[k].append(id)
+                # El cerrojo da preferencia a los escritores: sin una pausa, los lectores no entrarían
+                time.sleep(0.0001)
+        except Exception as e:
+            errores.append(f"escritor {k}: {e!r}")
+        finally:
+            escritores_terminados.append(k)
+            if len(escritores_terminados) == HILOS:
+                escritores_activos.clear()
+
+    def lector(k: int):
+        aleatorio = random.Random(1000 + k)
+        barrera.wait()
+        try:
+            while escritores_activos.is_set() or not lecturas[k]:
+                serie = serie_manager.buscar_serie_por_id(aleatorio.randint(1, total_inicial + 100))
+                series = serie_manager.consultar(Consulta().con_titulo_que_contiene("hilo")
+                                                 .ordenar_por("calificacion", descendente=True).paginar(20))
+                estadisticas = serie_manager.obtener_estadisticas()
+                for leida in series + ([serie] if serie else []):
+                    if not version_coherente(leida):
+                        errores.append(f"lector {k}: serie a medias {leida}")
+                if estadisticas['total_series'] < total_inicial - HILOS * OPERACIONES:
+                    errores.append(f"lector {k}: total imposible {estadisticas['total_series']}")
+
+                # listar_series es una foto: se recorre entera sin cerrojo mientras se escribe
+                catalogo = serie_manager.listar_series()
+                ids = [leida.id for leida in catalogo if version_coherente(leida)]
+                if len(ids) != len(catalogo) or len(set(ids)) != len(ids):
+                    errores.append(f"lector {k}: listado incoherente ({len(ids)} de {len(catalogo)})")
+                lecturas[k] += 1
+        except Exception as e:
+            errores.append(f"lector {k}: {e!r}")
+
+    trabajadores = ([threading.Thread(target=escritor, args=(k,)) for k in range(HILOS)]
+                    + [threading.Thread(target=lector, args=(k,)) for k in range(HILOS)])
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+
+    try:
+        assert errores == []
+        assert all(lecturas)
+
+        todas_creadas = [id for ids in creadas for id in ids]
+        todas_borradas = {id for ids in borradas for id in ids}
+        assert len(set(todas_creadas)) == len(todas_creadas), "IDs repetidos entre hilos"
+        assert not ids_iniciales & set(todas_creadas), "IDs nuevos que ya tenía una serie inicial"
+        assert repositorio.count() == total_inicial + len(todas_creadas) - len(todas_borradas)
+        assert all(serie_manager.buscar_serie_por_id(id) is not None
+                   for id in todas_creadas if id not in todas_borradas)
+        assert all(serie_manager.buscar_serie_por_id(id) is None for id in todas_borradas)
+        assert serie_manager.comprobar_estadisticas() == []
+    finally:
+        repositorio.cerrar()
@@ -0,0 +1,97 @@
+"""
+Recuperación del repositorio persistente tras matar al proceso que escribe: un proceso
+hijo crea, actualiza y borra series sin parar; se le mata a mitad del log, se añade una
+última línea cortada y al reabrir el catálogo tiene que ser el que se había confirmado.
+
+Ejecutar: python -m pytest test_recuperacion.py
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+
+import pytest
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(DIRECTORIO)
+
+from domain.model.serie import Serie
+from data.serie_repository_persistente import SerieRepositoryPersistente
+
+# Operaciones confirmadas que se esperan antes de matar al hijo: con un snapshot cada
+# 200, el log ya se ha vaciado varias veces y tiene operaciones pendientes al morir
+CONFIRMADAS = 1000
+
+# Proceso hijo: imprime cada operación cuando save/delete_by_id ya ha vuelto
+ESCRITOR = """
+import json, random, sys
+sys.path.insert(0, sys.argv[2])
+from domain.model.serie import Serie
+from data.serie_repository_persistente import SerieRepositoryPersistente
+
+repositorio = SerieRepositoryPersistente(sys.argv[1], datos_ejemplo=False, operaciones_por_snapshot=200)
+aleatorio = random.Random(7)
+vivas = []
+for i in range(10_000_000):
+    operacion = aleatorio.random()
+    if operacion < 0.6 or not vivas:
+        serie = repositorio.save(Serie(0, f"Serie {i}", "Drama", 1 + i % 9, 1990 + i % 30, i % 101 / 10))
+        vivas.append(serie.id)
+        print(json.dumps({"op": "save", "serie": serie.to_dict()}), flush=True)
+    elif operacion < 0.85:
+        serie = repositorio.save(Serie(aleatorio.choice(vivas), f"Cambio {i}", "Comedia", 2, 2000, 5.0))
+        print(json.dumps({"op": "save", "serie": serie.to_dict()}), flush=True)
+    else:
+        id = vivas.pop(aleatorio.randrange(len(vivas)))
+        repositorio.delete_by_id(id)
+        print(json.dumps({"op": "delete", "id": id}), flush=True)
+"""
+
+
+def catalogo(repositorio) -> dict:
+    return {serie.id: serie.to_dict() for serie in repositorio.find_all()}
+
+
+@pytest.mark.parametrize("cola", [
+    '{"op": "save", "serie": {"id": 99',  # JSON a medio escribir
+    '{"op": "delete", "id": 1, "lsn": 999999}',  # Línea entera pero sin el salto de línea
+])
+def test_recupera_lo_confirmado_tras_matar_al_escritor(tmp_path, cola):
+    ruta = str(tmp_path / "datos")
+    hijo = subprocess.Popen([sys.executable, "-c", ESCRITOR, ruta, DIRECTORIO],
+                            stdout=subprocess.PIPE, text=True)
+    try:
+        confirmadas = [json.loads(hijo.stdout.readline()) for _ in range(CONFIRMADAS)]
+    finally:
+        hijo.send_signal(signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+        hijo.wait()
+        hijo.stdout.close()
+
+    with open(os.path.join(ruta, "series.log"), "a", encoding="utf-8") as log:
+        log.write(cola)
+
+    esperado = {}
+    for operacion in confirmadas:
+        if operacion["op"] == "save":
+            esperado[operacion["serie"]["id"]] = operacion["serie"]
+        else:
+            del esperado[operacion["id"]]
+
+    repositorio = SerieRepositoryPersistente(ruta, datos_ejemplo=False)
+    recuperado = catalogo(repositorio)
+    # El hijo puede morir con una operación más ya en el log pero sin confirmar:
+    # como mucho difiere esa serie, y todas las demás tienen que estar tal cual
+    distintas = {id for id in esperado.keys() | recuperado.keys() if esperado.get(id) != recuperado.get(id)}
+    assert len(distintas) <= 1, distintas
+
+    # La cola cortada se ha descartado: lo que se escribe ahora sobrevive a otro arranque
+    nueva = repositorio.save(Serie(0, "Tras el fallo", "Drama", 1, 2024, 5.0))
+    recuperado[nueva.id] = nueva.to_dict()
+    repositorio.cerrar()
+
+    repositorio = SerieRepositoryPersistente(ruta, datos_ejemplo=False)
+    try:
+        assert catalogo(repositorio) == recuperado
+    finally:
+        repositorio.cerrar()
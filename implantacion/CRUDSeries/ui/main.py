@@ -1,12 +1,16 @@
 import os
 import sys
 from domain.serie_manager import SerieManager
+from domain.consultas import Consulta
+from domain.validaciones import (ErrorValidacion, validar_año_estreno, validar_calificacion,
+                                 validar_genero, validar_temporadas, validar_titulo)
+from importacion.importador import importar_series
 
 class MenuCRUD:
     """Clase que maneja el menú y la interfaz de usuario"""
     
-    def __init__(self):
-        self.manager = SerieManager()
+    def __init__(self, manager: SerieManager = None):
+        self.manager = manager if manager is not None else SerieManager()
     
     def limpiar_pantalla(self):
         """Limpia la pantalla de la consola"""
@@ -27,44 +31,29 @@ class MenuCRUD:
         print("4. Actualizar serie")
         print("5. Eliminar serie")
         print("6. Estadísticas")
-        print("7. Salir")
+        print("7. Importar series desde archivo")
+        print("8. Salir")
         print("=" * 50)
     
     def crear_serie(self):
         """Interfaz para crear una nueva serie"""
         print("\n--- CREAR NUEVA SERIE ---")
         try:
-            titulo = input("Título de la serie: ").strip()
-            if not titulo:
-                print("❌ El título no puede estar vacío.")
-                return
-            
-            genero = input("Género: ").strip()
-            if not genero:
-                print("❌ El género no puede estar vacío.")
-                return
-            
-            temporadas = int(input("Número de temporadas: "))
-            if temporadas < 1:
-                print("❌ El número de temporadas debe ser mayor a 0.")
-                return
-            
-            año_estreno = int(input("Año de estreno: "))
-            if año_estreno < 1900 or año_estreno > 2030:
-                print("❌ Año de estreno inválido.")
-                return
+            # Cada dato se valida al escribirlo (mismas reglas que la importación masiva)
+            titulo = validar_titulo(input("Título de la serie: "))
+            genero = validar_genero(input("Género: "))
+            temporadas = validar_temporadas(int(input("Número de temporadas: ")))
+            año_estreno = validar_año_estreno(int(input("Año de estreno: ")))
             
             calificacion_input = input("Calificación (0-10, opcional): ").strip()
-            calificacion = float(calificacion_input) if calificacion_input else 0.0
-            
-            if calificacion < 0 or calificacion > 10:
-                print("❌ La calificación debe estar entre 0 y 10.")
-                return
+            calificacion = validar_calificacion(float(calificacion_input) if calificacion_input else 0.0)
             
             serie = self.manager.crear_serie(titulo, genero, temporadas, año_estreno, calificacion)
             print(f"\n✅ Serie creada exitosamente:")
             print(f"   {serie}")
             
+        except ErrorValidacion as e:
+            print(f"❌ {e}")
         except ValueError:
             print("❌ Error: Ingresa valores numéricos válidos.")
         except Exception as e:
@@ -89,7 +78,9 @@ class MenuCRUD:
         print("1. Buscar por ID")
         print("2. Buscar por título")
         print("3. Buscar por género")
-        print("4. Volver al menú principal")
+        print("4. Autocompletar título")
+        print("5. Búsqueda avanzada (varios criterios)")
+        print("6. Volver al menú principal")
     
     def buscar_series(self):
         """Interfaz para buscar series"""
@@ -104,11 +95,15 @@ class MenuCRUD:
             elif opcion == '3':
                 self.buscar_por_genero()
             elif opcion == '4':
+                self.autocompletar_titulo()
+            elif opcion == '5':
+                self.busqueda_avanzada()
+            elif opcion == '6':
                 break
             else:
                 print("❌ Opción no válida.")
             
-            if opcion in ['1', '2', '3']:
+            if opcion in ['1', '2', '3', '4', '5']:
                 self.pausar()
     
     def buscar_por_id(self):
@@ -142,6 +137,22 @@ class MenuCRUD:
         else:
             print(f"❌ No se encontraron series que contengan '{titulo}'.")
     
+    def autocompletar_titulo(self):
+        """Muestra las series cuyo título empieza por el texto introducido"""
+        prefijo = input("Ingresa el comienzo del título: ").strip()
+        if not prefijo:
+            print("❌ El texto no puede estar vacío.")
+            return
+        
+        series = self.manager.autocompletar_titulo(prefijo)
+        
+        if series:
+            print(f"\n✅ Títulos que empiezan por '{prefijo}':")
+            for serie in series:
+                print(f"   {serie}")
+        else:
+            print(f"❌ No hay series cuyo título empiece por '{prefijo}'.")
+    
     def buscar_por_genero(self):
         """Busca series por género"""
         genero = input("Ingresa el género: ").strip()
@@ -158,6 +169,42 @@ class MenuCRUD:
         else:
             print(f"❌ No se encontraron series del género '{genero}'.")
     
+    def busqueda_avanzada(self):
+        """Combina varios criterios; los que se dejan vacíos no filtran"""
+        print("\n(Deja vacío lo que no quieras usar)")
+        try:
+            consulta = Consulta()
+            titulo = input("Texto en el título: ").strip()
+            if titulo:
+                consulta.con_titulo_que_contiene(titulo)
+            genero = input("Género: ").strip()
+            if genero:
+                consulta.del_genero(genero)
+            desde = input("Estrenada desde el año: ").strip()
+            hasta = input("Estrenada hasta el año: ").strip()
+            consulta.estrenadas_entre(int(desde) if desde else None, int(hasta) if hasta else None)
+            minima = input("Calificación mínima: ").strip()
+            consulta.con_calificacion_entre(float(minima) if minima else None)
+            orden = input("Ordenar por (titulo, año_estreno, calificacion, temporadas) [id]: ").strip()
+            if orden:
+                descendente = input("¿De mayor a menor? (s/n): ").strip().lower() == 's'
+                consulta.ordenar_por(orden, descendente)
+            limite = input("Máximo de resultados [todos]: ").strip()
+            consulta.paginar(int(limite) if limite else None)
+        except ValueError:
+            print("❌ Error: los años y el máximo deben ser números enteros, la calificación un número "
+                  "y el orden uno de los campos indicados.")
+            return
+        
+        series = self.manager.consultar(consulta)
+        
+        if series:
+            print(f"\n✅ Se encontraron {len(series)} serie(s):")
+            for serie in series:
+                print(f"   {serie}")
+        else:
+            print("❌ Ninguna serie cumple todos los criterios.")
+    
     def actualizar_serie(self):
         """Interfaz para actualizar una serie"""
         print("\n--- ACTUALIZAR SERIE ---")
@@ -185,17 +232,12 @@ class MenuCRUD:
             calificacion = float(calificacion_input) if calificacion_input else None
             
             # Validaciones
-            if temporadas is not None and temporadas < 1:
-                print("❌ El número de temporadas debe ser mayor a 0.")
-                return
-            
-            if año_estreno is not None and (año_estreno < 1900 or año_estreno > 2030):
-                print("❌ Año de estreno inválido.")
-                return
-            
-            if calificacion is not None and (calificacion < 0 or calificacion > 10):
-                print("❌ La calificación debe estar entre 0 y 10.")
-                return
+            if temporadas is not None:
+                validar_temporadas(temporadas)
+            if año_estreno is not None:
+                validar_año_estreno(año_estreno)
+            if calificacion is not None:
+                validar_calificacion(calificacion)
             
             exito = self.manager.actualizar_serie(
                 id_serie,
@@ -213,6 +255,8 @@ class MenuCRUD:
             else:
                 print("❌ Error al actualizar la serie.")
                 
+        except ErrorValidacion as e:
+            print(f"❌ {e}")
         except ValueError:
             print("❌ Error: Ingresa valores numéricos válidos.")
         except Exception as e:
@@ -245,9 +289,68 @@ class MenuCRUD:
         except Exception as e:
             print(f"❌ Error inesperado: {e}")
     
+    def importar_series(self):
+        """Interfaz para importar series desde un archivo CSV o JSON Lines"""
+        print("\n--- IMPORTAR SERIES ---")
+        print("Formatos: CSV con cabecera (titulo, genero, temporadas, año_estreno, calificacion)")
+        print("          o JSON Lines (un objeto por línea). También comprimidos (.gz)")
+        ruta = input("Ruta del archivo: ").strip()
+        if not ruta:
+            print("❌ La ruta no puede estar vacía.")
+            return
+        
+        try:
+            resultado = importar_series(self.manager, ruta)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error al importar: {e}")
+            return
+        
+        print(f"\n✅ Series importadas: {resultado['importadas']:,} "
+              f"({resultado['filas_por_segundo']:,.0f} filas/s, {resultado['segundos']:.2f} s)")
+        if resultado['errores']:
+            print(f"⚠️  Filas con errores (no importadas): {resultado['errores']:,}")
+            for linea, mensaje in resultado['detalle_errores'][:10]:
+                print(f"   Línea {linea}: {mensaje}")
+            if resultado['errores'] > 10:
+                print(f"   ... y {resultado['errores'] - 10:,} más")
+    
+    def mostrar_menu_estadisticas(self):
+        """Muestra el submenú de estadísticas"""
+        print("\n--- ESTADÍSTICAS ---")
+        print("1. Resumen del catálogo")
+        print("2. Histograma de calificaciones")
+        print("3. Calificaciones por género")
+        print("4. Calificaciones por década")
+        print("5. Mejores series de cada género")
+        print("6. Volver al menú principal")
+    
+    def menu_estadisticas(self):
+        """Interfaz para consultar estadísticas"""
+        while True:
+            self.mostrar_menu_estadisticas()
+            opcion = input("\nSelecciona una opción: ").strip()
+            
+            if opcion == '1':
+                self.mostrar_estadisticas()
+            elif opcion == '2':
+                self.mostrar_histograma()
+            elif opcion == '3':
+                self.mostrar_por_genero()
+            elif opcion == '4':
+                self.mostrar_por_decada()
+            elif opcion == '5':
+                self.mostrar_mejores_por_genero()
+            elif opcion == '6':
+                break
+            else:
+                print("❌ Opción no válida.")
+            
+            if opcion in ['1', '2', '3', '4', '5']:
+                self.pausar()
+    
     def mostrar_estadisticas(self):
         """Muestra estadísticas de las series"""
-        print("\n--- ESTADÍSTICAS ---")
+        print("\n--- RESUMEN ---")
         stats = self.manager.obtener_estadisticas()
         
         if stats['total_series'] == 0:
@@ -265,6 +368,62 @@ class MenuCRUD:
         for genero, cantidad in stats['generos'].items():
             print(f"   {genero}: {cantidad} serie(s)")
     
+    def mostrar_histograma(self):
+        """Muestra cuántas series hay en cada tramo de calificación"""
+        analitica = self.manager.obtener_analitica()
+        if analitica['total_series'] == 0:
+            print("📊 No hay series registradas para mostrar estadísticas.")
+            return
+        
+        print("\n⭐ Histograma de calificaciones:")
+        maximo = max(cantidad for _, _, cantidad in analitica['histograma']) or 1
+        for desde, hasta, cantidad in analitica['histograma']:
+            barra = "█" * round(cantidad * 40 / maximo)
+            print(f"   {desde:4.1f} - {hasta:4.1f} | {barra} {cantidad}")
+    
+    def mostrar_por_genero(self):
+        """Muestra media, mediana y percentiles de calificación de cada género"""
+        analitica = self.manager.obtener_analitica()
+        if analitica['total_series'] == 0:
+            print("📊 No hay series registradas para mostrar estadísticas.")
+            return
+        
+        print("\n🎭 Calificaciones por género:")
+        print(f"   {'Género':20} {'Series':>7} {'Media':>6} {'Mediana':>8} {'P25':>5} {'P75':>5} {'P90':>5}")
+        for genero, datos in analitica['por_genero'].items():
+            print(f"   {genero:20} {datos['series']:7} {datos['media']:6.2f} {datos['mediana']:8.2f} "
+                  f"{datos['p25']:5.2f} {datos['p75']:5.2f} {datos['p90']:5.2f}")
+    
+    def mostrar_por_decada(self):
+        """Muestra la calificación media de las series estrenadas en cada década"""
+        analitica = self.manager.obtener_analitica()
+        if analitica['total_series'] == 0:
+            print("📊 No hay series registradas para mostrar estadísticas.")
+            return
+        
+        print("\n📅 Calificaciones por década de estreno:")
+        for decada, datos in analitica['por_decada'].items():
+            print(f"   {decada}s: {datos['series']} serie(s), media {datos['media']}/10")
+    
+    def mostrar_mejores_por_genero(self):
+        """Muestra las series mejor calificadas de cada género"""
+        try:
+            top_k = int(input("¿Cuántas series por género? (por defecto 3): ").strip() or 3)
+        except ValueError:
+            print("❌ Error: Ingresa un número válido.")
+            return
+        
+        analitica = self.manager.obtener_analitica(top_k)
+        if analitica['total_series'] == 0:
+            print("📊 No hay series registradas para mostrar estadísticas.")
+            return
+        
+        print(f"\n🏆 Las {top_k} mejores series de cada género:")
+        for genero, series in analitica['mejores_por_genero'].items():
+            print(f"   {genero}:")
+            for serie in series:
+                print(f"      {serie.titulo} ({serie.calificacion}/10)")
+    
     def ejecutar(self):
         """Ejecuta el menú principal"""
         while True:
@@ -284,8 +443,10 @@ class MenuCRUD:
             elif opcion == '5':
                 self.eliminar_serie()
             elif opcion == '6':
-                self.mostrar_estadisticas()
+                self.menu_estadisticas()
             elif opcion == '7':
+                self.importar_series()
+            elif opcion == '8':
                 print("\n👋 ¡Gracias por usar el CRUD de Series!")
                 sys.exit(0)
             else:
@@ -0,0 +1,308 @@
+"""
+API web del catálogo (FastAPI) sobre SerieManager. Se arranca con servidor.py.
+
+Todas las lecturas llevan ETag y Last-Modified sacados de la versión del catálogo, que
+sube con cada alta, cambio o baja: un cliente (o una CDN) que repite la petición con
+If-None-Match / If-Modified-Since recibe un 304 sin cuerpo mientras nada cambie.
+Los cuerpos se comprimen con brotli (si está instalado) o gzip y se guardan ya
+comprimidos para esa versión, así que repetir una petición tampoco vuelve a consultar
+ni a serializar. Los listados se paginan con un cursor (la última serie de la página).
+"""
+
+import base64
+import binascii
+import gzip
+import json
+import secrets
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+from fastapi import Body, FastAPI, HTTPException, Query, Request, Response
+from domain.serie_manager import SerieManager
+from domain.consultas import Consulta
+from domain.validaciones import ErrorValidacion, validar_serie
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él se comprime con gzip
+    brotli = None
+
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 500
+LIMITE_BUSQUEDA = 20
+
+# Por debajo de este tamaño comprimir no compensa (las cabeceras ocupan más que lo ahorrado)
+TAMAÑO_MINIMO_COMPRIMIR = 512
+NIVEL_GZIP = 6
+NIVEL_BROTLI = 5
+
+# Respuestas ya serializadas y comprimidas que se guardan (las menos usadas salen primero)
+RESPUESTAS_EN_CACHE = 256
+
+# Cachés y CDN pueden guardar las respuestas, pero deben revalidarlas (If-None-Match)
+# antes de servirlas: un cambio en el catálogo se ve en la siguiente petición
+CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+# Campos de una serie en el orden de validar_serie (el ID no se puede cambiar)
+CAMPOS_EDITABLES = ('titulo', 'genero', 'temporadas', 'año_estreno', 'calificacion')
+
+
+def elegir_codificacion(accept_encoding: str) -> str:
+    """'br', 'gzip' o 'identity' según la cabecera Accept-Encoding del cliente"""
+    aceptadas = {}
+    for parte in accept_encoding.split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        calidad = 1.0
+        parametro = parametros.strip()
+        if parametro.startswith("q="):
+            try:
+                calidad = float(parametro[2:])
+            except ValueError:
+                calidad = 0.0
+        aceptadas[nombre.strip().lower()] = calidad
+
+    comodin = aceptadas.get("*", 0.0)
+    if brotli is not None and aceptadas.get("br", comodin) > 0:
+        return "br"
+    if aceptadas.get("gzip", comodin) > 0:
+        return "gzip"
+    return "identity"
+
+
+def comprimir(cuerpo: bytes, codificacion: str) -> bytes:
+    if codificacion == "br":
+        return brotli.compress(cuerpo, quality=NIVEL_BROTLI)
+    if codificacion == "gzip":
+        return gzip.compress(cuerpo, compresslevel=NIVEL_GZIP, mtime=0)
+    return cuerpo
+
+
+def codificar_cursor(orden: str, descendente: bool, valor, id: int) -> str:
+    """Cursor opaco con el orden del listado y la última serie de la página"""
+    datos = json.dumps([orden, descendente, valor, id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(datos.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> list:
+    """[orden, descendente, valor, id] de un cursor; ValueError si está mal formado"""
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Cursor no válido") from None
+    if not (isinstance(datos, list) and len(datos) == 4 and type(datos[3]) is int):
+        raise ValueError("Cursor no válido")
+    return datos
+
+
+class CacheRespuestas:
+    """Cuerpos ya comprimidos por (petición, codificación), válidos para una versión del catálogo"""
+
+    def __init__(self, capacidad: int = RESPUESTAS_EN_CACHE):
+        self._capacidad = capacidad
+        self._respuestas: OrderedDict = OrderedDict()
+        self._cerrojo = threading.Lock()  # La usan a la vez los hilos del servidor
+
+    def obtener(self, clave: tuple, version: int) -> Optional[tuple]:
+        """(codificación, cuerpo) guardados para esa versión, o None"""
+        with self._cerrojo:
+            guardada = self._respuestas.get(clave)
+            if guardada is None or guardada[0] != version:
+                return None
+            self._respuestas.move_to_end(clave)
+            return guardada[1]
+
+    def guardar(self, clave: tuple, version: int, respuesta: tuple):
+        with self._cerrojo:
+            self._respuestas[clave] = (version, respuesta)
+            self._respuestas.move_to_end(clave)
+            if len(self._respuestas) > self._capacidad:
+                self._respuestas.popitem(last=False)
+
+
+def crear_app(manager: SerieManager) -> FastAPI:
+    """Crea la aplicación FastAPI que sirve el catálogo del manager"""
+    app = FastAPI(title="CRUD de Series de TV")
+    cache = CacheRespuestas()
+    # Los ETag llevan un identificador del proceso: tras reiniciar, la versión vuelve a
+    # empezar y no debe coincidir con la de una respuesta que guardó un cliente
+    instancia = secrets.token_hex(4)
+
+    # Las rutas son funciones normales: FastAPI las ejecuta en su grupo de hilos y
+    # SerieManager deja que las lecturas vayan a la vez
+
+    def validadores(version: int, modificado: float) -> dict:
+        return {
+            "ETag": f'W/"{instancia}-{version}"',
+            "Last-Modified": formatdate(modificado, usegmt=True),
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+
+    def no_modificado(request: Request, cabeceras: dict, modificado: float) -> bool:
+        """Comprueba If-None-Match (o, si no viene, If-Modified-Since) contra la versión actual"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # Comparación débil: el ETag es el mismo con o sin compresión
+            etag = cabeceras["ETag"].removeprefix("W/")
+            return any(candidato.strip() == "*" or candidato.strip().removeprefix("W/") == etag
+                       for candidato in if_none_match.split(","))
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                desde = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            # Last-Modified solo tiene segundos
+            return int(modificado) <= desde
+        return False
+
+    def respuesta_json(request: Request, generar) -> Response:
+        """
+        Respuesta de lectura: 304 si el cliente ya tiene esta versión; si no, el JSON que
+        devuelve generar() (o el guardado para esta versión), comprimido si el cliente acepta.
+        """
+        # La versión se lee antes de generar: si entre medias hay un cambio, el cuerpo queda
+        # guardado con la versión anterior (y no se volverá a usar), nunca al revés
+        version, modificado = manager.version_catalogo()
+        cabeceras = validadores(version, modificado)
+        if no_modificado(request, cabeceras, modificado):
+            return Response(status_code=304, headers=cabeceras)
+
+        codificacion = elegir_codificacion(request.headers.get("accept-encoding", ""))
+        clave = (request.url.path, request.url.query, codificacion)
+        guardada = cache.obtener(clave, version)
+        if guardada is None:
+            cuerpo = json.dumps(generar(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            if len(cuerpo) < TAMAÑO_MINIMO_COMPRIMIR:
+                codificacion = "identity"
+            guardada = (codificacion, comprimir(cuerpo, codificacion))
+            cache.guardar(clave, version, guardada)
+
+        codificacion, cuerpo = guardada
+        if codificacion != "identity":
+            cabeceras["Content-Encoding"] = codificacion
+        return Response(cuerpo, media_type="application/json", headers=cabeceras)
+
+    def serie_o_404(id: int):
+        serie = manager.buscar_serie_por_id(id)
+        if serie is None:
+            raise HTTPException(404, f"No existe una serie con ID {id}")
+        return serie
+
+    def serie_json(serie, status_code: int = 200, cabeceras: Optional[dict] = None) -> Response:
+        """Respuesta de escritura con la serie y los validadores de la nueva versión"""
+        cabeceras = {**validadores(*manager.version_catalogo()), **(cabeceras or {})}
+        cuerpo = json.dumps(serie.to_dict(), ensure_ascii=False).encode("utf-8")
+        return Response(cuerpo, status_code=status_code, media_type="application/json", headers=cabeceras)
+
+    @app.get("/series")
+    def listar(request: Request,
+               genero: Optional[str] = None,
+               genero_contiene: Optional[str] = None,
+               titulo: Optional[str] = None,
+               año_desde: Optional[int] = None,
+               año_hasta: Optional[int] = None,
+               calificacion_minima: Optional[float] = None,
+               calificacion_maxima: Optional[float] = None,
+               temporadas_minimas: Optional[int] = None,
+               temporadas_maximas: Optional[int] = None,
+               orden: str = "id",
+               descendente: bool = False,
+               limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+               cursor: Optional[str] = None,
+               campos: Optional[str] = Query(None, description="Campos separados por comas")):
+        """Series con filtros y orden, de 'limite' en 'limite'; 'siguiente' es el cursor de la próxima página"""
+        try:
+            consulta = Consulta().ordenar_por(orden, descendente).paginar(limite + 1)
+            if cursor is not None:
+                orden_cursor, descendente_cursor, valor, id = decodificar_cursor(cursor)
+                if (orden_cursor, descendente_cursor) != (orden, descendente):
+                    raise ValueError("El cursor es de un listado con otro orden")
+                consulta.despues_de(valor, id)
+            seleccion = Consulta().seleccionar(*campos.split(",")) if campos else None
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        consulta.genero, consulta.genero_contiene, consulta.titulo_contiene = genero, genero_contiene, titulo
+        consulta.estrenadas_entre(año_desde, año_hasta)
+        consulta.con_calificacion_entre(calificacion_minima, calificacion_maxima)
+        consulta.con_temporadas_entre(temporadas_minimas, temporadas_maximas)
+
+        def generar():
+            # Se pide una serie de más para saber si hay otra página
+            series = manager.consultar(consulta)
+            siguiente = None
+            if len(series) > limite:
+                series = series[:limite]
+                ultima = series[-1]
+                siguiente = codificar_cursor(orden, descendente, getattr(ultima, orden), ultima.id)
+            pagina = seleccion.proyectar(series) if seleccion else [serie.to_dict() for serie in series]
+            return {"series": pagina, "siguiente": siguiente}
+
+        return respuesta_json(request, generar)
+
+    @app.get("/series/buscar")
+    def buscar(request: Request, titulo: str = Query(..., min_length=1),
+               limite: int = Query(LIMITE_BUSQUEDA, ge=1, le=LIMITE_MAXIMO)):
+        """Series cuyo título contiene el texto, las mejores coincidencias primero"""
+        return respuesta_json(request, lambda: [
+            serie.to_dict() for serie in manager.buscar_series_por_titulo(titulo)[:limite]])
+
+    @app.get("/series/autocompletar")
+    def autocompletar(request: Request, prefijo: str = Query(..., min_length=1),
+                      limite: int = Query(10, ge=1, le=LIMITE_MAXIMO)):
+        """Series cuyo título empieza por el prefijo"""
+        return respuesta_json(request, lambda: [
+            serie.to_dict() for serie in manager.autocompletar_titulo(prefijo, limite)])
+
+    @app.get("/series/{id}")
+    def obtener(request: Request, id: int):
+        # La serie se busca dentro de generar, después de leer la versión (ver respuesta_json)
+        return respuesta_json(request, lambda: serie_o_404(id).to_dict())
+
+    @app.get("/estadisticas")
+    def estadisticas(request: Request):
+        def generar():
+            datos = manager.obtener_estadisticas()
+            mejor = datos['serie_mejor_calificada']
+            return {**datos, 'serie_mejor_calificada': mejor.to_dict() if mejor else None}
+        return respuesta_json(request, generar)
+
+    @app.post("/series", status_code=201)
+    def crear(datos: dict = Body(...)):
+        """Crea una serie con las mismas reglas que el menú y la importación"""
+        try:
+            valores = validar_serie(datos.get('titulo'), datos.get('genero'), datos.get('temporadas'),
+                                    datos.get('año_estreno'), datos.get('calificacion'))
+        except ErrorValidacion as e:
+            raise HTTPException(422, str(e))
+        serie = manager.crear_serie(*valores)
+        return serie_json(serie, 201, {"Location": f"/series/{serie.id}"})
+
+    @app.patch("/series/{id}")
+    def actualizar(id: int, datos: dict = Body(...)):
+        """Cambia los campos indicados; el resultado tiene que seguir siendo una serie válida"""
+        desconocidos = [campo for campo in datos if campo not in CAMPOS_EDITABLES]
+        if desconocidos:
+            raise HTTPException(422, f"Campos que no se pueden cambiar: {', '.join(desconocidos)}")
+        actual = serie_o_404(id).to_dict()
+        actual.update(datos)
+        try:
+            valores = validar_serie(actual['titulo'], actual['genero'], actual['temporadas'],
+                                    actual['año_estreno'], actual['calificacion'])
+        except ErrorValidacion as e:
+            raise HTTPException(422, str(e))
+        # Solo se escriben los campos recibidos: dos PATCH a la vez sobre campos distintos
+        # no se pisan (los demás valores solo sirven para validar la serie resultante)
+        cambios = {campo: valor for campo, valor in zip(CAMPOS_EDITABLES, valores) if campo in datos}
+        if not manager.actualizar_serie(id, **cambios):
+            raise HTTPException(404, f"No existe una serie con ID {id}")
+        return serie_json(serie_o_404(id))
+
+    @app.delete("/series/{id}", status_code=204)
+    def eliminar(id: int):
+        if not manager.eliminar_serie(id):
+            raise HTTPException(404, f"No existe una serie con ID {id}")
+        return Response(status_code=204, headers=validadores(*manager.version_catalogo()))
+
+    return app
@@ -0,0 +1,96 @@
+"""
+Benchmark de peticiones por segundo con muchos clientes a la vez
+Ejecutar (con el servidor arrancado):
+    python benchmark_concurrencia.py --usuario admin --password admin123
+
+Para comparar antes/después de un cambio, arranca el servidor con cada
+versión del código y ejecuta el mismo comando contra cada una.
+"""
+
+import argparse
+import http.cookiejar
+import statistics
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def crear_cliente(base_url: str, usuario: str = None, password: str = None):
+    """Crea un cliente HTTP con cookies; si hay usuario, hace login primero"""
+    cookies = http.cookiejar.CookieJar()
+    cliente = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookies))
+
+    if usuario:
+        datos = urllib.parse.urlencode({"username": usuario, "password": password}).encode()
+        cliente.open(f"{base_url}/auth/login", data=datos).read()
+        if not any(cookie.name == "session" for cookie in cookies):
+            raise SystemExit("❌ Login fallido: revisa usuario y contraseña")
+
+    return cliente
+
+
+def ejecutar_benchmark(url: str, cliente, clientes: int, peticiones: int) -> dict:
+    """Lanza 'peticiones' GET repartidas entre 'clientes' hilos concurrentes"""
+    latencias = []
+    errores = 0
+    lock = threading.Lock()
+
+    def una_peticion(_):
+        nonlocal errores
+        inicio = time.perf_counter()
+        try:
+            with cliente.open(url, timeout=30) as respuesta:
+                respuesta.read()
+                ok = respuesta.status == 200
+        except Exception:
+            ok = False
+        duracion = time.perf_counter() - inicio
+        with lock:
+            if ok:
+                latencias.append(duracion)
+            else:
+                errores += 1
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as ejecutor:
+        list(ejecutor.map(una_peticion, range(peticiones)))
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "peticiones": peticiones,
+        "errores": errores,
+        "segundos": total,
+        "peticiones_por_segundo": len(latencias) / total if total else 0,
+        "p50_ms": statistics.median(latencias) * 1000 if latencias else 0,
+        "p95_ms": latencias[int(len(latencias) * 0.95) - 1] * 1000 if latencias else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de concurrencia de webclase")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--ruta", default="/alumnos")
+    parser.add_argument("--clientes", type=int, default=100)
+    parser.add_argument("--peticiones", type=int, default=2000)
+    parser.add_argument("--usuario")
+    parser.add_argument("--password")
+    args = parser.parse_args()
+
+    cliente = crear_cliente(args.base_url, args.usuario, args.password)
+    url = args.base_url + args.ruta
+
+    print(f"🚀 {args.peticiones} peticiones a {url} con {args.clientes} clientes concurrentes")
+    resultado = ejecutar_benchmark(url, cliente, args.clientes, args.peticiones)
+
+    print(f"   • Tiempo total: {resultado['segundos']:.2f} s")
+    print(f"   • Peticiones/s: {resultado['peticiones_por_segundo']:.1f}")
+    print(f"   • Latencia p50: {resultado['p50_ms']:.1f} ms")
+    print(f"   • Latencia p95: {resultado['p95_ms']:.1f} ms")
+    print(f"   • Errores: {resultado['errores']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,22 @@ Script para crear un usuario inicial en la base de datos
 Ejecutar: python crear_usuario_inicial.py
 """
 
-from data.database import database
+from data.database import pool
 from data.usuario_repository import UsuarioRepository
 
 def crear_usuario_admin():
     """Crea un usuario administrador inicial"""
     usuario_repo = UsuarioRepository()
-    
+    database = pool.obtener()
+    try:
+        _crear_admin(usuario_repo, database)
+    finally:
+        pool.devolver(database)
+        pool.cerrar()
+
+
+def _crear_admin(usuario_repo: UsuarioRepository, database):
+    """Comprueba si existe 'admin' y si no lo crea"""
     # Verificar si ya existe un usuario admin
     usuario_existente = usuario_repo.get_by_username(database, "admin")
     
@@ -1,3 +1,4 @@
+from typing import Iterator, Optional
 from domain.model.Alumno import Alumno
 
 
@@ -16,6 +17,50 @@ class AlumnoRepository:
         cursor.close()
         
         return alumnos
+
+    def get_pagina(self, db, despues_de_id: int = 0, tamano: int = 50) -> tuple[list[Alumno], Optional[int]]:
+        """
+        Paginación por clave (keyset): devuelve los 'tamano' alumnos con id > despues_de_id
+        y el id a usar como cursor de la página siguiente (None si es la última).
+        Usa el índice de la clave primaria, así que cuesta lo mismo en la página 1 que en la 1000.
+        """
+        cursor = db.cursor()
+
+        # Pedimos una fila de más para saber si hay página siguiente
+        cursor.execute(
+            "SELECT id, nombre FROM alumnos WHERE id > %s ORDER BY id LIMIT %s",
+            (despues_de_id, tamano + 1)
+        )
+
+        filas = cursor.fetchall()
+        cursor.close()
+
+        alumnos: list[Alumno] = [Alumno(fila[0], fila[1]) for fila in filas[:tamano]]
+        siguiente = alumnos[-1].id if len(filas) > tamano else None
+
+        return alumnos, siguiente
+
+    def iterar_todos(self, db, tamano_lote: int = 500) -> Iterator[Alumno]:
+        """
+        Generador que recorre todos los alumnos trayéndolos de 'tamano_lote' en 'tamano_lote'
+        con fetchmany, sin cargar la tabla entera en memoria.
+        """
+        cursor = db.cursor()
+        terminado = False
+        try:
+            cursor.execute("SELECT id, nombre FROM alumnos ORDER BY id")
+            while True:
+                filas = cursor.fetchmany(tamano_lote)
+                if not filas:
+                    terminado = True
+                    break
+                for fila in filas:
+                    yield Alumno(fila[0], fila[1])
+        finally:
+            if not terminado:
+                # Si se corta a medias hay que descartar las filas pendientes
+                db.consume_results()
+            cursor.close()
     
     def insertar_alumno(self, db, alumno: Alumno) -> None:
         cursor = db.cursor()
@@ -32,4 +77,50 @@ class AlumnoRepository:
 
         db.commit()
         cursor.close()
-    
\ No newline at end of file
+
+    def insertar_alumnos(self, db, alumnos: list[Alumno]) -> int:
+        """
+        Inserta varios alumnos en una sola transacción con executemany
+        (mysql.connector lo convierte en un único INSERT multi-fila).
+        Si algo falla no se inserta ninguno. Devuelve el número de filas insertadas.
+        """
+        if not alumnos:
+            return 0
+
+        cursor = db.cursor()
+        try:
+            cursor.executemany(
+                "INSERT INTO alumnos (nombre) VALUES (%s)",
+                [(alumno.nombre,) for alumno in alumnos]
+            )
+            insertados = cursor.rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        return insertados
+
+    def borrar_alumnos(self, db, ids: list[int]) -> int:
+        """
+        Borra varios alumnos en una sola transacción.
+        Devuelve el número de filas borradas (los ids que no existían no cuentan).
+        """
+        if not ids:
+            return 0
+
+        cursor = db.cursor()
+        try:
+            marcadores = ", ".join(["%s"] * len(ids))
+            cursor.execute(f"DELETE FROM alumnos WHERE id IN ({marcadores})", tuple(ids))
+            borrados = cursor.rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        return borrados
@@ -1,8 +1,13 @@
-import mysql.connector 
+import threading
+import time
+from collections import deque
 
+import mysql.connector
+from mysql.connector import Error as MySQLError
 
 
-# database = mysql.connector.connect( # LLAMAMOS AL FUNCION CONNECT PARA CONECTARNOS
+
+# CONFIG_DB = dict( # LLAMAMOS AL FUNCION CONNECT PARA CONECTARNOS
 #     host ='localhost',
 #     port = 3306,
 
@@ -10,13 +15,191 @@ import mysql.connector
 #     user ='root', #USUARIO QUE USAMOS NOSOTROS
 #     password ='root' #CONTRASEÑA CON LA QUE NOS CONECTAMOS
 #     # database='oscar'
-# ) 
+# )
 
-database = mysql.connector.connect( # LLAMAMOS AL FUNCION CONNECT PARA CONECTARNOS
+CONFIG_DB = dict( # PARAMETROS QUE LE PASAMOS A mysql.connector.connect
     host ='informatica.iesquevedo.es',
     port = 3333,
     ssl_disabled = True,
     user ='root', #USUARIO QUE USAMOS NOSOTROS
     password ='1asir', #CONTRASEÑA CON LA QUE NOS CONECTAMOS
     database='oscar'
-) 
\ No newline at end of file
+)
+
+# Tamaño del pool y tiempo máximo (segundos) esperando una conexión libre
+POOL_MIN = 2
+POOL_MAX = 10
+POOL_TIMEOUT = 5.0
+
+
+class PoolAgotadoError(Exception):
+    """No se ha podido obtener una conexión del pool dentro del timeout"""
+
+
+class PoolConexiones:
+    """
+    Pool de conexiones MySQL.
+    Cada petición coge una conexión, la usa y la devuelve al pool,
+    en lugar de compartir todas la misma conexión global.
+    """
+
+    def __init__(self, config: dict, min_conexiones: int = POOL_MIN,
+                 max_conexiones: int = POOL_MAX, timeout: float = POOL_TIMEOUT):
+        self._config = config
+        self._min = min_conexiones
+        self._max = max_conexiones
+        self._timeout = timeout
+
+        self._libres = deque()
+        self._creadas = 0
+        self._condicion = threading.Condition()
+        self._iniciado = False
+
+        # Métricas
+        self._en_uso = 0
+        self._esperando = 0
+        self._total_obtenidas = 0
+        self._total_timeouts = 0
+        self._total_reconexiones = 0
+        self._tiempo_espera_total = 0.0
+        self._tiempo_espera_max = 0.0
+
+    def _crear_conexion(self):
+        """Abre una conexión nueva con la configuración del pool"""
+        return mysql.connector.connect(**self._config)
+
+    def _iniciar(self):
+        """Abre las conexiones mínimas (se llama la primera vez que se usa el pool)"""
+        self._iniciado = True
+        for _ in range(self._min):
+            try:
+                self._libres.append(self._crear_conexion())
+                self._creadas += 1
+            except MySQLError:
+                # Si la BD no está disponible ahora, ya se abrirán bajo demanda
+                break
+
+    def _comprobar(self, conexion):
+        """Health-check: hace ping y reconecta si la conexión se ha caído"""
+        try:
+            conexion.ping(reconnect=False)
+            return conexion
+        except MySQLError:
+            pass
+
+        try:
+            conexion.ping(reconnect=True, attempts=2, delay=0)
+            self._total_reconexiones += 1
+            return conexion
+        except MySQLError:
+            try:
+                conexion.close()
+            except MySQLError:
+                pass
+            return None
+
+    def obtener(self):
+        """Saca una conexión del pool, esperando como mucho 'timeout' segundos"""
+        inicio = time.monotonic()
+        limite = inicio + self._timeout
+
+        with self._condicion:
+            if not self._iniciado:
+                self._iniciar()
+
+            self._esperando += 1
+            try:
+                while True:
+                    if self._libres:
+                        conexion = self._libres.popleft()
+                        break
+                    if self._creadas < self._max:
+                        # Reservamos el hueco y abrimos la conexión fuera del lock
+                        self._creadas += 1
+                        conexion = None
+                        break
+
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self._total_timeouts += 1
+                        raise PoolAgotadoError(
+                            f"No hay conexiones libres tras esperar {self._timeout} s "
+                            f"(máximo {self._max})"
+                        )
+                    self._condicion.wait(restante)
+            finally:
+                self._esperando -= 1
+
+        try:
+            if conexion is None:
+                conexion = self._crear_conexion()
+            else:
+                conexion = self._comprobar(conexion)
+                if conexion is None:
+                    conexion = self._crear_conexion()
+                    self._total_reconexiones += 1
+        except MySQLError:
+            with self._condicion:
+                self._creadas -= 1
+                self._condicion.notify()
+            raise
+
+        espera = time.monotonic() - inicio
+        with self._condicion:
+            self._en_uso += 1
+            self._total_obtenidas += 1
+            self._tiempo_espera_total += espera
+            self._tiempo_espera_max = max(self._tiempo_espera_max, espera)
+
+        return conexion
+
+    def devolver(self, conexion) -> None:
+        """Devuelve una conexión al pool deshaciendo cualquier transacción a medias"""
+        try:
+            if conexion.in_transaction:
+                conexion.rollback()
+            valida = conexion.is_connected()
+        except MySQLError:
+            valida = False
+
+        with self._condicion:
+            self._en_uso -= 1
+            if valida:
+                self._libres.append(conexion)
+            else:
+                self._creadas -= 1
+            self._condicion.notify()
+
+    def cerrar(self) -> None:
+        """Cierra todas las conexiones libres del pool"""
+        with self._condicion:
+            while self._libres:
+                conexion = self._libres.popleft()
+                self._creadas -= 1
+                try:
+                    conexion.close()
+                except MySQLError:
+                    pass
+
+    def metricas(self) -> dict:
+        """Estado actual del pool"""
+        with self._condicion:
+            media = (self._tiempo_espera_total / self._total_obtenidas
+                     if self._total_obtenidas else 0.0)
+            return {
+                "min": self._min,
+                "max": self._max,
+                "abiertas": self._creadas,
+                "libres": len(self._libres),
+                "en_uso": self._en_uso,
+                "esperando": self._esperando,
+                "total_obtenidas": self._total_obtenidas,
+                "total_timeouts": self._total_timeouts,
+                "total_reconexiones": self._total_reconexiones,
+                "espera_media_ms": round(media * 1000, 2),
+                "espera_max_ms": round(self._tiempo_espera_max * 1000, 2),
+            }
+
+
+# Pool compartido por toda la aplicación (no conecta hasta el primer uso)
+pool = PoolConexiones(CONFIG_DB)
@@ -0,0 +1,48 @@
+"""
+Capa asíncrona de acceso a datos.
+Los repositorios usan mysql.connector, que es bloqueante: si se llaman
+directamente desde un 'async def' bloquean el event loop de uvicorn.
+Aquí se ejecutan en un pool de hilos con un límite de concurrencia.
+"""
+from functools import partial
+
+import anyio
+
+from data.database import POOL_MAX
+
+# Máximo de llamadas a la BD ejecutándose a la vez en hilos
+# (no tiene sentido que sea mayor que el número de conexiones del pool)
+LIMITE_CONCURRENCIA_DB = POOL_MAX
+
+_limitador = None
+
+
+def _obtener_limitador() -> anyio.CapacityLimiter:
+    """Crea el limitador la primera vez (necesita un event loop en marcha)"""
+    global _limitador
+    if _limitador is None:
+        _limitador = anyio.CapacityLimiter(LIMITE_CONCURRENCIA_DB)
+    return _limitador
+
+
+async def en_hilo(funcion, *args, **kwargs):
+    """
+    Ejecuta una función bloqueante en un hilo y espera su resultado.
+
+    Uso:
+        alumnos = await en_hilo(alumnos_repo.get_all, db)
+    """
+    return await anyio.to_thread.run_sync(
+        partial(funcion, *args, **kwargs),
+        limiter=_obtener_limitador()
+    )
+
+
+def estado_limitador() -> dict:
+    """Hilos ocupados y peticiones esperando turno"""
+    limitador = _obtener_limitador()
+    return {
+        "limite": limitador.total_tokens,
+        "en_uso": limitador.borrowed_tokens,
+        "esperando": limitador.statistics().tasks_waiting,
+    }
@@ -1,5 +1,6 @@
 from domain.model.Usuario import Usuario
-import bcrypt
+from utils.hashing import hashear_password_sync, verificar_password_sync
+from utils.cache_usuarios import cache_usuarios
 
 
 class UsuarioRepository:
@@ -16,14 +17,15 @@ class UsuarioRepository:
         return None
 
     def get_by_id(self, db, user_id: int) -> Usuario:
-        """Obtiene un usuario por su ID"""
-        cursor = db.cursor()
+        """Obtiene un usuario por su ID (incluido el rol si la tabla tiene columna 'role')"""
+        cursor = db.cursor(dictionary=True)
         cursor.execute("SELECT * FROM usuarios WHERE id = %s", (user_id,))
         usuario_db = cursor.fetchone()
         cursor.close()
         
         if usuario_db:
-            return Usuario(usuario_db[0], usuario_db[1], usuario_db[2], usuario_db[3])
+            return Usuario(usuario_db["id"], usuario_db["username"], usuario_db["password_hash"],
+                           usuario_db["email"], usuario_db.get("role"))
         return None
 
     def get_all(self, db) -> list[Usuario]:
@@ -42,10 +44,13 @@ class UsuarioRepository:
 
     def insertar_usuario(self, db, username: str, password: str, email: str = None) -> None:
         """Inserta un nuevo usuario con contraseña hasheada"""
-        cursor = db.cursor()
-        
         # Hashear la contraseña con bcrypt
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        password_hash = hashear_password_sync(password)
+        self.insertar_usuario_con_hash(db, username, password_hash, email)
+
+    def insertar_usuario_con_hash(self, db, username: str, password_hash: bytes, email: str = None) -> None:
+        """Inserta un nuevo usuario cuya contraseña ya viene hasheada"""
+        cursor = db.cursor()
         
         cursor.execute(
             "INSERT INTO usuarios (username, password_hash, email) VALUES (%s, %s, %s)",
@@ -57,18 +62,17 @@ class UsuarioRepository:
 
     def verificar_password(self, password: str, password_hash: str) -> bool:
         """Verifica si la contraseña coincide con el hash"""
-        # Si password_hash es bytes, usarlo directamente, si es str, codificarlo
-        if isinstance(password_hash, str):
-            password_hash = password_hash.encode('utf-8')
-        
-        return bcrypt.checkpw(password.encode('utf-8'), password_hash)
+        return verificar_password_sync(password, password_hash)
 
     def actualizar_password(self, db, user_id: int, nueva_password: str) -> None:
         """Actualiza la contraseña de un usuario"""
-        cursor = db.cursor()
-        
         # Hashear la nueva contraseña
-        password_hash = bcrypt.hashpw(nueva_password.encode('utf-8'), bcrypt.gensalt())
+        password_hash = hashear_password_sync(nueva_password)
+        self.actualizar_password_hash(db, user_id, password_hash)
+
+    def actualizar_password_hash(self, db, user_id: int, password_hash: bytes) -> None:
+        """Actualiza el hash de la contraseña de un usuario (ya calculado)"""
+        cursor = db.cursor()
         
         cursor.execute(
             "UPDATE usuarios SET password_hash = %s WHERE id = %s",
@@ -77,3 +81,6 @@ class UsuarioRepository:
         
         db.commit()
         cursor.close()
+        
+        # El usuario cacheado en memoria ya no es válido
+        cache_usuarios.invalidar(user_id)
@@ -1,6 +1,7 @@
 class Usuario:
-    def __init__(self, id: int, username: str, password_hash: str, email: str = None):
+    def __init__(self, id: int, username: str, password_hash: str, email: str = None, role: str = None):
         self.id = id
         self.username = username
         self.password_hash = password_hash
         self.email = email
+        self.role = role
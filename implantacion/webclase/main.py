@@ -1,35 +1,54 @@
 from typing import Annotated
-from fastapi import FastAPI, Request, Form, Depends
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi import FastAPI, Request, Form, Depends, Query
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
+from utils.templates import templates, precompilar_plantillas
 from fastapi.staticfiles import StaticFiles
-from starlette.middleware.sessions import SessionMiddleware
 from typing import Optional
-from data.database import database
+from data.database import pool
+from data.database_async import en_hilo, estado_limitador
 from data.alumno_repository import AlumnoRepository
 from domain.model.Alumno import Alumno
-from utils.dependencies import require_auth
+from utils.dependencies import require_auth, require_auth_api, get_db
+from utils.hashing import estado_hashing
+from utils.lotes import leer_lote, es_formulario
+from utils.session_store import (MemorySessionStore, SQLiteSessionStore,
+                                 ServerSessionMiddleware, limpiar_sesiones_periodicamente)
 from routers import auth_router, juego_router
 
 
+import asyncio
+import logging
+import os
 import uvicorn
 
+logger = logging.getLogger(__name__)
+
+# Lo que ve el cliente si falla una operación masiva (el detalle va al log)
+ERROR_LOTE_DB = "Error en la base de datos: no se ha aplicado ningún cambio del lote"
+
 # Crear la aplicación FastAPI
 app = FastAPI(title="Mi Primera Web FastAPI", description="Ejemplo básico con Jinja2")
 
 # ⭐ IMPORTANTE: Agregar el middleware de sesiones
-# Cámbiala clave secreta en producción
+# La sesión se guarda en el servidor: la cookie solo lleva un id aleatorio
+# Con varios workers de uvicorn en la misma máquina, guardarlas en SQLite: SESIONES_SQLITE=sesiones.db
+RUTA_SESIONES_SQLITE = os.getenv("SESIONES_SQLITE")
+if RUTA_SESIONES_SQLITE:
+    session_store = SQLiteSessionStore(RUTA_SESIONES_SQLITE)
+else:
+    session_store = MemorySessionStore(max_sesiones=10000)
+
 app.add_middleware(
-    SessionMiddleware,
-    secret_key="tu_clave_secreta_muy_segura_cambiala_en_produccion",
+    ServerSessionMiddleware,
+    store=session_store,
     session_cookie="session",
     max_age=3600 * 24 * 7,  # 7 días
     same_site="lax",
     https_only=False  # Cambiar a True en producción con HTTPS
 )
-
-# Configurar las plantillas
-templates = Jinja2Templates(directory="templatesitos")
+# Paginación de alumnos: tamaño por defecto y máximo de página
+TAMANO_PAGINA = 50
+TAMANO_PAGINA_MAX = 500
 
 # Configurar archivos estáticos (CSS, JS, imágenes)
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -54,12 +73,13 @@ async def inicio(request: Request, usuario: dict = Depends(require_auth)):
 async def do_insertar_alumnos(
     request: Request,
     nombre: Annotated[str, Form()] = None,
-    usuario: dict = Depends(require_auth)
+    usuario: dict = Depends(require_auth),
+    db = Depends(get_db)
 ):
     """Inserta un alumno - Requiere autenticación"""
     alumnos_repo = AlumnoRepository()
     alumno = Alumno(0, nombre)
-    alumnos_repo.insertar_alumno(database, alumno)
+    await en_hilo(alumnos_repo.insertar_alumno, db, alumno)
 
     return templates.TemplateResponse("do_insert_alumnos.html", {
         "request": request,
@@ -79,14 +99,22 @@ async def insert_alumnos(request: Request, usuario: dict = Depends(require_auth)
 
 # RUTA Borrar
 @app.get("/borrar")
-async def borrar_alumnos(request: Request, usuario: dict = Depends(require_auth)):
-    """Formulario para borrar alumnos - Requiere autenticación"""
+async def borrar_alumnos(
+    request: Request,
+    despues_de: Annotated[int, Query(ge=0)] = 0,
+    tamano: Annotated[int, Query(ge=1, le=TAMANO_PAGINA_MAX)] = TAMANO_PAGINA,
+    usuario: dict = Depends(require_auth),
+    db = Depends(get_db)
+):
+    """Formulario para borrar alumnos (paginado) - Requiere autenticación"""
     alumnos_repo = AlumnoRepository()
-    alumnos = alumnos_repo.get_all(database)
+    alumnos, siguiente = await en_hilo(alumnos_repo.get_pagina, db, despues_de, tamano)
 
     return templates.TemplateResponse("borrar_alumnos.html", {
         "request": request,
         "alumnos": alumnos,
+        "siguiente": siguiente,
+        "tamano": tamano,
         "usuario": usuario
     })
 
@@ -97,11 +125,12 @@ async def borrar_alumnos(request: Request, usuario: dict = Depends(require_auth)
 async def do_borrar_alumno(
     request: Request,
     id: Annotated[str, Form()],
-    usuario: dict = Depends(require_auth)
+    usuario: dict = Depends(require_auth),
+    db = Depends(get_db)
 ):
     """Borra un alumno - Requiere autenticación"""
     alumnos_repo = AlumnoRepository()
-    alumnos_repo.borrar_alumno(database, int(id))
+    await en_hilo(alumnos_repo.borrar_alumno, db, int(id))
 
     return templates.TemplateResponse("do_borrar_alumnos.html", {
         "request": request,
@@ -110,20 +139,151 @@ async def do_borrar_alumno(
 
 
 
+# RUTAS MASIVAS (JSON o CSV)
+@app.post("/alumnos/lote")
+async def insertar_alumnos_lote(request: Request, usuario: dict = Depends(require_auth_api), db = Depends(get_db)):
+    """
+    Inserta muchos alumnos en una sola transacción - Requiere autenticación
+    Acepta ["Ana", "Luis"], [{"nombre": "Ana"}] o un CSV con columna 'nombre'
+    Desde el formulario de insert_alumnos.html responde con una página en lugar de JSON
+    """
+    nombres = await leer_lote(request, "nombre")
+
+    alumnos: list[Alumno] = []
+    fallidas = []
+    for fila, nombre in enumerate(nombres, start=1):
+        if not isinstance(nombre, str) or not nombre.strip():
+            fallidas.append({"fila": fila, "valor": nombre, "error": "Nombre vacío o no válido"})
+        else:
+            alumnos.append(Alumno(0, nombre.strip()))
+
+    insertadas = 0
+    if alumnos:
+        try:
+            alumnos_repo = AlumnoRepository()
+            insertadas = await en_hilo(alumnos_repo.insertar_alumnos, db, alumnos)
+        except Exception:
+            # La transacción se ha deshecho: ninguna fila válida se ha insertado
+            logger.exception("Fallo al insertar un lote de %d alumnos", len(alumnos))
+            fallidas.append({"fila": None, "valor": None, "error": ERROR_LOTE_DB})
+
+    resultado = {
+        "recibidas": len(nombres),
+        "insertadas": insertadas,
+        "fallidas": fallidas
+    }
+    if es_formulario(request):
+        return templates.TemplateResponse("lote_alumnos.html", {
+            "request": request,
+            "resultado": resultado,
+            "usuario": usuario
+        })
+    return resultado
+
+
+@app.post("/alumnos/lote/borrar")
+async def borrar_alumnos_lote(request: Request, usuario: dict = Depends(require_auth_api), db = Depends(get_db)):
+    """
+    Borra muchos alumnos en una sola transacción - Requiere autenticación
+    Acepta [1, 2, 3], [{"id": 1}] o un CSV con columna 'id'
+    """
+    valores = await leer_lote(request, "id")
+
+    ids: list[int] = []
+    fallidas = []
+    for fila, valor in enumerate(valores, start=1):
+        try:
+            ids.append(int(valor))
+        except (TypeError, ValueError):
+            fallidas.append({"fila": fila, "valor": valor, "error": "Id no válido"})
+
+    borradas = 0
+    no_encontradas = 0
+    if ids:
+        try:
+            alumnos_repo = AlumnoRepository()
+            borradas = await en_hilo(alumnos_repo.borrar_alumnos, db, ids)
+            no_encontradas = len(set(ids)) - borradas
+        except Exception:
+            logger.exception("Fallo al borrar un lote de %d alumnos", len(ids))
+            fallidas.append({"fila": None, "valor": None, "error": ERROR_LOTE_DB})
+
+    return {
+        "recibidas": len(valores),
+        "borradas": borradas,
+        "no_encontradas": no_encontradas,
+        "fallidas": fallidas
+    }
+
 # RUTAS GET
 @app.get("/alumnos", response_class=HTMLResponse)
-async def alumnos(request: Request, usuario: dict = Depends(require_auth)):
-    """Lista de alumnos - Requiere autenticación"""
+async def alumnos(
+    request: Request,
+    despues_de: Annotated[int, Query(ge=0)] = 0,
+    tamano: Annotated[int, Query(ge=1, le=TAMANO_PAGINA_MAX)] = TAMANO_PAGINA,
+    usuario: dict = Depends(require_auth),
+    db = Depends(get_db)
+):
+    """Lista de alumnos (paginada por id) - Requiere autenticación"""
     alumnos_repo = AlumnoRepository()
-    alumnos = alumnos_repo.get_all(database)
+    alumnos, siguiente = await en_hilo(alumnos_repo.get_pagina, db, despues_de, tamano)
 
     return templates.TemplateResponse("alumnos.html", {
         "request": request,
         "alumnos": alumnos,
+        "siguiente": siguiente,
+        "tamano": tamano,
         "usuario": usuario
     })
 
 
+def generar_html_alumnos(usuario: dict, tamano_trozo: int = 16 * 1024):
+    """
+    Generador que renderiza la lista completa de alumnos a trozos.
+    Coge su propia conexión del pool porque la respuesta se sigue enviando
+    después de que terminen las dependencias de la ruta.
+    """
+    conexion = pool.obtener()
+    try:
+        alumnos = AlumnoRepository().iterar_todos(conexion)
+        plantilla = templates.get_template("alumnos_stream.html")
+
+        # Agrupamos la salida de Jinja en trozos de ~16 KB para no enviar miles de trozos pequeños
+        buffer = []
+        tamano_buffer = 0
+        for parte in plantilla.generate(alumnos=alumnos, usuario=usuario):
+            buffer.append(parte)
+            tamano_buffer += len(parte)
+            if tamano_buffer >= tamano_trozo:
+                yield "".join(buffer)
+                buffer = []
+                tamano_buffer = 0
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        pool.devolver(conexion)
+
+
+@app.get("/alumnos/stream")
+async def alumnos_stream(usuario: dict = Depends(require_auth)):
+    """Lista completa de alumnos enviada en streaming - Requiere autenticación"""
+    if isinstance(usuario, RedirectResponse):
+        # Sin sesión: se redirige al login antes de abrir ninguna consulta
+        return usuario
+    # El generador es síncrono: Starlette lo recorre en un hilo, sin bloquear el event loop
+    return StreamingResponse(generar_html_alumnos(usuario), media_type="text/html; charset=utf-8")
+
+
+# MÉTRICAS DEL POOL DE CONEXIONES
+@app.get("/metricas/db")
+async def metricas_db(usuario: dict = Depends(require_auth_api)):
+    """Estado del pool de conexiones (en uso, esperando, tiempos de espera)"""
+    metricas = pool.metricas()
+    metricas["hilos"] = estado_limitador()
+    metricas["bcrypt"] = estado_hashing()
+    return metricas
+
+
 @app.get("/naruto", response_class=HTMLResponse)
 async def naruto(request: Request,
                  numero: int,
@@ -201,5 +361,24 @@ async def deotramanera(request: Request,
 
 
 
+@app.on_event("startup")
+def precompilar():
+    """Compila todas las plantillas al arrancar para no pagarlo en la primera petición"""
+    precompilar_plantillas()
+
+
+@app.on_event("startup")
+async def iniciar_limpieza_sesiones():
+    """Lanza la tarea que borra las sesiones caducadas"""
+    app.state.limpieza_sesiones = asyncio.create_task(limpiar_sesiones_periodicamente(session_store))
+
+
+@app.on_event("shutdown")
+def cerrar_pool():
+    """Cierra las conexiones del pool al parar el servidor"""
+    app.state.limpieza_sesiones.cancel()
+    pool.cerrar()
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
@@ -4,7 +4,7 @@ TODAS las rutas de este router requieren autenticación
 """
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from utils.templates import templates
 from utils.dependencies import require_auth
 
 # Crear router con dependencia global
@@ -14,8 +14,6 @@ router = APIRouter(
     dependencies=[Depends(require_auth)]  # ✅ Protege TODAS las rutas
 )
 
-templates = Jinja2Templates(directory="templatesitos")
-
 
 @router.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request):
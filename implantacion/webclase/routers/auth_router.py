@@ -1,17 +1,16 @@
 from typing import Annotated
-from fastapi import APIRouter, Request, Form
+from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from data.database import database
+from utils.templates import templates
 from data.usuario_repository import UsuarioRepository
 from utils.session import crear_sesion, destruir_sesion, obtener_usuario_actual
+from utils.dependencies import get_db
+from data.database_async import en_hilo
+from utils.hashing import hashear_password, verificar_password, necesita_rehash, HashingSaturadoError
 
 # Crear el router
 router = APIRouter(prefix="/auth", tags=["autenticacion"])
 
-# Configurar las plantillas
-templates = Jinja2Templates(directory="templatesitos")
-
 
 @router.get("/login", response_class=HTMLResponse)
 async def mostrar_login(request: Request):
@@ -31,13 +30,14 @@ async def mostrar_login(request: Request):
 async def do_login(
     request: Request,
     username: Annotated[str, Form()],
-    password: Annotated[str, Form()]
+    password: Annotated[str, Form()],
+    db = Depends(get_db)
 ):
     """Procesa el login"""
     usuario_repo = UsuarioRepository()
     
     # Buscar el usuario
-    usuario = usuario_repo.get_by_username(database, username)
+    usuario = await en_hilo(usuario_repo.get_by_username, db, username)
     
     if not usuario:
         return templates.TemplateResponse("login.html", {
@@ -46,14 +46,31 @@ async def do_login(
             "username": username
         })
     
-    # Verificar la contraseña
-    if not usuario_repo.verificar_password(password, usuario.password_hash):
+    # Verificar la contraseña (en el pool de bcrypt, no en el event loop)
+    try:
+        password_correcta = await verificar_password(password, usuario.password_hash)
+    except HashingSaturadoError:
+        return templates.TemplateResponse("login.html", {
+            "request": request,
+            "error": "El servidor está muy ocupado, inténtalo de nuevo en unos segundos",
+            "username": username
+        }, status_code=503)
+    
+    if not password_correcta:
         return templates.TemplateResponse("login.html", {
             "request": request,
             "error": "Usuario o contraseña incorrectos",
             "username": username
         })
     
+    # Si el hash se generó con otro coste de bcrypt, lo regeneramos con el actual
+    if necesita_rehash(usuario.password_hash):
+        try:
+            nuevo_hash = await hashear_password(password)
+            await en_hilo(usuario_repo.actualizar_password_hash, db, usuario.id, nuevo_hash)
+        except HashingSaturadoError:
+            pass  # Se reintentará en el próximo login
+    
     # Crear sesión (ahora solo necesita request)
     crear_sesion(request, usuario.id, usuario.username)
     
@@ -81,7 +98,8 @@ async def do_registro(
     username: Annotated[str, Form()],
     password: Annotated[str, Form()],
     password_confirm: Annotated[str, Form()],
-    email: Annotated[str, Form()] = None
+    email: Annotated[str, Form()] = None,
+    db = Depends(get_db)
 ):
     """Procesa el registro de usuario"""
     usuario_repo = UsuarioRepository()
@@ -112,7 +130,7 @@ async def do_registro(
         })
     
     # Verificar que el usuario no exista
-    usuario_existente = usuario_repo.get_by_username(database, username)
+    usuario_existente = await en_hilo(usuario_repo.get_by_username, db, username)
     if usuario_existente:
         return templates.TemplateResponse("registro.html", {
             "request": request,
@@ -121,12 +139,23 @@ async def do_registro(
             "email": email
         })
     
+    # Hashear la contraseña en el pool de bcrypt
+    try:
+        password_hash = await hashear_password(password)
+    except HashingSaturadoError:
+        return templates.TemplateResponse("registro.html", {
+            "request": request,
+            "error": "El servidor está muy ocupado, inténtalo de nuevo en unos segundos",
+            "username": username,
+            "email": email
+        }, status_code=503)
+    
     # Insertar el usuario
     try:
-        usuario_repo.insertar_usuario(database, username, password, email)
+        await en_hilo(usuario_repo.insertar_usuario_con_hash, db, username, password_hash, email)
         
         # Obtener el usuario recién creado para crear la sesión
-        usuario = usuario_repo.get_by_username(database, username)
+        usuario = await en_hilo(usuario_repo.get_by_username, db, username)
         crear_sesion(request, usuario.id, usuario.username)
         
         # Redirigir al inicio
@@ -1,8 +1,7 @@
 from typing import Annotated
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from data.database import database
+from utils.templates import templates
 from data.usuario_repository import UsuarioRepository
 from utils.session import crear_sesion, destruir_sesion, obtener_usuario_actual
 import random
@@ -10,8 +9,6 @@ import random
 # Crear el router
 juego_router = APIRouter(prefix="/juego", tags=["juego"])
 
-# Configurar las plantillas
-templates = Jinja2Templates(directory="templatesitos")
 
 @juego_router.get("/", response_class=HTMLResponse)
 async def mostrar_juego(request: Request):
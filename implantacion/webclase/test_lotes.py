@@ -0,0 +1,153 @@
+"""
+Pruebas de las rutas masivas de alumnos (/alumnos/lote y /alumnos/lote/borrar)
+con un pool falso: no hace falta MySQL.
+
+Ejecutar: python -m pytest test_lotes.py
+"""
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+# main.py monta "static" y las plantillas con rutas relativas a este directorio
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+import main
+from utils import dependencies, lotes
+
+
+class CursorFalso:
+    def __init__(self, registro: list):
+        self._registro = registro
+        self.rowcount = 0
+
+    def execute(self, sql, parametros=()):
+        self._registro.append(("execute", sql, parametros))
+        self.rowcount = len(parametros)
+
+    def executemany(self, sql, filas):
+        self._registro.append(("executemany", sql, filas))
+        self.rowcount = len(filas)
+
+    def close(self):
+        pass
+
+
+class ConexionFalsa:
+    in_transaction = False
+
+    def __init__(self, registro: list):
+        self._registro = registro
+
+    def cursor(self):
+        self._registro.append(("cursor",))
+        return CursorFalso(self._registro)
+
+    def commit(self):
+        self._registro.append(("commit",))
+
+    def rollback(self):
+        self._registro.append(("rollback",))
+
+
+@pytest.fixture
+def registro(monkeypatch) -> list:
+    """Lo que se ha hecho con la base de datos (también si se ha pedido una conexión)"""
+    registro = []
+
+    def obtener():
+        registro.append(("obtener",))
+        return ConexionFalsa(registro)
+
+    monkeypatch.setattr(main.pool, "obtener", obtener)
+    monkeypatch.setattr(main.pool, "devolver", lambda conexion: None)
+    return registro
+
+
+@pytest.fixture
+def cliente() -> TestClient:
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def autenticado(monkeypatch):
+    usuario = {"user_id": 1, "username": "profe", "role": "teacher"}
+    monkeypatch.setattr(dependencies, "cargar_usuario", lambda request: usuario)
+    return usuario
+
+
+@pytest.mark.parametrize("ruta, cuerpo", [
+    ("/alumnos/lote", ["Ana", "Luis"]),
+    ("/alumnos/lote/borrar", [1, 2]),
+])
+def test_sin_sesion_no_toca_la_base_de_datos(cliente, registro, ruta, cuerpo):
+    respuesta = cliente.post(ruta, json=cuerpo, follow_redirects=False)
+
+    assert respuesta.status_code == 401
+    assert registro == []
+
+
+def test_sin_sesion_csv_tampoco(cliente, registro):
+    respuesta = cliente.post("/alumnos/lote/borrar", content="id\n1\n2\n",
+                             headers={"content-type": "text/csv"}, follow_redirects=False)
+
+    assert respuesta.status_code == 401
+    assert registro == []
+
+
+def test_con_sesion_borra_en_una_transaccion(cliente, registro, autenticado):
+    respuesta = cliente.post("/alumnos/lote/borrar", json=[1, 2, "x"])
+
+    assert respuesta.status_code == 200
+    assert respuesta.json()["borradas"] == 2
+    assert [paso[0] for paso in registro] == ["obtener", "cursor", "execute", "commit"]
+
+
+def test_con_sesion_inserta_en_una_transaccion(cliente, registro, autenticado):
+    respuesta = cliente.post("/alumnos/lote", json=["Ana", {"nombre": "Luis"}, ""])
+
+    assert respuesta.status_code == 200
+    assert respuesta.json()["insertadas"] == 2
+    assert [paso[0] for paso in registro] == ["obtener", "cursor", "executemany", "commit"]
+
+
+def test_error_de_la_base_de_datos_no_llega_al_cliente(cliente, registro, autenticado, monkeypatch):
+    def fallar(self, sql, filas):
+        raise RuntimeError("Access denied for user 'root'@'10.0.0.1'")
+    monkeypatch.setattr(CursorFalso, "executemany", fallar)
+
+    respuesta = cliente.post("/alumnos/lote", json=["Ana"])
+
+    assert respuesta.status_code == 200
+    assert "root" not in respuesta.text
+    assert respuesta.json()["fallidas"][0]["error"] == main.ERROR_LOTE_DB
+
+
+def test_limite_de_bytes_sin_content_length(cliente, registro, autenticado):
+    def trozos():
+        for _ in range(lotes.MAX_BYTES_LOTE // 1024 + 1):
+            yield b"x" * 1024
+
+    respuesta = cliente.post("/alumnos/lote", content=trozos(), headers={"content-type": "text/csv"})
+
+    assert respuesta.status_code == 413
+    # get_db presta la conexión antes de leer el cuerpo, pero no se ejecuta nada
+    assert registro == [("obtener",)]
+
+
+def test_limite_de_filas_csv(cliente, registro, autenticado):
+    csv = "nombre\n" + "a\n" * (lotes.MAX_FILAS_LOTE + 1)
+
+    respuesta = cliente.post("/alumnos/lote", content=csv, headers={"content-type": "text/csv"})
+
+    assert respuesta.status_code == 413
+    # get_db presta la conexión antes de leer el cuerpo, pero no se ejecuta nada
+    assert registro == [("obtener",)]
+
+
+def test_formulario_recibe_una_pagina(cliente, registro, autenticado):
+    respuesta = cliente.post("/alumnos/lote", files={"archivo": ("alumnos.csv", b"nombre\nAna\nLuis\n", "text/csv")})
+
+    assert respuesta.status_code == 200
+    assert respuesta.headers["content-type"].startswith("text/html")
+    assert "Insertadas: 2" in respuesta.text
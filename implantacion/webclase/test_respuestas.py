@@ -0,0 +1,55 @@
+"""
+Pruebas de las páginas de error (utils/response_helpers.py) a través de las
+dependencias de roles, con una app mínima: no hacen falta MySQL ni sesiones reales.
+
+Ejecutar: python -m pytest test_respuestas.py
+"""
+import os
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+# Las plantillas se cargan con rutas relativas a este directorio
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import dependencies
+
+
+@pytest.fixture
+def cliente(monkeypatch) -> TestClient:
+    monkeypatch.setattr(dependencies, "cargar_usuario",
+                        lambda request: {"user_id": 1, "username": "alumno", "role": "student"})
+    app = FastAPI()
+
+    @app.get("/admin")
+    def admin(usuario: dict = Depends(dependencies.require_admin)):
+        return usuario
+
+    return TestClient(app)
+
+
+def test_sin_permisos_recibe_la_pagina_403(cliente):
+    respuesta = cliente.get("/admin", headers={"accept-encoding": "identity"})
+
+    assert respuesta.status_code == 403
+    assert "Administrador" in respuesta.text
+    assert "student" in respuesta.text
+
+
+def test_la_403_va_comprimida_si_se_acepta_gzip(cliente):
+    respuesta = cliente.get("/admin", headers={"accept-encoding": "gzip"})
+
+    assert respuesta.status_code == 403
+    assert respuesta.headers["content-encoding"] == "gzip"
+    assert "Administrador" in respuesta.text
+
+
+def test_la_403_no_se_revalida(cliente):
+    primera = cliente.get("/admin", headers={"accept-encoding": "gzip;q=0"})
+    segunda = cliente.get("/admin", headers={"if-none-match": "*", "accept-encoding": "gzip;q=0"})
+
+    assert "content-encoding" not in primera.headers
+    assert "etag" not in primera.headers
+    assert segunda.status_code == 403
+    assert segunda.content == primera.content
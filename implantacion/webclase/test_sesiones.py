@@ -0,0 +1,123 @@
+"""
+Pruebas de las sesiones en el servidor (utils/session_store.py) con una app mínima:
+no hacen falta MySQL ni las plantillas.
+
+Ejecutar: python -m pytest test_sesiones.py
+"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from utils import session_store
+from utils.session import crear_sesion, destruir_sesion
+from utils.session_store import MemorySessionStore, SQLiteSessionStore, ServerSessionMiddleware
+
+
+def crear_app(store) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerSessionMiddleware, store=store, max_age=3600)
+
+    @app.post("/partida")
+    def partida(request: Request):
+        # Como juego_router: guarda datos en una sesión anónima
+        request.session["numero_intentos"] = request.session.get("numero_intentos", 0) + 1
+        return request.session["numero_intentos"]
+
+    @app.post("/login")
+    def login(request: Request):
+        crear_sesion(request, 1, "profe")
+        return "ok"
+
+    @app.post("/logout")
+    def logout(request: Request):
+        destruir_sesion(request)
+        return "ok"
+
+    @app.get("/yo")
+    def yo(request: Request):
+        return request.session.get("username")
+
+    return app
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memoria":
+        return MemorySessionStore()
+    return SQLiteSessionStore(str(tmp_path / "sesiones.db"))
+
+
+def test_login_cambia_el_id_de_sesion(store):
+    atacante = TestClient(crear_app(store))
+    atacante.post("/partida")
+    id_plantado = atacante.cookies["session"]
+
+    # La víctima llega con el id que le ha colado el atacante y hace login
+    victima = TestClient(crear_app(store))
+    victima.cookies.set("session", id_plantado, domain="testserver.local")
+    assert victima.post("/partida").json() == 2
+    victima.post("/login")
+
+    assert victima.cookies["session"] != id_plantado
+    assert victima.get("/yo").json() == "profe"
+    assert store.obtener(id_plantado) is None
+    assert atacante.get("/yo").json() is None
+
+
+def test_logout_invalida_el_id(store):
+    cliente = TestClient(crear_app(store))
+    cliente.post("/login")
+    id_autenticado = cliente.cookies["session"]
+
+    cliente.post("/logout")
+
+    assert store.obtener(id_autenticado) is None
+    otro = TestClient(crear_app(store))
+    otro.cookies.set("session", id_autenticado, domain="testserver.local")
+    assert otro.get("/yo").json() is None
+
+
+def test_la_caducidad_cuenta_desde_el_ultimo_uso(store, monkeypatch):
+    reloj = [1_000_000.0]
+    monkeypatch.setattr(session_store, "time", SimpleNamespace(time=lambda: reloj[0]))
+    cliente = TestClient(crear_app(store))
+    cliente.post("/login")
+
+    # Usa la web sin cambiar la sesión: cada visita renueva la caducidad (max_age = 1 h)
+    for _ in range(5):
+        reloj[0] += 50 * 60
+        assert cliente.get("/yo").json() == "profe"
+
+    # Sin usarla, caduca una hora después de la última visita
+    reloj[0] += 61 * 60
+    assert cliente.get("/yo").json() is None
+
+
+def test_sin_uso_no_escribe_en_cada_peticion(store, monkeypatch):
+    cliente = TestClient(crear_app(store))
+    cliente.post("/login")
+    renovaciones = []
+    renovar = store.renovar
+
+    def renovar_anotando(*args):
+        renovaciones.append(renovar(*args))
+        return renovaciones[-1]
+    monkeypatch.setattr(store, "renovar", renovar_anotando)
+
+    respuesta = cliente.get("/yo")
+
+    assert renovaciones == [False]
+    assert "set-cookie" not in respuesta.headers
+
+
+def test_las_anonimas_no_echan_a_los_usuarios():
+    store = MemorySessionStore(max_sesiones=10)
+    store.guardar("profe", {"authenticated": True, "user_id": 1}, 3600)
+    for numero in range(100):
+        store.guardar(f"partida-{numero}", {"numero_intentos": 1}, 3600)
+
+    assert store.obtener("profe") is not None
+    assert store.obtener("partida-99") is not None
+    assert store.obtener("partida-0") is None
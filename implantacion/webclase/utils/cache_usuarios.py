@@ -0,0 +1,60 @@
+"""
+Caché en memoria de los usuarios autenticados (con su rol).
+Evita consultar MySQL en cada ruta protegida: el usuario se carga una vez
+y se reutiliza durante 'ttl' segundos o hasta que se invalida
+(por ejemplo, al cambiar la contraseña).
+
+Es una caché por proceso: con varios workers, cada uno tiene la suya
+y los cambios hechos en otro proceso se ven al caducar el TTL.
+"""
+import threading
+import time
+from typing import Optional
+
+# Segundos que un usuario permanece en caché
+TTL_CACHE_USUARIOS = 60
+MAX_USUARIOS_CACHE = 10000
+
+
+class CacheUsuarios:
+    """Diccionario user_id -> datos del usuario con caducidad"""
+
+    def __init__(self, ttl: float = TTL_CACHE_USUARIOS, max_usuarios: int = MAX_USUARIOS_CACHE):
+        self._ttl = ttl
+        self._max_usuarios = max_usuarios
+        self._usuarios: dict[int, tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, user_id: int) -> Optional[dict]:
+        """Datos del usuario o None si no está o ha caducado"""
+        with self._lock:
+            entrada = self._usuarios.get(user_id)
+            if entrada is None:
+                return None
+            expira, usuario = entrada
+            if expira < time.monotonic():
+                del self._usuarios[user_id]
+                return None
+            return dict(usuario)
+
+    def guardar(self, user_id: int, usuario: dict) -> None:
+        """Guarda el usuario durante el TTL"""
+        with self._lock:
+            if len(self._usuarios) >= self._max_usuarios:
+                # Caché llena: se vacía entera, se irá rellenando con los usuarios activos
+                self._usuarios.clear()
+            self._usuarios[user_id] = (time.monotonic() + self._ttl, dict(usuario))
+
+    def invalidar(self, user_id: int) -> None:
+        """Elimina un usuario de la caché"""
+        with self._lock:
+            self._usuarios.pop(user_id, None)
+
+    def vaciar(self) -> None:
+        """Elimina todos los usuarios de la caché"""
+        with self._lock:
+            self._usuarios.clear()
+
+
+# Caché compartida por todo el proceso
+cache_usuarios = CacheUsuarios()
@@ -4,19 +4,88 @@ Funcionan como interceptores/filtros
 """
 from fastapi import HTTPException, Request, Depends, status
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
+from utils.response_helpers import forbidden_response
 from typing import Optional
-from utils.session import obtener_usuario_actual
+from data.database import pool, PoolAgotadoError
+from data.usuario_repository import UsuarioRepository
+from utils.cache_usuarios import cache_usuarios
+from utils.session import obtener_usuario_actual, destruir_sesion
 
-# Inicializar templates
-templates = Jinja2Templates(directory="templatesitos")
+
+def get_db():
+    """
+    Dependencia que presta una conexión del pool durante la petición.
+    Al terminar la petición la conexión se devuelve al pool.
+    
+    Uso:
+        @app.get("/alumnos")
+        async def alumnos(db = Depends(get_db)):
+            alumnos = AlumnoRepository().get_all(db)
+    """
+    try:
+        conexion = pool.obtener()
+    except PoolAgotadoError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Base de datos ocupada, inténtalo de nuevo en unos segundos"
+        )
+    try:
+        yield conexion
+    finally:
+        pool.devolver(conexion)
+
+
+def cargar_usuario(request: Request) -> Optional[dict]:
+    """
+    Resuelve el usuario autenticado (con su rol) una sola vez por petición.
+    - Primero mira request.state (ya resuelto en esta petición)
+    - Después la caché del proceso (cache_usuarios)
+    - Solo si no está, consulta MySQL con una conexión del pool
+    """
+    if hasattr(request.state, "usuario"):
+        return request.state.usuario
+
+    sesion = obtener_usuario_actual(request)
+    usuario = None
+    if sesion:
+        user_id = sesion["user_id"]
+        usuario = cache_usuarios.obtener(user_id)
+        if usuario is None:
+            try:
+                conexion = pool.obtener()
+            except PoolAgotadoError:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Base de datos ocupada, inténtalo de nuevo en unos segundos"
+                )
+            try:
+                usuario_db = UsuarioRepository().get_by_id(conexion, user_id)
+            finally:
+                pool.devolver(conexion)
+
+            if usuario_db:
+                usuario = {
+                    "user_id": usuario_db.id,
+                    "username": usuario_db.username
+                }
+                # Sin columna 'role' (o con NULL) no se añade la clave, como en la sesión de
+                # antes: así usuario.get("role", "sin rol") sigue mostrando "sin rol"
+                if usuario_db.role is not None:
+                    usuario["role"] = usuario_db.role
+                cache_usuarios.guardar(user_id, usuario)
+            else:
+                # El usuario de la sesión ya no existe en la BD
+                destruir_sesion(request)
+
+    request.state.usuario = usuario
+    return usuario
 
 
 def require_auth(request: Request):
     """
     Dependencia que requiere autenticación.
     Si el usuario no está autenticado, devuelve RedirectResponse (corta el flujo).
-    Si está autenticado, devuelve el usuario.
+    Si está autenticado, devuelve el usuario (user_id, username y role).
     
     Uso:
         @app.get("/ruta-protegida")
@@ -24,13 +93,33 @@ def require_auth(request: Request):
             # usuario ya está disponible aquí
             return {"mensaje": f"Hola {usuario['username']}"}
     """
-    usuario = obtener_usuario_actual(request)
+    usuario = cargar_usuario(request)
     if not usuario:
         # Devolver RedirectResponse directamente - FastAPI corta el flujo
         return RedirectResponse(url="/auth/login", status_code=303)
     return usuario
 
 
+def require_auth_api(request: Request) -> dict:
+    """
+    Como require_auth, pero para rutas que responden JSON: sin sesión lanza 401
+    en lugar de redirigir. Al lanzar la excepción, las dependencias declaradas
+    después (p. ej. get_db) ya no se ejecutan.
+    
+    Uso:
+        @app.get("/api/datos")
+        async def datos(usuario: dict = Depends(require_auth_api), db = Depends(get_db)):
+            pass
+    """
+    usuario = cargar_usuario(request)
+    if not usuario:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Hay que iniciar sesión"
+        )
+    return usuario
+
+
 def optional_auth(request: Request) -> Optional[dict]:
     """
     Dependencia de autenticación opcional.
@@ -44,7 +133,7 @@ def optional_auth(request: Request) -> Optional[dict]:
             else:
                 return {"mensaje": "Hola invitado"}
     """
-    return obtener_usuario_actual(request)
+    return cargar_usuario(request)
 
 def require_role(required_role: str):
     """
@@ -58,18 +147,16 @@ def require_role(required_role: str):
     NOTA: Requiere que el Request sea un parámetro de la ruta para poder renderizar templates.
     """
     def role_checker(request: Request, usuario: dict = Depends(require_auth)) -> dict:
+        if isinstance(usuario, RedirectResponse):
+            return usuario
         if usuario.get("role") != required_role:
-            # ✅ Devolver TemplateResponse con plantilla 403.html
-            return templates.TemplateResponse(
-                "403.html",
-                {
-                    "request": request,
-                    "message": f"No tienes permisos suficientes para acceder a esta página.",
-                    "required_role": f"Se requiere rol: {required_role}",
-                    "current_role": usuario.get("role", "sin rol"),
-                    "icon": "🚫"
-                },
-                status_code=403
+            # Página 403 ya renderizada (una vez por mensaje y rol) y comprimida si se puede
+            return forbidden_response(
+                request,
+                mensaje="No tienes permisos suficientes para acceder a esta página.",
+                rol_requerido=f"Se requiere rol: {required_role}",
+                rol_actual=usuario.get("role", "sin rol"),
+                icono="🚫"
             )
         return usuario
     return role_checker
@@ -86,18 +173,16 @@ def require_admin(request: Request, usuario: dict = Depends(require_auth)) -> di
     
     NOTA: Requiere que el Request sea un parámetro de la ruta.
     """
+    if isinstance(usuario, RedirectResponse):
+        return usuario
     if usuario.get("role") not in ["admin", "superadmin"]:
-        # ✅ Devolver TemplateResponse con plantilla 403.html
-        return templates.TemplateResponse(
-            "403.html",
-            {
-                "request": request,
-                "message": "Esta página requiere permisos de Administrador.",
-                "required_role": "Roles permitidos: admin, superadmin",
-                "current_role": usuario.get("role", "sin rol"),
-                "icon": "🔒"
-            },
-            status_code=403
+        # Página 403 ya renderizada (una vez por mensaje y rol) y comprimida si se puede
+        return forbidden_response(
+            request,
+            mensaje="Esta página requiere permisos de Administrador.",
+            rol_requerido="Roles permitidos: admin, superadmin",
+            rol_actual=usuario.get("role", "sin rol"),
+            icono="🔒"
         )
     return usuario
 
@@ -113,18 +198,16 @@ def require_superadmin(request: Request, usuario: dict = Depends(require_auth))
     
     NOTA: Requiere que el Request sea un parámetro de la ruta.
     """
+    if isinstance(usuario, RedirectResponse):
+        return usuario
     if usuario.get("role") != "superadmin":
-        # ✅ Devolver TemplateResponse con plantilla 403.html
-        return templates.TemplateResponse(
-            "403.html",
-            {
-                "request": request,
-                "message": "Esta página requiere permisos de Super Administrador.",
-                "required_role": "Solo el super administrador tiene acceso",
-                "current_role": usuario.get("role", "sin rol"),
-                "icon": "👑"
-            },
-            status_code=403
+        # Página 403 ya renderizada (una vez por mensaje y rol) y comprimida si se puede
+        return forbidden_response(
+            request,
+            mensaje="Esta página requiere permisos de Super Administrador.",
+            rol_requerido="Solo el super administrador tiene acceso",
+            rol_actual=usuario.get("role", "sin rol"),
+            icono="👑"
         )
     return usuario
 
@@ -141,19 +224,17 @@ def require_any_role(*roles: str):
     NOTA: Requiere que el Request sea un parámetro de la ruta.
     """
     def role_checker(request: Request, usuario: dict = Depends(require_auth)) -> dict:
+        if isinstance(usuario, RedirectResponse):
+            return usuario
         if usuario.get("role") not in roles:
-            # ✅ Devolver TemplateResponse con plantilla 403.html
+            # Página 403 ya renderizada (una vez por mensaje y rol) y comprimida si se puede
             roles_text = ", ".join(roles)
-            return templates.TemplateResponse(
-                "403.html",
-                {
-                    "request": request,
-                    "message": "No tienes permisos suficientes para acceder a esta página.",
-                    "required_role": f"Roles permitidos: {roles_text}",
-                    "current_role": usuario.get("role", "sin rol"),
-                    "icon": "⚠️"
-                },
-                status_code=403
+            return forbidden_response(
+                request,
+                mensaje="No tienes permisos suficientes para acceder a esta página.",
+                rol_requerido=f"Roles permitidos: {roles_text}",
+                rol_actual=usuario.get("role", "sin rol"),
+                icono="⚠️"
             )
         return usuario
     return role_checker
@@ -0,0 +1,95 @@
+"""
+Hash de contraseñas con bcrypt en un pool de hilos dedicado.
+bcrypt tarda ~100-300 ms de CPU por llamada: si se ejecuta en el event loop
+congela todas las peticiones. bcrypt libera el GIL mientras calcula, así que
+un pool de hilos del tamaño del número de núcleos aprovecha toda la CPU.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+# Coste (log2 de rondas) para los hashes nuevos. Al cambiarlo, los usuarios
+# se rehashean con el nuevo coste la próxima vez que hacen login.
+BCRYPT_COSTE = 12
+
+# Hilos dedicados a bcrypt y máximo de operaciones en cola antes de rechazar
+HILOS_HASHING = os.cpu_count() or 1
+MAX_COLA_HASHING = HILOS_HASHING * 4
+
+_ejecutor = ThreadPoolExecutor(max_workers=HILOS_HASHING, thread_name_prefix="bcrypt")
+_pendientes = 0
+_lock = threading.Lock()
+
+
+class HashingSaturadoError(Exception):
+    """Hay demasiadas operaciones de hash en cola (el servidor debe responder 503)"""
+
+
+def _a_bytes(password_hash) -> bytes:
+    """El hash puede venir de la BD como str, bytes o bytearray"""
+    if isinstance(password_hash, str):
+        return password_hash.encode('utf-8')
+    return bytes(password_hash)
+
+
+def hashear_password_sync(password: str) -> bytes:
+    """Genera el hash bcrypt de una contraseña con el coste configurado"""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_COSTE))
+
+
+def verificar_password_sync(password: str, password_hash) -> bool:
+    """Verifica si la contraseña coincide con el hash"""
+    return bcrypt.checkpw(password.encode('utf-8'), _a_bytes(password_hash))
+
+
+def coste_de_hash(password_hash) -> int:
+    """Extrae el coste de un hash bcrypt ($2b$12$... -> 12)"""
+    try:
+        return int(_a_bytes(password_hash).split(b"$")[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+def necesita_rehash(password_hash) -> bool:
+    """Indica si el hash se generó con un coste distinto del configurado"""
+    return coste_de_hash(password_hash) != BCRYPT_COSTE
+
+
+async def _ejecutar(funcion, *args):
+    """Ejecuta la función en el pool de bcrypt respetando el límite de cola"""
+    global _pendientes
+    with _lock:
+        if _pendientes >= MAX_COLA_HASHING:
+            raise HashingSaturadoError(
+                f"Demasiadas operaciones de hash en cola ({_pendientes})"
+            )
+        _pendientes += 1
+    try:
+        return await asyncio.wrap_future(_ejecutor.submit(funcion, *args))
+    finally:
+        with _lock:
+            _pendientes -= 1
+
+
+async def hashear_password(password: str) -> bytes:
+    """Versión asíncrona de hashear_password_sync (no bloquea el event loop)"""
+    return await _ejecutar(hashear_password_sync, password)
+
+
+async def verificar_password(password: str, password_hash) -> bool:
+    """Versión asíncrona de verificar_password_sync (no bloquea el event loop)"""
+    return await _ejecutar(verificar_password_sync, password, password_hash)
+
+
+def estado_hashing() -> dict:
+    """Operaciones de hash en curso o en cola"""
+    with _lock:
+        return {
+            "hilos": HILOS_HASHING,
+            "pendientes": _pendientes,
+            "max_cola": MAX_COLA_HASHING,
+            "coste": BCRYPT_COSTE,
+        }
@@ -0,0 +1,127 @@
+"""
+Lectura de lotes de filas para las operaciones masivas.
+Acepta un array JSON, un CSV en el cuerpo (text/csv) o un CSV subido
+como fichero en un formulario (campo 'archivo').
+Los límites se comprueban mientras se lee, no después de tener todo en memoria.
+"""
+import csv
+import io
+import json
+
+from fastapi import HTTPException, Request, status
+
+# Máximo de filas y de bytes que se aceptan en una sola petición
+MAX_FILAS_LOTE = 5000
+MAX_BYTES_LOTE = 1024 * 1024  # 1 MB: de sobra para 5000 nombres
+
+
+def es_formulario(request: Request) -> bool:
+    """True si la petición viene de un formulario HTML (multipart), no de un cliente JSON/CSV"""
+    return request.headers.get("content-type", "").startswith("multipart/form-data")
+
+
+def _demasiado_grande() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Máximo {MAX_BYTES_LOTE // 1024} KB por lote"
+    )
+
+
+def _comprobar_content_length(request: Request):
+    """Rechaza la petición antes de leerla si ya anuncia un cuerpo demasiado grande"""
+    try:
+        longitud = int(request.headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Content-Length no válido")
+    if longitud > MAX_BYTES_LOTE:
+        raise _demasiado_grande()
+
+
+async def _leer_cuerpo(request: Request) -> bytes:
+    """Lee el cuerpo a trozos y corta en cuanto pasa de MAX_BYTES_LOTE (aunque no venga Content-Length)"""
+    _comprobar_content_length(request)
+    trozos = []
+    leidos = 0
+    async for trozo in request.stream():
+        leidos += len(trozo)
+        if leidos > MAX_BYTES_LOTE:
+            raise _demasiado_grande()
+        trozos.append(trozo)
+    return b"".join(trozos)
+
+
+def _demasiadas_filas() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Máximo {MAX_FILAS_LOTE} filas por lote"
+    )
+
+
+async def leer_lote(request: Request, columna: str) -> list:
+    """
+    Devuelve la lista de valores de 'columna' que vienen en la petición.
+    - JSON: [valor, ...] o [{"columna": valor}, ...]
+    - CSV: con cabecera que incluya 'columna' (si no, se usa la primera columna)
+    """
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("application/json"):
+        try:
+            datos = json.loads(await _leer_cuerpo(request))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="JSON no válido")
+        if not isinstance(datos, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Se esperaba un array JSON")
+        if len(datos) > MAX_FILAS_LOTE:
+            raise _demasiadas_filas()
+        valores = [fila.get(columna) if isinstance(fila, dict) else fila for fila in datos]
+    else:
+        if content_type.startswith("multipart/form-data"):
+            _comprobar_content_length(request)
+            formulario = await request.form(max_files=1, max_fields=10)
+            archivo = formulario.get("archivo")
+            if archivo is None or isinstance(archivo, str):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                    detail="Falta el fichero CSV en el campo 'archivo'")
+            # Starlette deja el fichero en disco: solo se trae a memoria hasta el límite
+            contenido = await archivo.read(MAX_BYTES_LOTE + 1)
+            if len(contenido) > MAX_BYTES_LOTE:
+                raise _demasiado_grande()
+        else:
+            contenido = await _leer_cuerpo(request)
+
+        try:
+            texto = contenido.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="El CSV debe estar en UTF-8")
+        valores = _valores_csv(texto, columna)
+
+    return valores
+
+
+def _valores_csv(texto: str, columna: str) -> list:
+    """Extrae la columna pedida de un CSV con cabecera"""
+    lector = csv.reader(io.StringIO(texto))
+    cabecera = next(lector, None)
+    if cabecera is None:
+        return []
+
+    cabecera = [nombre.strip().lower() for nombre in cabecera]
+    if columna in cabecera:
+        indice = cabecera.index(columna)
+    else:
+        # Sin cabecera reconocible: la primera línea también es un dato
+        indice = 0
+        lector = csv.reader(io.StringIO(texto))
+
+    valores = []
+    for fila in lector:
+        if not fila:
+            continue
+        if len(valores) == MAX_FILAS_LOTE:
+            # Se corta al pasar del límite, sin recorrer el resto del CSV
+            raise _demasiadas_filas()
+        valores.append(fila[indice] if len(fila) > indice else None)
+    return valores
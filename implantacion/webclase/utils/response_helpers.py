@@ -1,172 +1,99 @@
 """
 Helpers para generar respuestas de error bonitas
 """
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+import gzip
+from functools import lru_cache
 
-templates = Jinja2Templates(directory="templatesitos")
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+from utils.templates import templates
 
+# Número máximo de páginas de error distintas (mensaje, rol) que se guardan ya renderizadas
+MAX_PAGINAS_CACHEADAS = 256
 
-def forbidden_response(mensaje: str = "No tienes permisos para acceder a este recurso", 
-                       rol_requerido: str = None) -> HTMLResponse:
+
+class PaginaCacheada:
+    """Página de error ya renderizada: bytes y versión gzip calculados una sola vez"""
+
+    def __init__(self, html: str):
+        self.cuerpo = html.encode("utf-8")
+        self.cuerpo_gzip = gzip.compress(self.cuerpo)
+
+    def respuesta(self, status_code: int, request: Request) -> Response:
+        """
+        Devuelve la página, comprimida si el cliente acepta gzip. Sin ETag ni 304: las
+        condiciones de If-None-Match solo se evalúan para respuestas 2xx (RFC 9110 §13.2.1)
+        """
+        headers = {"Cache-Control": "no-store", "Vary": "Accept-Encoding"}
+        if acepta_gzip(request.headers.get("accept-encoding", "")):
+            headers["Content-Encoding"] = "gzip"
+            return HTMLResponse(content=self.cuerpo_gzip, status_code=status_code, headers=headers)
+        return HTMLResponse(content=self.cuerpo, status_code=status_code, headers=headers)
+
+
+def acepta_gzip(accept_encoding: str) -> bool:
+    """
+    True si la cabecera Accept-Encoding admite gzip teniendo en cuenta los pesos:
+    "gzip;q=0" lo rechaza y "*" lo admite si gzip no aparece por su nombre.
     """
-    Genera una respuesta HTML 403 (Forbidden) bonita
+    pesos = {}
+    for parte in accept_encoding.split(","):
+        codificacion, _, parametros = parte.partition(";")
+        codificacion = codificacion.strip().lower()
+        if not codificacion:
+            continue
+        peso = 1.0
+        for parametro in parametros.split(";"):
+            nombre, _, valor = parametro.partition("=")
+            if nombre.strip().lower() == "q":
+                try:
+                    peso = float(valor)
+                except ValueError:
+                    peso = 0.0
+        pesos[codificacion] = peso
+    if "gzip" in pesos:
+        return pesos["gzip"] > 0
+    return pesos.get("*", 0) > 0
+
+
+def forbidden_response(request: Request,
+                       mensaje: str = "No tienes permisos para acceder a este recurso", 
+                       rol_requerido: str = None, rol_actual: str = None, icono: str = "🚫") -> Response:
+    """
+    Genera una respuesta HTML 403 (Forbidden) bonita con la plantilla 403.html
     
     Args:
+        request: Petición actual, para comprimir con gzip si el cliente lo acepta
         mensaje: Mensaje de error personalizado
         rol_requerido: Rol específico requerido (opcional)
+        rol_actual: Rol del usuario que lo intenta (opcional)
+        icono: Icono grande de la página
     
     Returns:
-        HTMLResponse con código 403
-    """
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="es">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Acceso Denegado - 403</title>
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-            
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                min-height: 100vh;
-                padding: 20px;
-            }}
-            
-            .error-container {{
-                background: white;
-                padding: 50px;
-                border-radius: 20px;
-                box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-                text-align: center;
-                max-width: 600px;
-                animation: slideIn 0.5s ease-out;
-            }}
-            
-            @keyframes slideIn {{
-                from {{
-                    opacity: 0;
-                    transform: translateY(-30px);
-                }}
-                to {{
-                    opacity: 1;
-                    transform: translateY(0);
-                }}
-            }}
-            
-            .error-icon {{
-                font-size: 100px;
-                margin-bottom: 20px;
-            }}
-            
-            h1 {{
-                color: #e74c3c;
-                font-size: 2.5em;
-                margin-bottom: 20px;
-            }}
-            
-            .error-code {{
-                color: #95a5a6;
-                font-size: 1.2em;
-                margin-bottom: 20px;
-                font-weight: bold;
-            }}
-            
-            .error-message {{
-                color: #555;
-                font-size: 1.1em;
-                line-height: 1.6;
-                margin-bottom: 15px;
-            }}
-            
-            .required-role {{
-                background: #f8f9fa;
-                padding: 15px;
-                border-radius: 10px;
-                margin: 20px 0;
-                border-left: 4px solid #e74c3c;
-            }}
-            
-            .required-role strong {{
-                color: #e74c3c;
-            }}
-            
-            .actions {{
-                margin-top: 30px;
-                display: flex;
-                gap: 10px;
-                justify-content: center;
-                flex-wrap: wrap;
-            }}
-            
-            .btn {{
-                display: inline-block;
-                padding: 12px 30px;
-                text-decoration: none;
-                border-radius: 25px;
-                font-weight: bold;
-                transition: all 0.3s;
-                font-size: 1em;
-            }}
-            
-            .btn-primary {{
-                background: linear-gradient(45deg, #667eea, #764ba2);
-                color: white;
-            }}
-            
-            .btn-primary:hover {{
-                transform: translateY(-2px);
-                box-shadow: 0 10px 20px rgba(102, 126, 234, 0.4);
-            }}
-            
-            .btn-secondary {{
-                background: white;
-                color: #667eea;
-                border: 2px solid #667eea;
-            }}
-            
-            .btn-secondary:hover {{
-                background: #667eea;
-                color: white;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="error-container">
-            <div class="error-icon">🚫</div>
-            <h1>Acceso Denegado</h1>
-            <div class="error-code">HTTP 403 - Forbidden</div>
-            
-            <p class="error-message">{mensaje}</p>
-            
-            {f'<div class="required-role"><strong>🔐 Rol requerido:</strong> {rol_requerido}</div>' if rol_requerido else ''}
-            
-            <div class="actions">
-                <a href="/" class="btn btn-primary">🏠 Volver al Inicio</a>
-                <a href="javascript:history.back()" class="btn btn-secondary">← Página Anterior</a>
-            </div>
-        </div>
-    </body>
-    </html>
+        Response con código 403
     """
-    
-    return HTMLResponse(content=html_content, status_code=403)
+    return _pagina_403(mensaje, rol_requerido, rol_actual, icono).respuesta(403, request)
 
 
-def unauthorized_response(mensaje: str = "Debes iniciar sesión para acceder a este recurso") -> HTMLResponse:
+def unauthorized_response(request: Request,
+                          mensaje: str = "Debes iniciar sesión para acceder a este recurso") -> Response:
     """
     Genera una respuesta HTML 401 (Unauthorized) bonita
     """
+    return _pagina_401(mensaje).respuesta(401, request)
+
+
+@lru_cache(maxsize=MAX_PAGINAS_CACHEADAS)
+def _pagina_403(mensaje: str, rol_requerido: str, rol_actual: str, icono: str) -> PaginaCacheada:
+    """Renderiza la página 403 (solo la primera vez para cada mensaje/rol)"""
+    html_content = templates.get_template("403.html").render(
+        message=mensaje, required_role=rol_requerido, current_role=rol_actual, icon=icono)
+    return PaginaCacheada(html_content)
+
+
+@lru_cache(maxsize=MAX_PAGINAS_CACHEADAS)
+def _pagina_401(mensaje: str) -> PaginaCacheada:
+    """Renderiza la página 401 (solo la primera vez para cada mensaje)"""
     html_content = f"""
     <!DOCTYPE html>
     <html lang="es">
@@ -240,4 +167,4 @@ def unauthorized_response(mensaje: str = "Debes iniciar sesión para acceder a e
     </html>
     """
     
-    return HTMLResponse(content=html_content, status_code=401)
+    return PaginaCacheada(html_content)
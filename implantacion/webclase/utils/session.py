@@ -1,12 +1,14 @@
 from fastapi import Request
 from typing import Optional
+from utils.session_store import regenerar_id_sesion
 
 # Clave secreta para firmar las cookies de sesión (cámbiala en producción)
 SECRET_KEY = "tu_clave_secreta_muy_segura_cambiala_en_produccion"
 
 
 def crear_sesion(request: Request, user_id: int, username: str):
-    """Crea una sesión guardando los datos en request.session"""
+    """Crea una sesión guardando los datos en request.session (con un id de sesión nuevo)"""
+    regenerar_id_sesion(request)
     request.session["user_id"] = user_id
     request.session["username"] = username
     request.session["authenticated"] = True
@@ -24,7 +26,8 @@ def obtener_sesion(request: Request) -> Optional[dict]:
 
 
 def destruir_sesion(request: Request):
-    """Destruye la sesión limpiando los datos"""
+    """Destruye la sesión limpiando los datos (y el id de sesión deja de valer)"""
+    regenerar_id_sesion(request)
     request.session.clear()
 
 
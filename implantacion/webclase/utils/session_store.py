@@ -0,0 +1,269 @@
+"""
+Sesiones guardadas en el servidor.
+La cookie solo lleva un identificador aleatorio; los datos de la sesión se
+guardan en un almacén (memoria o SQLite). Así no hay que serializar y firmar
+toda la sesión en cada respuesta y la cookie no crece al añadir claves.
+
+request.session se sigue usando igual que con el SessionMiddleware de Starlette.
+"""
+import asyncio
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+
+class SessionStore:
+    """Interfaz de los almacenes de sesiones"""
+
+    def obtener(self, session_id: str) -> Optional[dict]:
+        """Datos de la sesión o None si no existe o ha caducado"""
+        raise NotImplementedError
+
+    def guardar(self, session_id: str, datos: dict, ttl: int) -> None:
+        """Guarda la sesión durante 'ttl' segundos"""
+        raise NotImplementedError
+
+    def renovar(self, session_id: str, ttl: int, margen: int) -> bool:
+        """
+        Alarga la caducidad a ahora + 'ttl' si vence antes de ahora + 'ttl' - 'margen'.
+        Devuelve True si la ha alargado (así no se escribe en cada petición).
+        """
+        raise NotImplementedError
+
+    def borrar(self, session_id: str) -> None:
+        """Elimina la sesión"""
+        raise NotImplementedError
+
+    def limpiar_expiradas(self) -> int:
+        """Elimina las sesiones caducadas y devuelve cuántas se han borrado"""
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Sesiones en memoria con caducidad y límite de tamaño (LRU).
+    Al pasar del límite se descartan antes las sesiones anónimas (p. ej. las partidas
+    de /juego) que las de usuarios con login: muchas visitas anónimas no echan a nadie.
+    Solo sirve con un único proceso de uvicorn.
+    """
+
+    def __init__(self, max_sesiones: int = 10000):
+        self._max_sesiones = max_sesiones
+        self._anonimas: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._autenticadas: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _tabla(self, session_id: str) -> Optional[OrderedDict]:
+        """La tabla (anónimas o autenticadas) en la que está la sesión"""
+        if session_id in self._autenticadas:
+            return self._autenticadas
+        if session_id in self._anonimas:
+            return self._anonimas
+        return None
+
+    def obtener(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            tabla = self._tabla(session_id)
+            if tabla is None:
+                return None
+            expira, datos = tabla[session_id]
+            if expira < time.time():
+                del tabla[session_id]
+                return None
+            tabla.move_to_end(session_id)
+            return dict(datos)
+
+    def guardar(self, session_id: str, datos: dict, ttl: int) -> None:
+        with self._lock:
+            anterior = self._tabla(session_id)
+            tabla = self._autenticadas if datos.get("authenticated") else self._anonimas
+            if anterior is not None and anterior is not tabla:
+                del anterior[session_id]
+            tabla[session_id] = (time.time() + ttl, dict(datos))
+            tabla.move_to_end(session_id)
+            # Si hay demasiadas, se descartan las menos usadas, empezando por las anónimas
+            while len(self._anonimas) + len(self._autenticadas) > self._max_sesiones:
+                (self._anonimas or self._autenticadas).popitem(last=False)
+
+    def renovar(self, session_id: str, ttl: int, margen: int) -> bool:
+        with self._lock:
+            tabla = self._tabla(session_id)
+            if tabla is None:
+                return False
+            expira, datos = tabla[session_id]
+            ahora = time.time()
+            if expira < ahora or expira >= ahora + ttl - margen:
+                return False
+            tabla[session_id] = (ahora + ttl, datos)
+            return True
+
+    def borrar(self, session_id: str) -> None:
+        with self._lock:
+            self._anonimas.pop(session_id, None)
+            self._autenticadas.pop(session_id, None)
+
+    def limpiar_expiradas(self) -> int:
+        ahora = time.time()
+        borradas = 0
+        with self._lock:
+            for tabla in (self._anonimas, self._autenticadas):
+                caducadas = [sid for sid, (expira, _) in tabla.items() if expira < ahora]
+                for session_id in caducadas:
+                    del tabla[session_id]
+                borradas += len(caducadas)
+        return borradas
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sesiones en un fichero SQLite.
+    Lo comparten todos los procesos de uvicorn (--workers) de la misma máquina.
+    """
+
+    def __init__(self, fichero: str = "sesiones.db"):
+        self._conexion = sqlite3.connect(fichero, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS sesiones ("
+                " id TEXT PRIMARY KEY,"
+                " datos TEXT NOT NULL,"
+                " expira REAL NOT NULL)"
+            )
+            self._conexion.execute("CREATE INDEX IF NOT EXISTS idx_sesiones_expira ON sesiones(expira)")
+
+    def obtener(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT datos FROM sesiones WHERE id = ? AND expira >= ?",
+                (session_id, time.time())
+            ).fetchone()
+        return json.loads(fila[0]) if fila else None
+
+    def guardar(self, session_id: str, datos: dict, ttl: int) -> None:
+        with self._lock:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO sesiones (id, datos, expira) VALUES (?, ?, ?)",
+                (session_id, json.dumps(datos), time.time() + ttl)
+            )
+
+    def renovar(self, session_id: str, ttl: int, margen: int) -> bool:
+        ahora = time.time()
+        with self._lock:
+            cursor = self._conexion.execute(
+                "UPDATE sesiones SET expira = ? WHERE id = ? AND expira >= ? AND expira < ?",
+                (ahora + ttl, session_id, ahora, ahora + ttl - margen)
+            )
+        return cursor.rowcount > 0
+
+    def borrar(self, session_id: str) -> None:
+        with self._lock:
+            self._conexion.execute("DELETE FROM sesiones WHERE id = ?", (session_id,))
+
+    def limpiar_expiradas(self) -> int:
+        with self._lock:
+            cursor = self._conexion.execute("DELETE FROM sesiones WHERE expira < ?", (time.time(),))
+        return cursor.rowcount
+
+
+# Clave del scope con la que una ruta pide un id de sesión nuevo al responder
+REGENERAR_SESION = "session_regenerar"
+
+
+def regenerar_id_sesion(request: HTTPConnection) -> None:
+    """
+    Pide al middleware que la sesión se guarde con un id nuevo y se borre la antigua.
+    Se usa al iniciar y cerrar sesión: un id conocido antes del login (p. ej. el de una
+    partida anónima que alguien haya colado en el navegador) no llega a autenticarse.
+    """
+    request.scope[REGENERAR_SESION] = True
+
+
+async def limpiar_sesiones_periodicamente(store: SessionStore, intervalo: float = 60.0):
+    """Tarea en segundo plano que borra las sesiones caducadas cada 'intervalo' segundos"""
+    while True:
+        await asyncio.sleep(intervalo)
+        await asyncio.to_thread(store.limpiar_expiradas)
+
+
+class ServerSessionMiddleware:
+    """
+    Middleware que sustituye a SessionMiddleware guardando la sesión en un SessionStore.
+    Solo se escribe en el almacén (y se envía la cookie) cuando la sesión cambia,
+    cuando la ruta pide un id nuevo con regenerar_id_sesion() o para renovar la caducidad.
+    La caducidad cuenta desde el último uso: como mucho una vez cada 'renovar_cada'
+    segundos se vuelve a poner a max_age, así un usuario activo no pierde la sesión.
+    """
+
+    def __init__(self, app, store: SessionStore, session_cookie: str = "session",
+                 max_age: int = 3600 * 24 * 7, same_site: str = "lax", https_only: bool = False,
+                 renovar_cada: int = 3600):
+        self.app = app
+        self.store = store
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.margen_renovacion = min(renovar_cada, max_age // 2)
+        self.flags = f"httponly; samesite={same_site}" + ("; secure" if https_only else "")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
+        session_id = connection.cookies.get(self.session_cookie)
+        # Los almacenes son síncronos (SQLite): se llaman en un hilo para no bloquear el event loop
+        datos = await asyncio.to_thread(self.store.obtener, session_id) if session_id else None
+        if datos is None:
+            # Nunca se reutiliza un id que no conocemos (evita fijar la sesión desde fuera)
+            session_id_valido = None
+            datos = {}
+        else:
+            session_id_valido = session_id
+
+        scope["session"] = datos
+        originales = dict(datos)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                sesion = scope["session"]
+                headers = MutableHeaders(scope=message)
+                id_actual = session_id_valido
+                if scope.get(REGENERAR_SESION) and id_actual:
+                    # El id antiguo deja de valer aunque alguien más lo conozca
+                    await asyncio.to_thread(self.store.borrar, id_actual)
+                    id_actual = None
+
+                if sesion and (sesion != originales or id_actual is None):
+                    nuevo_id = id_actual or secrets.token_urlsafe(32)
+                    await asyncio.to_thread(self.store.guardar, nuevo_id, sesion, self.max_age)
+                    # La cookie se vuelve a enviar para que el navegador también cuente desde ahora
+                    headers.append("Set-Cookie", self._cookie(nuevo_id, self.max_age))
+                elif sesion:
+                    renovada = await asyncio.to_thread(self.store.renovar, id_actual, self.max_age,
+                                                       self.margen_renovacion)
+                    if renovada:
+                        headers.append("Set-Cookie", self._cookie(id_actual, self.max_age))
+                elif not sesion and session_id:
+                    # Sesión vaciada (logout) o cookie con un id desconocido
+                    if id_actual:
+                        await asyncio.to_thread(self.store.borrar, id_actual)
+                    headers.append("Set-Cookie", self._cookie("null", 0))
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _cookie(self, valor: str, max_age: int) -> str:
+        expira = "expires=Thu, 01 Jan 1970 00:00:00 GMT; " if max_age == 0 else ""
+        return (f"{self.session_cookie}={valor}; path=/; {expira}"
+                f"Max-Age={max_age}; {self.flags}")
@@ -0,0 +1,37 @@
+"""
+Motor de plantillas Jinja2 compartido por toda la aplicación.
+Todos los routers importan 'templates' de aquí en lugar de crear su propio
+Jinja2Templates: así hay un solo entorno y una sola caché de plantillas.
+"""
+import os
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+DIRECTORIO_PLANTILLAS = "templatesitos"
+
+# Las plantillas compiladas se guardan en disco para que un worker nuevo no tenga que parsearlas
+DIRECTORIO_CACHE_PLANTILLAS = ".cache_plantillas"
+
+# En producción (ENTORNO=produccion) no se comprueba si las plantillas han cambiado en disco
+PRODUCCION = os.getenv("ENTORNO", "desarrollo") == "produccion"
+
+os.makedirs(DIRECTORIO_CACHE_PLANTILLAS, exist_ok=True)
+
+entorno = Environment(
+    loader=FileSystemLoader(DIRECTORIO_PLANTILLAS),
+    autoescape=True,
+    auto_reload=not PRODUCCION,
+    bytecode_cache=FileSystemBytecodeCache(DIRECTORIO_CACHE_PLANTILLAS),
+    cache_size=-1,  # Sin límite: todas las plantillas compiladas se quedan en memoria
+)
+
+templates = Jinja2Templates(env=entorno)
+
+
+def precompilar_plantillas() -> int:
+    """Compila todas las plantillas (se llama al arrancar) y devuelve cuántas hay"""
+    nombres = entorno.list_templates(extensions=["html"])
+    for nombre in nombres:
+        entorno.get_template(nombre)
+    return len(nombres)